@@ -0,0 +1,7 @@
+"""Benchmarks for the orchestration layer,
+run against stand-in tool executables
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
@@ -0,0 +1,158 @@
+"""Stand-in for nmap, nikto, dirb, hydra,
+enum4linux and xterm used by the benchmarks.
+The tool is chosen by FAKE_TOOL_NAME or by
+the name the script is installed under, and
+its pace is set through the environment:
+
+    FAKE_TOOL_LATENCY   seconds before the first line (0.05)
+    FAKE_TOOL_LINES     lines of output per run (200)
+    FAKE_TOOL_RATE      lines written per second (2000)
+    FAKE_NMAP_OPEN      open ports reported by nmap (80,443,139,445)
+
+Every output line starts with the time it was
+written, so readers can measure drain latency
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import os
+import sys
+import time
+
+
+LATENCY = float(os.environ.get("FAKE_TOOL_LATENCY", "0.05"))
+LINES = int(os.environ.get("FAKE_TOOL_LINES", "200"))
+RATE = float(os.environ.get("FAKE_TOOL_RATE", "2000"))
+NMAP_VALUE_OPTIONS = ("-p", "-oX", "-oN", "--max-rate")
+OPEN_PORTS = [int(p) for p in os.environ.get("FAKE_NMAP_OPEN", "80,443,139,445").split(",") if p]
+
+BANNERS = {
+    "dirb": "DIRB v2.22",
+    "hydra": "Hydra v9.5 (c) 2023 by van Hauser/THC",
+    "enum4linux": "enum4linux v0.9.1 (http://labs.portcullis.co.uk/application/enum4linux/)",
+}
+NIKTO_VERSION = ["-" * 60, "Nikto Versions", "-" * 60, "File                          Version   Last Mod",
+                 "----------------------------- --------- ----------", "Nikto main                    2.1.6"]
+
+
+def option(args, *names):
+    """@return str: the value following the
+    first of the given options, or None
+    """
+    for name in names:
+        if name in args and args.index(name) + 1 < len(args):
+            return args[args.index(name) + 1]
+    return None
+
+
+def emit(stream, count, text):
+    """Writes count timestamped lines at RATE"""
+    interval = 1.0 / RATE if RATE > 0 else 0
+    for i in range(count):
+        stream.write("ts={:.6f} {} {}\n".format(time.time(), text, i))
+        stream.flush()
+        if interval:
+            time.sleep(interval)
+
+
+def parse_ports(spec):
+    """@return set: the ports in an nmap -p spec"""
+    ports = set()
+    for part in spec.split(","):
+        first, _, last = part.partition("-")
+        ports.update(range(int(first), int(last or first) + 1))
+    return ports
+
+
+def nmap_hosts(args):
+    """@return list: the targets on an nmap
+    command line
+    """
+    hosts = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg in NMAP_VALUE_OPTIONS:
+            skip = True
+        elif not arg.startswith("-"):
+            hosts.append(arg)
+    return hosts
+
+
+def nmap(args):
+    if "--version" in args:
+        print("Nmap version 7.94 ( https://nmap.org )")
+        return 0
+    hosts = nmap_hosts(args)
+    ports = sorted(p for p in OPEN_PORTS if p in parse_ports(option(args, "-p") or "1-65535"))
+    time.sleep(LATENCY)
+    if "-v" in args:
+        for host in hosts:
+            for port in ports:
+                print("Discovered open port {}/tcp on {}".format(port, host))
+        sys.stdout.flush()
+    emit(sys.stdout, LINES, "nmap progress")
+
+    port_xml = "".join('<port protocol="tcp" portid="{}"><state state="open"/>'
+                       '<service name="fake"/></port>'.format(p) for p in ports)
+    host_xml = "".join('<host><status state="up"/><address addr="{}" addrtype="ipv4"/><hostnames/>'
+                       '<ports>{}</ports></host>'.format(host, port_xml) for host in hosts)
+    document = ('<?xml version="1.0"?>\n<nmaprun scanner="nmap">{}'
+                '<runstats><finished/></runstats></nmaprun>\n').format(host_xml)
+    for flag, content in (("-oX", document), ("-oN", "fake nmap report for {}\n".format(" ".join(hosts)))):
+        if option(args, flag):
+            with open(option(args, flag), "w") as f:
+                f.write(content)
+    return 0
+
+
+def nikto(args):
+    if "-Version" in args:
+        print("\n".join(NIKTO_VERSION))
+        return 0
+    host = option(args, "-host", "--host")
+    output = option(args, "-output", "--output")
+    time.sleep(LATENCY)
+    emit(sys.stdout, LINES, "+ nikto item")
+    if output:
+        with open(output, "w") as f:
+            f.write('"{0}","{0}","80","OSVDB-3268","GET","/icons/","Directory indexing found."\n'.format(host))
+    return 0
+
+
+def banner_tool(name, args):
+    if not args or args == ["-h"]:
+        print(BANNERS[name])
+        return 0
+    output = option(args, "-o")
+    time.sleep(LATENCY)
+    emit(sys.stdout, LINES, name)
+    if output:
+        with open(output, "w") as f:
+            f.write("{} result\n".format(name))
+    return 0
+
+
+def xterm(args):
+    command = args[args.index("-e") + 1:]
+    os.execvp(command[0], command)
+
+
+def main(argv):
+    name = os.environ.get("FAKE_TOOL_NAME") or os.path.basename(argv[0])
+    if name == "xterm":
+        return xterm(argv[1:])
+    if name == "nmap":
+        return nmap(argv[1:])
+    if name == "nikto":
+        return nikto(argv[1:])
+    if name in BANNERS:
+        return banner_tool(name, argv[1:])
+    sys.stderr.write("fake_tool: unknown tool {}\n".format(name))
+    return 127
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
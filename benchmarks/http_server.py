@@ -0,0 +1,53 @@
+"""Stand-in web server for the content
+discovery benchmark. It serves HTTP/1.1 with
+keep-alive on a free loopback port, answers
+a handful of paths and 404s the rest, after
+an optional delay per request
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+PAGES = ("/admin", "/backup", "/images", "/index.html", "/login", "/robots.txt")
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        found = self.path in PAGES
+        body = ("found " if found else "not found ").encode() + self.path.encode()
+        self.send_response(200 if found else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Serves in a background thread until
+    stopped
+    """
+    daemon_threads = True
+
+    def __init__(self, latency=0.0):
+        ThreadingHTTPServer.__init__(self, ("127.0.0.1", 0), Handler)
+        self.latency = latency
+        self.url = "http://127.0.0.1:{}/".format(self.server_address[1])
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,305 @@
+"""Runs the orchestration benchmarks against
+the stand-in tools of fake_tool.py and reports
+host throughput, scheduler overhead per job,
+pipe drain latency, peak RSS, the request
+rate of the built-in content discovery and
+the spawn latency of each process backend.
+
+Usage:  python -m benchmarks.run [--hosts 8] [--jobs 200] [--json]
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import argparse
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import median
+
+from lib.adapter.ProcessAdapter import ProcessAdapter, POPEN, POSIX_SPAWN
+from lib.adapter.ProcessStream import ProcessStream
+from lib.scheduler.Job import Job
+from lib.scheduler.JobScheduler import JobScheduler
+from lib.web.ContentDiscovery import ContentDiscovery
+
+from benchmarks.http_server import StandInServer
+
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_TOOL = os.path.join(REPOSITORY, "benchmarks", "fake_tool.py")
+TOOLS = ("nmap", "nikto", "dirb", "hydra", "enum4linux", "xterm")
+
+
+class FakeToolbox(object):
+    """Installs the stand-in tools into a
+    temporary directory put first on the PATH
+    """
+
+    def __init__(self, latency, lines, rate):
+        """Initializes the FakeToolbox
+
+        @param latency: float seconds before
+        each tool writes its first line
+
+        @param lines: int lines each tool writes
+
+        @param rate: float lines per second
+        """
+        self.directory = tempfile.mkdtemp(prefix="enumerator_bench_")
+        self.bin = os.path.join(self.directory, "bin")
+        os.makedirs(self.bin)
+        for tool in TOOLS:
+            path = os.path.join(self.bin, tool)
+            with open(path, "w") as f:
+                f.write('#!/bin/sh\nFAKE_TOOL_NAME={} exec "{}" "{}" "$@"\n'.format(tool, sys.executable, FAKE_TOOL))
+            os.chmod(path, stat.S_IRWXU)
+
+        self.environment = dict(os.environ)
+        self.environment.update({
+            "PATH": self.bin + os.pathsep + os.environ.get("PATH", ""),
+            "HOME": self.directory,
+            "FAKE_TOOL_LATENCY": str(latency),
+            "FAKE_TOOL_LINES": str(lines),
+            "FAKE_TOOL_RATE": str(rate),
+            # Keeps ftp() from dialing the fake addresses
+            "FAKE_NMAP_OPEN": "80,443,139,445",
+        })
+        os.makedirs(os.path.join(self.directory, "Desktop"))
+
+    def __enter__(self):
+        self._saved = dict(os.environ)
+        os.environ.update(self.environment)
+        return self
+
+    def __exit__(self, *exc_info):
+        os.environ.clear()
+        os.environ.update(self._saved)
+        shutil.rmtree(self.directory)
+
+
+def percentile(values, fraction):
+    """@return float: the given percentile
+    of the values, or 0 if there are none
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def bench_scheduler_overhead(jobs, max_children, repetitions=5):
+    """Runs the same jobs from a plain thread
+    pool and through the JobScheduler with the
+    same parallelism. Both keep their threads
+    across rounds. After a warm-up round of
+    each, the two alternate for the given number
+    of repetitions, each going first every other
+    round, so drift in the machine's load falls
+    on both sides alike
+
+    @return dict: median seconds of each side
+    and median overhead per job in ms
+    """
+    adapter = ProcessAdapter()
+    scheduler = JobScheduler(process_adapter=adapter, max_children=max_children,
+                             tool_limits={"hydra": ("network", max_children)},
+                             class_limits={"network": max_children})
+
+    def run_direct(_):
+        return ProcessStream(adapter.execute("hydra", "-h")).run()
+
+    pool = ThreadPoolExecutor(max_children)
+
+    def direct():
+        start = time.time()
+        list(pool.map(run_direct, range(jobs)))
+        return time.time() - start
+
+    def scheduled():
+        start = time.time()
+        for _ in range(jobs):
+            scheduler.submit(Job("hydra", args=("-h",)))
+        scheduler.wait()
+        return time.time() - start
+
+    # Warms the interpreter, page cache and
+    # thread pools so no round pays for them
+    direct()
+    scheduled()
+    rounds = []
+    for i in range(repetitions):
+        if i % 2:
+            scheduled_seconds = scheduled()
+            rounds.append((direct(), scheduled_seconds))
+        else:
+            rounds.append((direct(), scheduled()))
+    pool.shutdown()
+
+    return {"jobs": jobs,
+            "repetitions": repetitions,
+            "direct_seconds": round(median(d for d, _ in rounds), 3),
+            "scheduled_seconds": round(median(s for _, s in rounds), 3),
+            "overhead_ms_per_job": round(1000.0 * median(s - d for d, s in rounds) / jobs, 3)}
+
+
+def bench_drain_latency(lines):
+    """Measures the delay between a fake tool
+    writing a line and a ProcessStream parser
+    receiving it
+
+    @return dict: latency percentiles in ms
+    """
+    delays = []
+
+    def parser(line):
+        if line.startswith("ts="):
+            delays.append(time.time() - float(line.split()[0][3:]))
+
+    process = ProcessAdapter().execute("enum4linux", "10.0.0.1")
+    ProcessStream(process).add_parser(parser).run()
+    delays = [1000.0 * d for d in delays]
+    return {"lines": len(delays),
+            "p50_ms": round(percentile(delays, 0.50), 3),
+            "p99_ms": round(percentile(delays, 0.99), 3),
+            "max_ms": round(max(delays) if delays else 0.0, 3)}
+
+
+def bench_pipeline(toolbox, hosts, hosts_in_flight, max_children, batch_size):
+    """Runs enumerator.py against fake hosts,
+    batch_size of them sharing each nmap
+
+    @return dict: throughput and peak RSS
+    """
+    # Loopback addresses refuse the quick connect
+    # scan at once, fake nmap reports the ports
+    targets = ["127.255.{}.{}".format(i // 250, 1 + i % 250) for i in range(hosts)]
+    desktop = os.path.join(toolbox.directory, "Desktop")
+    shutil.rmtree(desktop) # Earlier runs would be resumed from their journals
+    os.makedirs(desktop)
+    command = [sys.executable, os.path.join(REPOSITORY, "enumerator.py"),
+               "--hosts", str(hosts_in_flight), "--max-children", str(max_children),
+               "--batch-size", str(batch_size), "--dirb"] + targets
+
+    start = time.time()
+    process = subprocess.Popen(command, cwd=REPOSITORY, env=toolbox.environment,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    with process.stdout:
+        output = process.stdout.read()
+    # Reaped here rather than by Popen, so the peak RSS
+    # is this run's alone and not the largest child of
+    # every run so far, as RUSAGE_CHILDREN would give
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.time() - start
+    if process.returncode != 0:
+        raise RuntimeError("enumerator.py exited with {}:\n{}".format(process.returncode, output[-2000:]))
+
+    peak_kib = usage.ru_maxrss
+    return {"hosts": hosts,
+            "seconds": round(elapsed, 3),
+            "hosts_per_hour": round(3600.0 * hosts / elapsed, 1),
+            "peak_rss_mib": round(peak_kib / 1024.0, 1)}
+
+
+def bench_content_discovery(words, latency):
+    """Runs the built-in content discovery
+    against a local stand-in web server, once
+    one request at a time on fresh connections
+    as dirb does, and once pooled and pipelined
+
+    @return dict: requests per second of each
+    """
+    words = ["word{}".format(i) for i in range(words)] + ["admin", "login", "robots.txt"]
+    results = {"words": len(words)}
+    engines = (("sequential", ContentDiscovery(connections=1, pipeline_depth=1)),
+               ("pooled", ContentDiscovery()))
+    with StandInServer(latency) as server:
+        for name, discovery in engines:
+            start = time.time()
+            hits = discovery.discover(server.url, words)
+            elapsed = time.time() - start
+            results[name + "_requests_per_second"] = round(len(words) / elapsed, 1)
+            results[name + "_hits"] = len(hits)
+    return results
+
+
+def bench_spawn_latency(spawns, sizes_mib):
+    """Measures how long starting and reaping
+    `true` takes with each process backend as
+    the memory of this process grows
+
+    @return dict: median spawn latency in ms
+    of each backend at each size
+    """
+    results = {"spawns": spawns}
+    ballast = []
+    grown = 0
+    for size in sorted(sizes_mib):
+        ballast.append(bytearray(b"\x01" * ((size - grown) << 20))) # Written, so the pages are resident
+        grown = size
+        for backend in (POPEN, POSIX_SPAWN):
+            adapter = ProcessAdapter(backend=backend)
+            delays = []
+            for _ in range(spawns):
+                start = time.time()
+                process = adapter.execute("true")
+                process.communicate()
+                delays.append(1000.0 * (time.time() - start))
+            results["{}_{}mib_ms".format(backend, size)] = round(percentile(delays, 0.50), 3)
+    return results
+
+
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Benchmarks the orchestration layer with fake tools.")
+    parser.add_argument("--hosts", type=int, default=8, help="fake hosts enumerated (default: %(default)s)")
+    parser.add_argument("--hosts-in-flight", type=int, default=4, help="enumerator.py --hosts (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=200, help="jobs for the scheduler benchmark (default: %(default)s)")
+    parser.add_argument("--max-children", type=int, default=16, help="scheduler child cap (default: %(default)s)")
+    parser.add_argument("--repetitions", type=int, default=5,
+                        help="alternating rounds of the scheduler benchmark (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake tool start latency in s (default: %(default)s)")
+    parser.add_argument("--lines", type=int, default=200, help="lines written per fake tool run (default: %(default)s)")
+    parser.add_argument("--rate", type=float, default=2000, help="fake tool lines per second (default: %(default)s)")
+    parser.add_argument("--words", type=int, default=2000, help="words for the content discovery benchmark (default: %(default)s)")
+    parser.add_argument("--http-latency", type=float, default=0.0,
+                        help="stand-in web server delay per request in s (default: %(default)s)")
+    parser.add_argument("--spawns", type=int, default=50, help="spawns per backend and size (default: %(default)s)")
+    parser.add_argument("--rss", type=int, nargs="+", default=[0, 256, 1024],
+                        help="sizes in MiB this process is grown to for the spawn benchmark (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv):
+    args = parse_arguments(argv)
+    with FakeToolbox(args.latency, args.lines, args.rate) as toolbox:
+        results = {
+            "scheduler": bench_scheduler_overhead(args.jobs, args.max_children, args.repetitions),
+            "drain": bench_drain_latency(args.lines),
+            "pipeline": bench_pipeline(toolbox, args.hosts, args.hosts_in_flight, args.max_children,
+                                       args.hosts_in_flight),
+            "pipeline_nmap_per_host": bench_pipeline(toolbox, args.hosts, args.hosts_in_flight, args.max_children, 1),
+            "content_discovery": bench_content_discovery(args.words, args.http_latency),
+        }
+    results["spawn"] = bench_spawn_latency(args.spawns, args.rss) # Last, it leaves this process grown
+
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        width = 2 + max(len(key) for section in results.values() for key in section)
+        for name in sorted(results):
+            print(name)
+            for key in sorted(results[name]):
+                print("    {:<{}}{}".format(key, width, results[name][key]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
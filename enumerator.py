@@ -1,120 +1,476 @@
-#!/usr/bin/python
+#!/usr/bin/python3
 """ Author: Maleus
-    Usage:  ./enumerator.py <ip>
+    Usage:  ./enumerator.py [-f targets.txt] [-j hosts] <ip|cidr> [<ip|cidr> ...]
     Date:   7.28.14
     Made for Kali Linux, not tested on other distros.
 """
 
 import sys
 import os
-import nmap
-import ftplib
-import subprocess
-
-if len(sys.argv) != 2:	
-	print "Usage ./enumerator.py <ip>"
-	sys.exit(1)
-IP = sys.argv[1] # IP address
+import argparse
+import math
+import sqlite3
+import threading
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.target.TargetParser import TargetParser
+from lib.adapter.ProcessAdapter import ProcessAdapter, POPEN, POSIX_SPAWN
+from lib.scheduler.Job import Job
+from lib.scheduler.JobScheduler import JobScheduler
+from lib.scheduler.RateBudget import RateBudget
+from lib.scheduler.RuntimeHistory import RuntimeHistory, DEFAULT_HISTORY_FILE
+from lib.scheduler.TaskGraph import TaskGraph, Rule
+from lib.scheduler.TimeBudget import TimeBudget, QUICK, FOLLOW_UP
+from lib.tools.ToolPreflight import ToolPreflight
+from lib.nmap.BatchedScan import BatchedScan
+from lib.nmap.OpenPortParser import OpenPortParser
+from lib.nmap.PortDispatcher import PortDispatcher
+from lib.scan.ConnectScanner import ConnectScanner
+from lib.scan.LivenessSweep import LivenessSweep, DEFAULT_PORTS as SWEEP_PORTS
+from lib.wordlist.Wordlist import Wordlist
+from lib.hydra.ShardedHydra import ShardedHydra
+from lib.web.ContentDiscovery import ContentDiscovery
+from lib.journal.CheckpointJournal import CheckpointJournal
+from lib.accounting.ResourceLedger import ResourceLedger
+from lib.ftp.AnonymousFtpChecker import AnonymousFtpChecker
+from lib.findings.FindingsStore import FindingsStore, DEFAULT_ENGAGEMENT
+from lib.findings.ReportReader import ReportReader
+from lib.status.StatusView import StatusView
+
 HOME = os.environ['HOME'] # Sets environment variable for output directory to the current users 'Home' folder.
-OUTPUT_DIRECTORY = os.path.join(HOME, "Desktop", IP)# Sets path for folder on users desktop named as the IP address being scanned
-try:
-	os.makedirs(OUTPUT_DIRECTORY)# Creates folder on users Desktop
-except:
-	CUSTOM_NAME = raw_input("IP directory already exists; Please enter the name of your loot directory: ")
-	OUTPUT_DIRECTORY = os.path.join(HOME, "Desktop", CUSTOM_NAME)
-	os.makedirs(OUTPUT_DIRECTORY)
-
-print "Lookin for easy pickins... Hang tight."
-nm = nmap.PortScanner() # Initialize Nmap module
-nm.scan(IP, '80,443,21,139,445') # Target ports
-
-def ftp(): # Attempts to login to FTP using anonymous user
+QUICK_PORTS = [80, 443, 21, 139, 445] # Ports checked before the follow-up scanners are chosen
+QUICK_TIMEOUT = 2.0 # Seconds each quick scan connection is given
+DEFAULT_PASSWORDS = ["root","admin","toor", "letmein", "changeme", "administrator","password","1","12","123","1234","12345","123456","1234567","12345678","1234567890","ftp","user","guest"]
+HYDRA_SHARDS = 2 # Most hydra workers per host, the scheduler runs two hydras at a time
+USE_DIRB = False # Content discovery runs built in unless --dirb asks for the dirb binary
+USE_XTERM = False # Tools run headless as managed children unless --xterm gives each its own terminal
+USERS = PASSWORDS = Wordlist(words=DEFAULT_PASSWORDS) # Replaced by --users and --passwords
+DEFAULT_HOSTS_IN_FLIGHT = 4 # Number of hosts whose pipelines run at the same time
+DEFAULT_MAX_CHILDREN = 16 # Number of tool processes running at the same time across all hosts
+DEFAULT_SHARDS = 4 # Number of port ranges the full TCP scan of a host is split into
+DEFAULT_BATCH_SIZE = 16 # Most hosts sharing the nmap processes of a full scan, bounded by --hosts
+SCHEDULER = None # Shared JobScheduler, created in main
+SHARDS = DEFAULT_SHARDS
+BATCHER = None # BatchedScan gathering the full scans of the hosts in flight, created in main
+JOURNALS = {} # CheckpointJournal of each output directory, created in main
+LEDGER = ResourceLedger() # Wall time, CPU, RSS and output of every tool, by tool and host
+FINDINGS = None # FindingsStore every host is ingested into when it finishes, created in main
+ENGAGEMENT = DEFAULT_ENGAGEMENT # Engagement the findings of this run are stored under, set in main
+PRINT_LOCK = threading.Lock() # Keeps lines from concurrent hosts from interleaving
+STATUS = None # StatusView showing every running tool, created in main
+BUDGET = None # TimeBudget of the whole run when --budget is given, created in main
+RATE = None # RateBudget shared by every tool against a target when --rate is given, created in main
+
+def log(IP, message): # Prints a message tagged with the host it belongs to
+	with PRINT_LOCK:
+		if STATUS is not None: # Printed above the running tools
+			STATUS.print('[%s] %s' % (IP, message))
+		else:
+			print('[%s] %s' % (IP, message))
+
+def parse_ports(value): # Turns "21,80,8000-8010" into a list of ports
+	ports = []
+	for part in value.split(','):
+		first, _, last = part.strip().partition('-')
+		if not first.isdigit() or not (last or first).isdigit():
+			raise argparse.ArgumentTypeError('invalid port list: %s' % value)
+		ports.extend(range(int(first), int(last or first) + 1))
+	if not ports or not all(1 <= port <= 65535 for port in ports):
+		raise argparse.ArgumentTypeError('ports must be between 1 and 65535: %s' % value)
+	return ports
+
+def parse_duration(value): # Turns "90m", "2h", "45s" or plain seconds into seconds
+	units = {'s': 1, 'm': 60, 'h': 3600}
+	number, unit = (value[:-1], value[-1]) if value[-1:].lower() in units else (value, 's')
 	try:
-		ftp = ftplib.FTP(IP)
-		ftp.login()
-		print "[*]FTP ALLOWS ANONYMOUS ACCESS!"
-		ftp.quit()
-	except:
-		print "FTP does not allow anonymous access :("
-
-def dirb_80(): # Runs dirb on port 80.
+		seconds = float(number) * units[unit.lower()]
+	except ValueError:
+		raise argparse.ArgumentTypeError('invalid duration: %s' % value)
+	if not math.isfinite(seconds) or seconds <= 0: # float() takes "nan" and "inf" too
+		raise argparse.ArgumentTypeError('duration must be positive and finite: %s' % value)
+	return seconds
+
+def parse_arguments(argv):
+	parser = argparse.ArgumentParser(description='Initial enumeration of one or many target machines.')
+	parser.add_argument('targets', nargs='*', help='IP addresses, hostnames or CIDR blocks to enumerate')
+	parser.add_argument('-f', '--file', dest='target_file', help='file holding one target per line')
+	parser.add_argument('-j', '--hosts', type=int, default=DEFAULT_HOSTS_IN_FLIGHT,
+						help='number of hosts enumerated at the same time (default: %(default)s)')
+	parser.add_argument('-c', '--max-children', type=int, default=DEFAULT_MAX_CHILDREN,
+						help='number of tool processes running at the same time (default: %(default)s)')
+	parser.add_argument('-s', '--shards', type=int, default=DEFAULT_SHARDS,
+						help='number of nmap processes the full port scan of a host is split into (default: %(default)s)')
+	parser.add_argument('-b', '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+						help='most hosts whose full scans share one nmap per port range, at most --hosts are in flight (default: %(default)s)')
+	parser.add_argument('-p', '--quick-ports', type=parse_ports, default=QUICK_PORTS,
+						help='comma separated ports connect scanned before the full scan (default: %s)' % ','.join(map(str, QUICK_PORTS)))
+	parser.add_argument('-U', '--users', action='append', default=[],
+						help='login wordlist for hydra, may be repeated (default: a short built-in list)')
+	parser.add_argument('-P', '--passwords', action='append', default=[],
+						help='password wordlist for hydra, may be repeated (default: a short built-in list)')
+	parser.add_argument('--dirb', action='store_true',
+						help='run dirb for content discovery instead of the built-in engine')
+	parser.add_argument('--xterm', action='store_true',
+						help='run dirb and nikto in an xterm each instead of headless (default: headless)')
+	parser.add_argument('--posix-spawn', dest='backend', action='store_const', const=POSIX_SPAWN, default=POPEN,
+						help='start tools with posix_spawn instead of subprocess.Popen, cheaper once this process has grown large')
+	parser.add_argument('--sweep-ports', type=parse_ports, default=list(SWEEP_PORTS),
+						help='ports knocked on to tell which targets are up (default: %s)' % ','.join(map(str, SWEEP_PORTS)))
+	parser.add_argument('-n', '--no-sweep', dest='sweep', action='store_false',
+						help='enumerate every target without checking which are up first')
+	parser.add_argument('-d', '--database', default=os.path.join(HOME, 'Desktop', 'findings.db'),
+						help='SQLite findings database each host is added to, query it with findings.py (default: %(default)s)')
+	parser.add_argument('-e', '--engagement', default=DEFAULT_ENGAGEMENT,
+						help='name the findings of this run are stored under, so the same hosts in another test keep theirs (default: %(default)s)')
+	parser.add_argument('-t', '--budget', type=parse_duration,
+						help='wall clock time for the whole run, e.g. 90m or 2h: quick checks and follow-ups of every host come first, full scans get the time left, and tools still running when it is spent are stopped (default: unlimited)')
+	parser.add_argument('--runtime-history', default=DEFAULT_HISTORY_FILE,
+						help='JSON file of how long each tool took by service and port, queued tools start shortest expected first (default: %(default)s)')
+	parser.add_argument('-r', '--rate', type=float,
+						help='requests per second shared by nmap, nikto, dirb and hydra against each target, backed off on timeouts (default: unlimited)')
+	args = parser.parse_args(argv)
+	if not args.targets and not args.target_file:
+		parser.error('at least one target or a target file is required')
+	if args.hosts < 1:
+		parser.error('--hosts must be at least 1')
+	if args.max_children < 1:
+		parser.error('--max-children must be at least 1')
+	if args.batch_size < 1:
+		parser.error('--batch-size must be at least 1')
+	if not 1 <= args.shards <= 65535:
+		parser.error('--shards must be between 1 and 65535')
+	if args.rate is not None and not (math.isfinite(args.rate) and args.rate >= 1):
+		parser.error('--rate must be a finite number of at least 1')
+	try: # Checked here, so a bad CIDR block or a missing target file is reported like any other bad argument, the hosts are expanded as they are read
+		args.targets = TargetParser().parse(args.targets, target_file=args.target_file)
+	except (ValueError, OSError) as e:
+		parser.error('invalid targets: %s' % e)
+	return args
+
+def make_output_directory(IP): # Creates the loot folder on the users Desktop named as the IP address being scanned
+	OUTPUT_DIRECTORY = os.path.join(HOME, "Desktop", IP)
+	if CheckpointJournal.exists(OUTPUT_DIRECTORY): # An earlier run was interrupted, finished stages are skipped
+		print("[*]Resuming %s from %s" % (IP, OUTPUT_DIRECTORY))
+		return OUTPUT_DIRECTORY
+	try:
+		os.makedirs(OUTPUT_DIRECTORY)
+	except OSError:
+		CUSTOM_NAME = input(IP+" directory already exists; Please enter the name of your loot directory: ")
+		OUTPUT_DIRECTORY = os.path.join(HOME, "Desktop", CUSTOM_NAME)
+		os.makedirs(OUTPUT_DIRECTORY)
+	return OUTPUT_DIRECTORY
+
+def submit(IP, OUTPUT_DIRECTORY, stage, job, outputs): # Runs a job unless the journal holds its stage as complete
+	journal = JOURNALS[OUTPUT_DIRECTORY]
+	if journal.is_complete(stage):
+		log(IP, 'Skipping %s, finished in an earlier run' % stage)
+		return None
+	return journal.track(stage, SCHEDULER.submit(job), outputs)
+
+def run_stage(IP, OUTPUT_DIRECTORY, stage, outputs, function, *args): # Same as submit, for stages run inside this process
+	journal = JOURNALS[OUTPUT_DIRECTORY]
+	if journal.is_complete(stage):
+		log(IP, 'Skipping %s, finished in an earlier run' % stage)
+		return None
+	if BUDGET is not None and BUDGET.expired(): # Journaled as failed, a later run picks it up
+		journal.fail(stage, 'time budget spent')
+		raise TimeoutError('time budget spent before %s was started' % stage)
+	journal.start(stage)
+	try:
+		function(*args)
+	except Exception as e:
+		journal.fail(stage, e)
+		raise
+	journal.complete(stage, outputs)
+
+def tool_job(IP, tool, *args, **service): # Headless the tool's output feeds the status view, with --xterm it gets a terminal of its own
+	if USE_XTERM:
+		return Job(tool, command='xterm', args=('-e', tool) + args, host=IP, **service)
+	return Job(tool, args=args, host=IP, **service)
+
+def service(IP, OUTPUT_DIRECTORY, port): # Port and service name a follow-up runs against, both known once the quick scan found the port open
+	return {'port': port, 'service': SERVICES.get(port)}
+
+def ftp(IP, OUTPUT_DIRECTORY): # Attempts to login to FTP using anonymous user, with connect and read deadlines
+	checker = AnonymousFtpChecker()
+	result = checker.check([(IP, 21)])[0]
+	if result.anonymous:
+		log(IP, "[*]FTP ALLOWS ANONYMOUS ACCESS! Banner and listing saved to %s" % checker.save(result, OUTPUT_DIRECTORY))
+	elif result.error:
+		log(IP, "FTP anonymous check failed: %s" % result.error)
+	else:
+		log(IP, "FTP does not allow anonymous access :(")
+
+def dirb_80(IP, OUTPUT_DIRECTORY): # Runs dirb on port 80.
 	DIRB_80 = os.path.join(OUTPUT_DIRECTORY, 'dirb_80.txt')
-	os.system('xterm -hold -e dirb http://'+IP+' -o '+DIRB_80+' &')
-	
-	
+	if not USE_DIRB:
+		return run_stage(IP, OUTPUT_DIRECTORY, 'dirb_80', [DIRB_80], content_discovery, IP, 'http://'+IP, DIRB_80, follow_up_time())
+	return submit(IP, OUTPUT_DIRECTORY, 'dirb_80', tool_job(IP, 'dirb', 'http://'+IP, '-o', DIRB_80, **service(IP, OUTPUT_DIRECTORY, 80)), [DIRB_80])
 
-def dirb_443(): # Runs dirb on port 443.
+def dirb_443(IP, OUTPUT_DIRECTORY): # Runs dirb on port 443.
 	DIRB_443 = os.path.join(OUTPUT_DIRECTORY, 'dirb_443.txt')
-	os.system('xterm -hold -e dirb https://'+IP+' -o ' +DIRB_443+ ' &')
-	
-	
+	if not USE_DIRB:
+		return run_stage(IP, OUTPUT_DIRECTORY, 'dirb_443', [DIRB_443], content_discovery, IP, 'https://'+IP, DIRB_443, follow_up_time())
+	return submit(IP, OUTPUT_DIRECTORY, 'dirb_443', tool_job(IP, 'dirb', 'https://'+IP, '-o', DIRB_443, **service(IP, OUTPUT_DIRECTORY, 443)), [DIRB_443])
+
+def content_discovery(IP, URL, REPORT_FILE, time_limit=None): # Built-in dirb, keep-alive and pipelined, soft 404s are detected once per host
+	job = Job('discovery', host=IP) # Stands for the built-in engine in the rate budget and the status view
+	rate = RATE.acquire(job) if RATE is not None else None # Paces itself to its share of --rate
+	STATUS.started(job)
+	discovery = None
+	try:
+		discovery = ContentDiscovery(rate=rate)
+		words = ContentDiscovery.default_words()
+		started = time.monotonic()
+		discovery.write_report(URL, discovery.discover(URL, words, time_limit=time_limit), REPORT_FILE, words=len(words))
+		if time_limit is not None and time.monotonic() - started >= time_limit: # The report keeps what was found, the stage is rerun on resume
+			raise TimeoutError('content discovery of %s stopped after %.0fs' % (URL, time_limit))
+	except Exception as e:
+		STATUS.finished(job, None, e)
+		raise
+	else:
+		STATUS.finished(job, 0)
+	finally:
+		if discovery is not None and discovery.usage is not None: # Accounted for like a tool, though it runs in this process
+			LEDGER.record(job.tool, IP, discovery.usage)
+		if RATE is not None:
+			RATE.release(job)
 
-def enum4linux(): # Runs enum4linux on the target machine if smb service is detected.
+def follow_up_time(): # Seconds a built-in follow-up may run under --budget, None without
+	return BUDGET.stage_timeout(FOLLOW_UP) if BUDGET is not None else None
+
+def enum4linux(IP, OUTPUT_DIRECTORY): # Runs enum4linux on the target machine if smb service is detected.
 	ENUM_FILE = os.path.join(OUTPUT_DIRECTORY, 'enum_info.txt')
-	proc = subprocess.Popen('enum4linux '+IP+' > '+ENUM_FILE+' &', shell = True)
-	
-	
+	return submit(IP, OUTPUT_DIRECTORY, 'enum4linux', Job('enum4linux', args=(IP,), host=IP, output_file=ENUM_FILE, **service(IP, OUTPUT_DIRECTORY, 445)), [ENUM_FILE])
 
-def nikto_80(): # Runs Nikto on port 80
+def nikto_80(IP, OUTPUT_DIRECTORY): # Runs Nikto on port 80
 	NIKTO_80 = os.path.join(OUTPUT_DIRECTORY, 'nikto_80.txt')
-	os.system('xterm -hold -e nikto -host http://'+IP+' -output '+NIKTO_80+' &')
-	
-	
+	return submit(IP, OUTPUT_DIRECTORY, 'nikto_80', tool_job(IP, 'nikto', '-ask', 'no', '-host', 'http://'+IP, '-output', NIKTO_80, **service(IP, OUTPUT_DIRECTORY, 80)), [NIKTO_80])
 
-def nikto_443():# Runs Nikto on port 443
+def nikto_443(IP, OUTPUT_DIRECTORY): # Runs Nikto on port 443
 	NIKTO_443 = os.path.join(OUTPUT_DIRECTORY, 'nikto_443.txt')
-	os.system('xterm -hold -e nikto -host https://'+IP+' -output '+NIKTO_443+' &')
-	
-	
-
-def hydra_21():#Runs hydra on port 21
-	password_file = open('.hydra_21.txt','w')
-	password_list = ["root","admin","toor", "letmein", "changeme", "administrator","password","1","12","123","1234","12345","123456","1234567","12345678","1234567890","ftp","user","guest"]
-	password_file.write("\n".join(map(lambda x: str(x), password_list))+'\n')
-	password_file.close()
-	HYDRA_21 = os.path.join(OUTPUT_DIRECTORY, 'ftp_accounts.txt')
-	proc = subprocess.Popen('hydra -L .hydra_21.txt -P .hydra_21.txt -o ' + HYDRA_21 + ' ftp://'+ IP +' &',shell = True)
-	print '[*]Performing basic password scan, PLEASE RUN A MORE COMPLETE SCAN FOR MORE ACCURATE RESULTS'
-
-#Initial Nmap scans
-for host in nm.all_hosts():
-	print('--------------------')
-	print('Host: %s (%s)' % (IP, nm[host].hostname()))
-	print('State: %s' % nm[host].state())
-	print('--------------------')
-
-for proto in nm[host].all_protocols():
-	print('--------------------')
-	print('Protocol: %s' % proto)
-
-lport = nm[host]['tcp'].keys()
-lport.sort()
-for port in lport:
-	print('--------------------')
-	print('port: %s\tstate: %s' % (port, nm[host][proto][port]['state']))
-	print('--------------------')
-
-def has_open_port(port_num):
-	return nm[IP]['tcp'][port_num]['state'] == 'open'
-
-#Function Checks
-if has_open_port(21):
-	ftp()
-	hydra_21()
-if has_open_port(80):
-	dirb_80()
-	nikto_80()
-if has_open_port(443):
-	dirb_443()
-	nikto_443()
-if has_open_port(139):
-	enum4linux()
-if has_open_port(445):
-	enum4linux()
-
-#Nmap Service Scan
-NMAP_INFO = os.path.join(OUTPUT_DIRECTORY, 'nmap_full.txt')# Nmap full service info file
-os.system('nmap -A -p- -T4 -oN '+NMAP_INFO+' '+IP) # Full TCP scan of all 65535 ports
-
-print "Enumeration complete... Please pwn responsibly"
+	return submit(IP, OUTPUT_DIRECTORY, 'nikto_443', tool_job(IP, 'nikto', '-ask', 'no', '-host', 'https://'+IP, '-output', NIKTO_443, **service(IP, OUTPUT_DIRECTORY, 443)), [NIKTO_443])
+
+def hydra_21(IP, OUTPUT_DIRECTORY): #Runs hydra on port 21, split across parallel workers that all stop at the first valid login
+	log(IP, '[*]Performing basic password scan, PLEASE RUN A MORE COMPLETE SCAN FOR MORE ACCURATE RESULTS')
+	hydra = ShardedHydra(SCHEDULER, shards=HYDRA_SHARDS, journal=JOURNALS[OUTPUT_DIRECTORY])
+	for credential in hydra.run(IP, 'ftp', USERS, PASSWORDS, OUTPUT_DIRECTORY): # Merged into ftp_accounts.txt
+		log(IP, '[*]FTP login found: %s / %s' % (credential.login, credential.password))
+
+SERVICES = { # Service each quick port belongs to, ports sharing a service share its tasks
+	21: 'ftp',
+	80: 'http',
+	443: 'https',
+	139: 'smb',
+	445: 'smb',
+}
+
+FOLLOW_UPS = { # Follow-up scanners per service, each runs once per host after the tools it requires
+	'ftp': [Rule('ftp', ftp, ()), Rule('hydra', hydra_21, ('ftp',))], # hydra waits for the anonymous check
+	'http': [Rule('dirb', dirb_80, ()), Rule('nikto', nikto_80, ())],
+	'https': [Rule('dirb', dirb_443, ()), Rule('nikto', nikto_443, ())],
+	'smb': [Rule('enum4linux', enum4linux, ())],
+}
+
+def follow_up(graph, service, IP): # Asks the task graph for the follow-ups of a service, graph.wait reports their errors
+	graph.add(IP, service)
+
+def quick_scan(IP, OUTPUT_DIRECTORY, dispatcher): # TCP connects to the quick ports, each open port starts its follow-ups the moment it answers
+	QUICK_FILE = os.path.join(OUTPUT_DIRECTORY, 'quick_scan.txt')
+	timeout = QUICK_TIMEOUT if BUDGET is None else min(QUICK_TIMEOUT, BUDGET.stage_timeout(QUICK))
+	open_ports = ConnectScanner(timeout=timeout, on_open=dispatcher.open_port).scan([IP], QUICK_PORTS)[IP]
+	with open(QUICK_FILE, 'w') as f:
+		for port in QUICK_PORTS:
+			state = 'open' if has_open_port(open_ports, port) else 'closed'
+			f.write('%d/tcp\t%s\n' % (port, state))
+			log(IP, 'port: %d/tcp\tstate: %s' % (port, state))
+	return open_ports
+
+def nmap_full(IP, OUTPUT_DIRECTORY, parsers): # Full TCP scan of all 65535 ports, split across SHARDS nmap processes shared with other hosts in flight
+	ports = BATCHER.scan(IP, OUTPUT_DIRECTORY, parsers=parsers, journal=JOURNALS[OUTPUT_DIRECTORY]) # -A only runs on the host's own open ports
+	log(IP, 'Full scan found %d open port(s): %s' % (len(ports), ','.join(map(str, ports))))
+	return ports
+
+def has_open_port(open_ports, port_num):
+	return port_num in open_ports
+
+def follow_ups(IP, OUTPUT_DIRECTORY, covered=()): # Task graph of the follow-up scanners and the dispatcher starting them, services already covered are left out
+	rules = dict((service, [rule._replace(function=partial(rule.function, OUTPUT_DIRECTORY=OUTPUT_DIRECTORY)) for rule in service_rules]) for service, service_rules in FOLLOW_UPS.items())
+	graph = TaskGraph(rules)
+	handlers = dict((port, [partial(follow_up, graph, service)]) for port, service in SERVICES.items() if service not in covered)
+	return graph, PortDispatcher(handlers)
+
+def port_parser(IP, dispatcher): # nmap names a hostname target by its address too, ports are dispatched under the target as given
+	return OpenPortParser(lambda _, port, protocol: dispatcher.open_port(IP, port, protocol))
+
+def wait_follow_ups(IP, graph, dispatcher): # Waits on every tool started for this host, returns the services they covered
+	for error in dispatcher.wait() + graph.wait():
+		log(IP, "Follow-up failed: %s" % error)
+	return set(SERVICES[port] for _, port, _ in dispatcher.dispatched() if port in SERVICES)
+
+def enumerate_host(IP, OUTPUT_DIRECTORY): # Runs the whole pipeline for a single host
+	log(IP, "Lookin for easy pickins... Hang tight.")
+	graph, dispatcher = follow_ups(IP, OUTPUT_DIRECTORY)
+	parsers = [port_parser(IP, dispatcher)]
+
+	try:
+		with ThreadPoolExecutor(max_workers=1) as background: # The full scan overlaps the quick scan and the follow-ups
+			full_scan = background.submit(nmap_full, IP, OUTPUT_DIRECTORY, parsers)
+			#Initial connect scan, nmap is kept for the full scan
+			quick_scan(IP, OUTPUT_DIRECTORY, dispatcher)
+
+			#Nmap Service Scan, shards finished in an earlier run report their ports here
+			for port in full_scan.result():
+				dispatcher.open_port(IP, port)
+	finally: # Follow-ups already started are waited on and their errors reported, even when nmap failed
+		wait_follow_ups(IP, graph, dispatcher)
+	log(IP, "Enumeration complete")
+
+def quick_pass(IP, OUTPUT_DIRECTORY): # With --budget: the quick scan and its follow-ups, returns the services covered
+	if BUDGET.expired():
+		log(IP, "Out of time, not enumerated")
+		return set()
+	log(IP, "Lookin for easy pickins... Hang tight.")
+	graph, dispatcher = follow_ups(IP, OUTPUT_DIRECTORY)
+	try:
+		quick_scan(IP, OUTPUT_DIRECTORY, dispatcher)
+	finally:
+		covered = wait_follow_ups(IP, graph, dispatcher)
+	return covered
+
+def full_pass(IP, OUTPUT_DIRECTORY, covered): # With --budget: the full scan in the time left, follow-ups start for the services only it found
+	graph, dispatcher = follow_ups(IP, OUTPUT_DIRECTORY, covered)
+	try:
+		for port in nmap_full(IP, OUTPUT_DIRECTORY, [port_parser(IP, dispatcher)]):
+			dispatcher.open_port(IP, port)
+	except OSError as e:
+		if not BUDGET.expired():
+			raise
+		log(IP, "Full scan stopped, out of time: %s" % e) # Partial results stay, the journal has it to redo
+	finally:
+		wait_follow_ups(IP, graph, dispatcher)
+	log(IP, "Enumeration complete")
+
+def enumerate_within_budget(directories, hosts_in_flight): # Every host gets its quick checks and follow-ups before any full scan starts
+	with ThreadPoolExecutor(max_workers=hosts_in_flight) as pool:
+		covered = list(pool.map(lambda entry: guarded(entry[0], quick_pass, *entry), directories))
+	with ThreadPoolExecutor(max_workers=hosts_in_flight) as pool:
+		return list(pool.map(lambda entry, services: run_host(*entry, full_pass, services or set()), directories, covered))
+
+def guarded(IP, function, *args): # Logs the error of a pass and returns None, so the other hosts carry on
+	try:
+		return function(*args)
+	except Exception as e:
+		log(IP, "Enumeration failed: %s" % e)
+		return None
+
+def run_host(IP, OUTPUT_DIRECTORY, pipeline=enumerate_host, *args): # Keeps one failing host from taking the rest of the run down with it
+	try:
+		pipeline(IP, OUTPUT_DIRECTORY, *args)
+		return True
+	except Exception as e:
+		log(IP, "Enumeration failed: %s" % e)
+		return False
+	finally:
+		export_usage(IP, OUTPUT_DIRECTORY)
+		ingest_findings(IP, OUTPUT_DIRECTORY)
+
+def export_usage(IP, OUTPUT_DIRECTORY): # Writes resource_usage.json and resource_usage.prom for the host
+	try:
+		LEDGER.export(OUTPUT_DIRECTORY, host=IP)
+	except OSError as e:
+		log(IP, "Could not write resource usage: %s" % e)
+
+def ingest_findings(IP, OUTPUT_DIRECTORY): # Replaces the host's rows in the findings database with what its reports hold
+	try:
+		count = FINDINGS.ingest(IP, ReportReader(OUTPUT_DIRECTORY, host=IP), engagement=ENGAGEMENT)
+		log(IP, "%d finding(s) stored in %s" % (count, FINDINGS.path))
+	except (OSError, sqlite3.Error) as e:
+		log(IP, "Could not store findings: %s" % e)
+
+def sweep_hosts(hosts, ports): # Drops the targets that answer neither a TCP connect nor a ping, before any folder or scan is made for them
+	hosts = list(hosts) # The targets come expanded lazily, the sweep needs them all at once
+	sweep = LivenessSweep(ports=ports)
+	print("[*]Checking which of %d host(s) are up over TCP %s%s" % (len(hosts), ','.join(map(str, ports)), ' and ICMP' if sweep.icmp else ', ICMP needs root'))
+	results = sweep.sweep(hosts)
+	down = [result.host for result in results if not result.alive]
+	if down: # Listed in a file as well, a /16 leaves too many to read off the screen
+		path = os.path.join(HOME, 'Desktop', 'down_hosts.txt')
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		with open(path, 'w') as f:
+			f.write(''.join(host + '\n' for host in down))
+		print("[*]%d host(s) did not answer and were filtered out, listed in %s" % (len(down), path))
+		for host in down[:10]:
+			print("[-]%s" % host)
+		if len(down) > 10:
+			print("[-]... and %d more" % (len(down) - 10))
+	return [result.host for result in results if result.alive]
+
+def report_jobs(): # Prints how many tools ran and the exit code of each that failed
+	summary = STATUS.summary()
+	print("%d tool run(s) finished, %d failed" % (summary['finished'], summary['failed']))
+	for record in STATUS.failed():
+		outcome = 'exit %s' % record.exit_code if record.error is None else record.error
+		print("[!]%s on %s: %s" % (record.tool, record.host, outcome))
+
+def preflight(): # Checks every tool in parallel, the versions are cached between runs
+	found, missing = ToolPreflight().check()
+	for tool in sorted(found):
+		print("[*]%s %s" % (tool, found[tool]['version']))
+	for tool in sorted(missing):
+		print("[!]%s unavailable: %s" % (tool, missing[tool]))
+	return 'nmap' not in missing
+
+def main(argv):
+	global SCHEDULER, BATCHER, SHARDS, QUICK_PORTS, USERS, PASSWORDS, USE_DIRB, USE_XTERM, FINDINGS, ENGAGEMENT, STATUS, BUDGET, RATE
+	launched = time.monotonic() # The time budget covers the sweep and the preflight too
+	args = parse_arguments(argv)
+	USE_DIRB = args.dirb
+	USE_XTERM = args.xterm
+	SHARDS = args.shards
+	QUICK_PORTS = args.quick_ports
+	if args.users: # Large lists are memory mapped and deduplicated as they are split
+		USERS = Wordlist(sources=args.users)
+	if args.passwords:
+		PASSWORDS = Wordlist(sources=args.passwords)
+	if not preflight():
+		print("nmap is required, aborting")
+		return 1
+	RATE = RateBudget(args.rate) if args.rate else None # Each tool gets its share through its own throttle option
+	hosts = sweep_hosts(args.targets, args.sweep_ports) if args.sweep else list(args.targets)
+	if args.budget and hosts: # Shared by the hosts left after the sweep, but counted from launch
+		BUDGET = TimeBudget(args.budget, hosts=len(hosts), hosts_in_flight=args.hosts, started=launched)
+	STATUS = StatusView() # Redrawn in place on a terminal, finished tools only otherwise
+	SCHEDULER = JobScheduler(process_adapter=ProcessAdapter(backend=args.backend), max_children=args.max_children, ledger=LEDGER, rate_budget=RATE, monitor=STATUS, time_budget=BUDGET, history=RuntimeHistory(args.runtime_history))
+	directories = [(IP, make_output_directory(IP)) for IP in hosts]
+	for IP, OUTPUT_DIRECTORY in directories:
+		JOURNALS[OUTPUT_DIRECTORY] = CheckpointJournal(OUTPUT_DIRECTORY)
+	FINDINGS = FindingsStore(args.database) # Opened once the Desktop folder exists
+	ENGAGEMENT = args.engagement
+	BATCHER = BatchedScan(SCHEDULER, shards=SHARDS, batch_size=min(args.batch_size, args.hosts), work_directory=os.path.join(HOME, 'Desktop'))
+	print("Enumerating %d host(s), %d at a time" % (len(hosts), args.hosts))
+
+	STATUS.start()
+	try:
+		if BUDGET is not None:
+			results = enumerate_within_budget(directories, args.hosts)
+		else:
+			with ThreadPoolExecutor(max_workers=args.hosts) as pool:
+				results = list(pool.map(lambda entry: run_host(*entry), directories))
+		SCHEDULER.wait() # Every tool has exited, none is left running behind the summary
+	finally:
+		STATUS.stop()
+	report_jobs()
+	if BUDGET is not None and BUDGET.expired():
+		print("[!]The time budget of %.0fs was spent, stopped and skipped stages are rerun when the same targets are given again" % BUDGET.seconds)
+
+	failed = results.count(False)
+	if failed:
+		print("%d host(s) failed, see the output above" % failed)
+	print("Enumeration complete... Please pwn responsibly")
+	return 1 if failed else 0
 
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+""" Usage:  ./findings.py [-d findings.db] <query> [arguments]
+    Queries the findings database enumerator.py fills in as hosts finish,
+    or ingests output directories written by earlier runs.
+"""
+
+import sys
+import os
+import time
+import argparse
+
+from lib.findings.FindingsStore import FindingsStore, DEFAULT_ENGAGEMENT
+from lib.findings.ReportReader import ReportReader
+
+HOME = os.environ['HOME']
+DEFAULT_DATABASE = os.path.join(HOME, 'Desktop', 'findings.db') # Same default as enumerator.py
+
+def parse_arguments(argv):
+	parser = argparse.ArgumentParser(description='Query the findings of every enumerated host.')
+	parser.add_argument('-d', '--database', default=DEFAULT_DATABASE, help='SQLite findings database (default: %(default)s)')
+	parser.add_argument('-e', '--engagement', help='only query the findings of this engagement, or ingest into it (default: every engagement, ingested into %s)' % DEFAULT_ENGAGEMENT)
+	queries = parser.add_subparsers(dest='query', required=True)
+	ingest = queries.add_parser('ingest', help='add output directories of earlier runs, named after their host')
+	ingest.add_argument('directories', nargs='+')
+	queries.add_parser('engagements', help='engagements with findings stored')
+	queries.add_parser('hosts', help='hosts with an open port')
+	queries.add_parser('anonymous-ftp', help='hosts allowing anonymous FTP logins')
+	product = queries.add_parser('product', help='hosts running a product, e.g. product Apache 2.2')
+	product.add_argument('product', help='start of the product name')
+	product.add_argument('version', nargs='?', help='start of the version')
+	service = queries.add_parser('service', help='hosts running a service, e.g. service http')
+	service.add_argument('service')
+	port = queries.add_parser('port', help='hosts with a port open')
+	port.add_argument('port', type=int)
+	credentials = queries.add_parser('credentials', help='logins found by hydra')
+	credentials.add_argument('service', nargs='?')
+	shares = queries.add_parser('shares', help='SMB shares listed by enum4linux')
+	shares.add_argument('--listable', action='store_true', help='only shares enum4linux could list')
+	paths = queries.add_parser('paths', help='web paths found by content discovery')
+	paths.add_argument('contains', nargs='?', help='text the URL contains')
+	paths.add_argument('--status', type=int)
+	nikto = queries.add_parser('nikto', help='nikto findings')
+	nikto.add_argument('contains', nargs='?', help='text the URI or message contains')
+	return parser.parse_args(argv)
+
+def ingest(store, directories, engagement): # Host is taken from each directory name
+	rows = []
+	for directory in directories:
+		reader = ReportReader(directory)
+		count = store.ingest(reader.host, reader, engagement=engagement)
+		rows.append((reader.host, '%d finding(s)' % count))
+	return rows
+
+def run_query(store, args): # Returns the rows of the query, as tuples of columns
+	engagement = args.engagement # None queries every engagement
+	if args.query == 'ingest':
+		return ingest(store, args.directories, engagement or DEFAULT_ENGAGEMENT)
+	if args.query == 'engagements':
+		return [(name,) for name in store.engagements()]
+	if args.query == 'hosts':
+		return [(host,) for host in store.hosts(engagement=engagement)]
+	if args.query == 'anonymous-ftp':
+		return [(r.host, r.port, r.banner) for r in store.anonymous_ftp(engagement=engagement)]
+	if args.query == 'product':
+		return [(s.host, s.port, s.product, s.version) for s in store.services(product=args.product, version=args.version, engagement=engagement)]
+	if args.query == 'service':
+		return [(s.host, s.port, s.product, s.version) for s in store.services(service=args.service, engagement=engagement)]
+	if args.query == 'port':
+		return [(s.host, s.port, s.service, s.product, s.version) for s in store.services(port=args.port, engagement=engagement)]
+	if args.query == 'credentials':
+		return [(c.host, c.port, c.service, c.login, c.password) for c in store.credentials(args.service, engagement=engagement)]
+	if args.query == 'shares':
+		return [(s.host, s.name, s.type, s.comment) for s in store.shares(listing=True if args.listable else None, engagement=engagement)]
+	if args.query == 'paths':
+		return [(p.host, p.url, p.status) for p in store.web_paths(contains=args.contains, status=args.status, engagement=engagement)]
+	return [(f.host, f.port, f.uri, f.message) for f in store.nikto(contains=args.contains, engagement=engagement)]
+
+def main(argv):
+	args = parse_arguments(argv)
+	if args.query != 'ingest' and not os.path.exists(args.database):
+		print("No findings database at %s, run enumerator.py first" % args.database)
+		return 1
+	store = FindingsStore(args.database)
+	try:
+		start = time.time()
+		rows = run_query(store, args)
+		elapsed = time.time() - start
+	finally:
+		store.close()
+	for row in rows:
+		print('\t'.join('' if column is None else str(column) for column in row))
+	print("[*]%d row(s) in %.1f ms" % (len(rows), elapsed * 1000), file=sys.stderr)
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main(sys.argv[1:]))
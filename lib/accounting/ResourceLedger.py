@@ -0,0 +1,194 @@
+"""This module defines the ResourceLedger
+class that is used to total the resources
+each tool used on each host
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import json
+import os
+import threading
+
+
+SUMMED = ("wall_time", "user_time", "system_time", "stdout_bytes", "stderr_bytes")
+METRICS = (
+    ("processes", "enumerator_processes_total", "counter", "Processes run"),
+    ("failures", "enumerator_process_failures_total", "counter", "Processes that exited with an error"),
+    ("wall_time", "enumerator_process_wall_seconds_total", "counter", "Wall clock time of the processes"),
+    ("user_time", "enumerator_process_user_seconds_total", "counter", "User CPU time of the processes"),
+    ("system_time", "enumerator_process_system_seconds_total", "counter", "System CPU time of the processes"),
+    ("max_rss", "enumerator_process_max_rss_kilobytes", "gauge", "Largest resident set of any process"),
+    ("stdout_bytes", "enumerator_process_stdout_bytes_total", "counter", "Bytes the processes wrote to stdout"),
+    ("stderr_bytes", "enumerator_process_stderr_bytes_total", "counter", "Bytes the processes wrote to stderr"),
+)
+
+
+class ResourceLedger(object):
+    """ResourceLedger keeps one running total
+    per tool and host of the ProcessUsage
+    records it is given, and writes them out
+    as a JSON summary and as a Prometheus
+    text format file
+    """
+    JSON_FILE = "resource_usage.json"
+    PROMETHEUS_FILE = "resource_usage.prom"
+
+    def __init__(self):
+        """Initializes the ResourceLedger"""
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def record(self, tool, host, usage):
+        """Adds a finished process to the totals
+
+        @param tool: str representing the tool
+
+        @param host: str representing the host
+        the tool ran against, or None
+
+        @param usage: ProcessUsage of the process
+        """
+        with self._lock:
+            totals = self._totals.setdefault((tool, host), self._empty())
+            self._add(totals, usage)
+
+    def record_shared(self, tool, hosts, usage):
+        """Adds a finished process that ran
+        against several hosts at once. Each host
+        is charged an equal share of its times and
+        output, and its full peak RSS
+
+        @param tool: str representing the tool
+
+        @param hosts: list of str hosts the
+        tool ran against
+
+        @param usage: ProcessUsage of the process
+        """
+        hosts = list(hosts) or [None]
+        share = usage._replace(**dict((field, self._divide(getattr(usage, field), len(hosts))) for field in SUMMED))
+        for host in hosts:
+            self.record(tool, host, share)
+
+    def by_tool(self, host=None):
+        """@keyword host: str limiting the totals
+        to a single host. None includes all
+
+        @return dict: tool to its totals
+        """
+        return self._group(0, host)
+
+    def by_host(self):
+        """@return dict: host to its totals"""
+        return self._group(1)
+
+    def summary(self, host=None):
+        """@keyword host: str limiting the summary
+        to a single host. None includes all
+
+        @return dict: totals by tool, by host and
+        by (tool, host)
+        """
+        items = self._items(host)
+        return {
+            "tools": self.by_tool(host),
+            "hosts": dict((h, t) for h, t in self.by_host().items() if host is None or h == host),
+            "tool_hosts": [dict(totals, tool=tool, host=h) for (tool, h), totals in items],
+        }
+
+    def export(self, output_directory, host=None):
+        """Writes the JSON summary and the
+        Prometheus file to the directory
+
+        @param output_directory: str representing
+        the directory the files are written to
+
+        @keyword host: str limiting the export
+        to a single host. None includes all
+
+        @return list: str paths written
+        """
+        json_file = os.path.join(output_directory, self.JSON_FILE)
+        prometheus_file = os.path.join(output_directory, self.PROMETHEUS_FILE)
+        self._write(json_file, json.dumps(self.summary(host), indent=2, sort_keys=True) + "\n")
+        self._write(prometheus_file, self.prometheus(host))
+        return [json_file, prometheus_file]
+
+    def prometheus(self, host=None):
+        """@keyword host: str limiting the metrics
+        to a single host. None includes all
+
+        @return str: the totals by tool and host
+        in Prometheus text format
+        """
+        items = self._items(host)
+        lines = []
+        for field, name, kind, description in METRICS:
+            lines.append("# HELP {} {}".format(name, description))
+            lines.append("# TYPE {} {}".format(name, kind))
+            for (tool, h), totals in items:
+                labels = 'tool="{}",host="{}"'.format(self._escape(tool), self._escape(h or ""))
+                lines.append("{}{{{}}} {}".format(name, labels, totals[field]))
+        return "\n".join(lines) + "\n"
+
+    def _items(self, host=None):
+        """@return list: ((tool, host), totals)
+        tuples sorted by tool then host
+        """
+        with self._lock:
+            items = [(key, dict(totals)) for key, totals in self._totals.items()
+                     if host is None or key[1] == host]
+        return sorted(items, key=lambda item: (item[0][0], item[0][1] or ""))
+
+    def _group(self, index, host=None):
+        """Totals the records sharing the same
+        tool (index 0) or host (index 1)
+
+        @return dict
+        """
+        groups = {}
+        with self._lock:
+            for key, totals in self._totals.items():
+                if host is not None and key[1] != host:
+                    continue
+                group = groups.setdefault(key[index], self._empty())
+                group["processes"] += totals["processes"]
+                group["failures"] += totals["failures"]
+                group["max_rss"] = max(group["max_rss"], totals["max_rss"])
+                for field in SUMMED:
+                    group[field] += totals[field]
+        return groups
+
+    @staticmethod
+    def _empty():
+        totals = dict((field, 0) for field in SUMMED)
+        totals.update(processes=0, failures=0, max_rss=0)
+        return totals
+
+    @staticmethod
+    def _add(totals, usage):
+        totals["processes"] += 1
+        totals["failures"] += 1 if usage.exit_code != 0 else 0
+        totals["max_rss"] = max(totals["max_rss"], usage.max_rss)
+        for field in SUMMED:
+            totals[field] += getattr(usage, field)
+
+    @staticmethod
+    def _divide(value, parts):
+        """@return: value split in parts, bytes
+        staying whole numbers
+        """
+        return value // parts if isinstance(value, int) else value / float(parts)
+
+    @staticmethod
+    def _escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def _write(path, content):
+        """Writes the file atomically"""
+        temporary = path + ".tmp"
+        with open(temporary, "w") as f:
+            f.write(content)
+        os.replace(temporary, path)
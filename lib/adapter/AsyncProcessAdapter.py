@@ -0,0 +1,75 @@
+"""This module defines the AsyncProcessAdapter
+class that is used to abstract the execution
+of commands from within an asyncio event loop.
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import asyncio
+from asyncio.subprocess import PIPE, DEVNULL
+
+from .ProcessAdapter import ProcessAdapter, POPEN
+
+
+class AsyncProcessAdapter(ProcessAdapter):
+    """Asyncio counterpart of the ProcessAdapter.
+    Commands, args and flags are given exactly
+    as for the ProcessAdapter, but execute is a
+    coroutine so that a single event loop can
+    wait on many children at once
+    """
+
+    def __init__(self, backend=POPEN):
+        """Initializes the AsyncProcessAdapter
+
+        @keyword backend: str how children are
+        started. Only POPEN is supported, asyncio
+        starts its children itself
+
+        @raise ValueError: if the backend is not
+        POPEN
+        """
+        if backend != POPEN:
+            raise ValueError("backend must be {}, got {}".format(POPEN, backend))
+        ProcessAdapter.__init__(self, backend)
+
+    async def execute(self, command, *args, **flags):
+        """Executes the given command, with the
+        given args and flags.
+
+        @param command: str representing the
+        command to be executed
+
+        @param args: catchall for all str args
+        to be passed to the command, not as flags.
+
+        @keyword flags: catchall for all str
+        keywords to be passed, following the
+        same rules as ProcessAdapter.execute
+
+        @raise NameError: if a flag value has
+        a flag format. The command is never
+        started in this case
+
+        @return asyncio.subprocess.Process: the
+        started process. Its stdout and stderr
+        are asyncio.StreamReader objects and
+        its exit code is given by awaiting wait()
+        """
+        cmnds = (command,) + args + self._parse_flags(**flags)
+        process = await self._execute(cmnds)
+        return process
+
+    async def _execute(self, cmds):
+        """Executes the command
+
+        @param cmds: tuple of str
+        representing the commands
+        to be executed
+
+        @return: asyncio.subprocess.Process. The
+        child gets no standard input, as with the
+        ProcessAdapter
+        """
+        return await asyncio.create_subprocess_exec(*cmds, stdin=DEVNULL, stdout=PIPE, stderr=PIPE)
@@ -6,8 +6,14 @@ of commands.
 @contact: cjmcgraw(- at -)u.washington.edu
 @version: 1.0
 """
-from subprocess import Popen, PIPE
+from subprocess import Popen, PIPE, DEVNULL
 from .AbstractProcessAdapter import AbstractProcessAdapter
+from .SpawnedProcess import SpawnedProcess
+
+
+POPEN = "popen"
+POSIX_SPAWN = "posix_spawn"
+BACKENDS = (POPEN, POSIX_SPAWN)
 
 
 class ProcessAdapter(AbstractProcessAdapter):
@@ -18,6 +24,22 @@ class ProcessAdapter(AbstractProcessAdapter):
     SIMPLE_FLAG_PREFIX = "-"
     COMPLEX_FLAG_PREFIX = "--"
 
+    def __init__(self, backend=POPEN):
+        """Initializes the ProcessAdapter
+
+        @keyword backend: str how children are
+        started. POPEN uses subprocess.Popen,
+        POSIX_SPAWN uses posix_spawn through
+        SpawnedProcess, whose cost doesn't grow
+        with the memory of this process
+
+        @raise ValueError: if the backend is
+        unknown
+        """
+        if backend not in BACKENDS:
+            raise ValueError("backend must be one of {}, got {}".format(", ".join(BACKENDS), backend))
+        self._backend = backend
+
     def execute(self, command, *args, **flags):
         """Executes the given command, with the
         given args and flags.
@@ -42,7 +64,8 @@ class ProcessAdapter(AbstractProcessAdapter):
         the system will include them automatically
 
         @return subprocess.Popen: Returns a Popen
-        object that represents the call made
+        object that represents the call made, or
+        a SpawnedProcess for the POSIX_SPAWN backend
         """
         cmnds = (command,) + args + self._parse_flags(**flags)
         return_code = self._execute(cmnds)
@@ -57,9 +80,16 @@ class ProcessAdapter(AbstractProcessAdapter):
 
         @return: subprocess.Popen:
         Returns a Popen object that
-        represents the call made
+        represents the call made. The child
+        gets no standard input, so it can't
+        take keystrokes from the terminal. Its
+        pipes are binary, so the output is read
+        as the tool wrote it and decoded, if at
+        all, by whoever reads it
         """
-        return Popen(cmds, stdout=PIPE, stderr=PIPE, universal_newlines=True)
+        if self._backend == POSIX_SPAWN:
+            return SpawnedProcess(cmds)
+        return Popen(cmds, stdin=DEVNULL, stdout=PIPE, stderr=PIPE)
 
     def _parse_flags(self, **flags):
         """Parses the flag arguments into
@@ -0,0 +1,234 @@
+"""This module defines the ProcessStream
+class that is used to drain the output of
+a running process without buffering it
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import locale
+import os
+import re
+import signal
+import threading
+import time
+from collections import namedtuple
+from subprocess import Popen
+
+from .SpawnedProcess import SpawnedProcess
+
+
+ProcessUsage = namedtuple("ProcessUsage", ["exit_code", "wall_time", "user_time", "system_time",
+                                           "max_rss", "stdout_bytes", "stderr_bytes"])
+
+
+class ProcessStream(object):
+    """ProcessStream drains the stdout and
+    stderr pipes of a process at the same
+    time, so that a chatty child can never
+    block on a full pipe. Whatever the process
+    writes is copied to the output file as it
+    is read, byte for byte. Only when parsers
+    are registered is it split into lines and
+    decoded for them, nothing is kept in memory
+    once it has been passed on.
+    Once the process exits its resource usage
+    is kept in the usage attribute
+    """
+    STDOUT = "stdout"
+    STDERR = "stderr"
+    READ_SIZE = 1 << 16
+    MAX_LINE = 1 << 16
+    LINE_END = re.compile(b"\r\n|\r|\n")
+
+    def __init__(self, process, output_file=None, error_file=None):
+        """Initializes the ProcessStream
+
+        @param process: subprocess.Popen object
+        started with stdout and stderr as binary
+        PIPEs
+
+        @keyword output_file: str representing the
+        file stdout is written to. None discards it
+
+        @keyword error_file: str representing the
+        file stderr is written to. None discards it
+        """
+        self._process = process
+        self._files = {self.STDOUT: output_file, self.STDERR: error_file}
+        self._parsers = {self.STDOUT: [], self.STDERR: []}
+        self._errors = []
+        self._bytes = {self.STDOUT: 0, self.STDERR: 0}
+        self._started = time.time()
+        self._reap_lock = threading.Lock()
+        self._reaped = False
+        self.usage = None
+
+    def add_parser(self, parser, stream=STDOUT):
+        """Registers a parser for one of
+        the process streams
+
+        @param parser: callable taking a single
+        str line, decoded in the locale's
+        encoding and ending in "\n" as universal
+        newlines do. A line longer than MAX_LINE
+        bytes is handed on in pieces, each as a
+        line of its own
+
+        @keyword stream: str, either STDOUT
+        or STDERR
+
+        @raise ValueError: if the stream is
+        not known
+        """
+        if stream not in self._parsers:
+            raise ValueError("Unknown stream <{}>".format(stream))
+        self._parsers[stream].append(parser)
+        return self
+
+    def run(self):
+        """Drains both pipes until the process
+        closes them and waits on the process
+
+        @raise Exception: the first exception
+        raised by a parser or while writing an
+        output file, once both pipes are drained
+
+        @return int: exit code of the process
+        """
+        threads = [threading.Thread(target=self._drain, args=(stream, pipe))
+                   for stream, pipe in ((self.STDOUT, self._process.stdout),
+                                        (self.STDERR, self._process.stderr))
+                   if pipe is not None]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return_code = self._wait()
+        if self._errors:
+            raise self._errors[0]
+        return return_code
+
+    def terminate(self):
+        """Sends SIGTERM to the process unless it
+        has been reaped. Once the process is handed
+        to a stream it must be stopped through here,
+        as Popen.terminate polls, and so reaps, the
+        child the stream is waiting on
+        """
+        if not self._reapable():
+            self._process.terminate()
+            return
+        with self._reap_lock:
+            if not self._reaped:
+                try:
+                    os.kill(self._process.pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+    def _reapable(self):
+        """@return bool: if the stream reaps the
+        process itself with wait4
+        """
+        return isinstance(self._process, (Popen, SpawnedProcess))
+
+    def _wait(self):
+        """Reaps the process with wait4 so its
+        rusage is collected alongside the exit
+        code. Wall time counts from when the
+        stream was created. A child reaped by
+        someone else leaves no rusage behind
+
+        @return int: exit code of the process
+        """
+        rusage = None
+        if not self._reapable() or self._process.returncode is not None:
+            return_code = self._process.wait()
+        else:
+            try:
+                _, status, rusage = os.wait4(self._process.pid, 0)
+                return_code = self._process.returncode = os.waitstatus_to_exitcode(status)
+            except ChildProcessError:
+                return_code = self._process.returncode if self._process.returncode is not None else self._process.wait()
+            finally:
+                with self._reap_lock:
+                    self._reaped = True
+
+        self.usage = ProcessUsage(return_code,
+                                  time.time() - self._started,
+                                  rusage.ru_utime if rusage else 0.0,
+                                  rusage.ru_stime if rusage else 0.0,
+                                  rusage.ru_maxrss if rusage else 0,
+                                  self._bytes[self.STDOUT],
+                                  self._bytes[self.STDERR])
+        return return_code
+
+    def _drain(self, stream, pipe):
+        """Copies the pipe to the output file
+        and the parsers in chunks until it is
+        closed
+
+        @param stream: str name of the stream
+
+        @param pipe: binary file object to be
+        drained
+        """
+        output = None
+        try:
+            if self._files[stream]:
+                output = open(self._files[stream], "wb", buffering=0)
+            parsers = self._parsers[stream]
+            rest = b""
+            for chunk in iter(lambda: os.read(pipe.fileno(), self.READ_SIZE), b""):
+                self._bytes[stream] += len(chunk)
+                if output:
+                    output.write(chunk)
+                if parsers:
+                    lines, rest = self._split(rest + chunk)
+                    self._parse(parsers, lines)
+            if rest.endswith(b"\r"):
+                self._parse(parsers, [rest[:-1]])
+            elif rest:
+                self._parse(parsers, [rest], ending="")
+        except Exception as e:
+            self._errors.append(e)
+            for chunk in iter(lambda: os.read(pipe.fileno(), self.READ_SIZE), b""):
+                self._bytes[stream] += len(chunk)
+        finally:
+            if output:
+                output.close()
+            pipe.close()
+
+    def _split(self, data):
+        """Splits data into lines at "\r\n", "\r"
+        or "\n". A "\r" at the very end is held
+        back, as a "\n" may follow it
+
+        @return tuple: list of bytes lines,
+        without their endings, and the bytes left
+        after the last whole line
+        """
+        lines = []
+        start = 0
+        for match in self.LINE_END.finditer(data):
+            if match.end() == len(data) and match.group() == b"\r":
+                break
+            lines.append(data[start:match.start()])
+            start = match.end()
+        rest = data[start:]
+        while len(rest) > self.MAX_LINE:
+            lines.append(rest[:self.MAX_LINE])
+            rest = rest[self.MAX_LINE:]
+        return lines, rest
+
+    @staticmethod
+    def _parse(parsers, lines, ending="\n"):
+        """Decodes the lines and hands each
+        to every parser
+        """
+        encoding = locale.getpreferredencoding(False)
+        for line in lines:
+            text = line.decode(encoding, "replace") + ending
+            for parser in parsers:
+                parser(text)
@@ -0,0 +1,166 @@
+"""This module defines the SpawnedProcess
+class, a child process started with
+posix_spawn rather than fork and exec
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import os
+import selectors
+import signal
+import threading
+import time
+from subprocess import TimeoutExpired
+
+
+class SpawnedProcess(object):
+    """SpawnedProcess starts a command with
+    posix_spawnp, so no copy of the parent's
+    page tables is made however large the
+    parent has grown, and no shell is involved.
+    Standard input is a /dev/null descriptor
+    opened once and shared by every child, and
+    standard output and error are binary pipes.
+    The interface is the part of Popen the
+    adapters' callers use
+    """
+    READ_SIZE = 1 << 15
+    POLL_INTERVAL = 0.005
+    DEFAULT_SIGNALS = tuple(getattr(signal, name) for name in ("SIGPIPE", "SIGXFSZ", "SIGXFZ")
+                            if hasattr(signal, name))
+    _devnull = None
+    _devnull_lock = threading.Lock()
+
+    def __init__(self, args, env=None):
+        """Starts the process
+
+        @param args: list of str, the command
+        looked up on the PATH followed by its
+        arguments
+
+        @keyword env: dict environment of the
+        child, the parent's when None
+
+        @raise OSError: if the command can't be
+        found or started
+        """
+        self.args = list(args)
+        self.returncode = None
+        stdout_read, stdout_write = os.pipe()
+        stderr_read, stderr_write = os.pipe()
+        try:
+            self.pid = os.posix_spawnp(self.args[0], self.args, os.environ if env is None else env,
+                                       file_actions=[(os.POSIX_SPAWN_DUP2, self._null(), 0),
+                                                     (os.POSIX_SPAWN_DUP2, stdout_write, 1),
+                                                     (os.POSIX_SPAWN_DUP2, stderr_write, 2)],
+                                       setsigdef=self.DEFAULT_SIGNALS)
+        except OSError:
+            os.close(stdout_read)
+            os.close(stderr_read)
+            raise
+        finally:
+            os.close(stdout_write)
+            os.close(stderr_write)
+        self.stdout = open(stdout_read, "rb")
+        self.stderr = open(stderr_read, "rb")
+
+    @classmethod
+    def _null(cls):
+        """@return int: the shared read only
+        /dev/null descriptor, opened on first use.
+        Children are started from many threads,
+        so it is opened under a lock, only once
+        """
+        if cls._devnull is None:
+            with cls._devnull_lock:
+                if cls._devnull is None:
+                    cls._devnull = os.open(os.devnull, os.O_RDONLY | os.O_CLOEXEC)
+        return cls._devnull
+
+    def poll(self):
+        """@return int: exit code, or None while
+        the process is running
+        """
+        if self.returncode is None:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+            if pid:
+                self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def wait(self, timeout=None):
+        """Waits for the process to exit
+
+        @keyword timeout: float seconds, forever
+        when None
+
+        @raise subprocess.TimeoutExpired: if the
+        process is still running after timeout
+
+        @return int: exit code
+        """
+        if self.returncode is not None:
+            return self.returncode
+        if timeout is None:
+            _, status = os.waitpid(self.pid, 0)
+            self.returncode = os.waitstatus_to_exitcode(status)
+            return self.returncode
+        deadline = time.monotonic() + timeout
+        while self.poll() is None:
+            if time.monotonic() >= deadline:
+                raise TimeoutExpired(self.args, timeout)
+            time.sleep(self.POLL_INTERVAL)
+        return self.returncode
+
+    def communicate(self, timeout=None):
+        """Reads standard output and error to
+        the end, then waits for the process
+
+        @keyword timeout: float seconds, forever
+        when None. Output read before it expires
+        is kept for the next call
+
+        @raise subprocess.TimeoutExpired: if the
+        process hasn't finished after timeout
+
+        @return tuple: bytes stdout and stderr
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not hasattr(self, "_output"):
+            self._output = {self.stdout: [], self.stderr: []}
+        with selectors.DefaultSelector() as selector:
+            for pipe in (self.stdout, self.stderr):
+                if not pipe.closed:
+                    selector.register(pipe.fileno(), selectors.EVENT_READ, pipe)
+            while selector.get_map():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutExpired(self.args, timeout)
+                for key, _ in selector.select(remaining):
+                    data = os.read(key.fd, self.READ_SIZE)
+                    if data:
+                        self._output[key.data].append(data)
+                    else:
+                        selector.unregister(key.fd)
+                        key.data.close()
+        self.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return tuple(b"".join(self._output[pipe]) for pipe in (self.stdout, self.stderr))
+
+    def terminate(self):
+        """Sends SIGTERM unless the process has
+        been reaped
+        """
+        self._signal(signal.SIGTERM)
+
+    def kill(self):
+        """Sends SIGKILL unless the process has
+        been reaped
+        """
+        self._signal(signal.SIGKILL)
+
+    def _signal(self, number):
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, number)
+            except ProcessLookupError:
+                pass
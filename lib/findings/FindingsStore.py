@@ -0,0 +1,316 @@
+"""This module defines the FindingsStore class
+that keeps the findings of every host in an
+indexed SQLite database
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import sqlite3
+import threading
+from collections import namedtuple
+
+from lib.findings.ReportReader import WebPath, Share
+from lib.ftp.AnonymousFtpChecker import FtpResult
+from lib.hydra.ShardedHydra import Credential
+from lib.nikto.NiktoCsvReader import NiktoFinding
+from lib.nmap.NmapXmlReader import PortRecord
+
+
+Service = namedtuple("Service", ["host", "protocol", "port", "service", "product", "version"])
+WebFinding = namedtuple("WebFinding", ["host", "port", "osvdb", "method", "uri", "message"])
+
+DEFAULT_ENGAGEMENT = "default"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ports (
+    engagement TEXT NOT NULL, host TEXT NOT NULL, protocol TEXT NOT NULL, port INTEGER NOT NULL, state TEXT,
+    service TEXT COLLATE NOCASE, product TEXT COLLATE NOCASE, version TEXT COLLATE NOCASE,
+    UNIQUE (engagement, host, protocol, port));
+CREATE INDEX IF NOT EXISTS ports_port ON ports (port, state);
+CREATE INDEX IF NOT EXISTS ports_service ON ports (service, state);
+CREATE INDEX IF NOT EXISTS ports_product ON ports (product, version);
+CREATE TABLE IF NOT EXISTS nikto (
+    engagement TEXT NOT NULL, host TEXT NOT NULL, port INTEGER, osvdb INTEGER, method TEXT, uri TEXT,
+    message TEXT);
+CREATE INDEX IF NOT EXISTS nikto_host ON nikto (engagement, host);
+CREATE INDEX IF NOT EXISTS nikto_osvdb ON nikto (osvdb);
+CREATE TABLE IF NOT EXISTS web_paths (
+    engagement TEXT NOT NULL, host TEXT NOT NULL, port INTEGER, url TEXT, status INTEGER, size INTEGER);
+CREATE INDEX IF NOT EXISTS web_paths_host ON web_paths (engagement, host);
+CREATE INDEX IF NOT EXISTS web_paths_status ON web_paths (status);
+CREATE TABLE IF NOT EXISTS credentials (
+    engagement TEXT NOT NULL, host TEXT NOT NULL, port INTEGER, service TEXT, login TEXT, password TEXT,
+    UNIQUE (engagement, host, port, service, login, password));
+CREATE INDEX IF NOT EXISTS credentials_service ON credentials (service);
+CREATE TABLE IF NOT EXISTS shares (
+    engagement TEXT NOT NULL, host TEXT NOT NULL, name TEXT COLLATE NOCASE, type TEXT, comment TEXT,
+    listing INTEGER, UNIQUE (engagement, host, name));
+CREATE INDEX IF NOT EXISTS shares_listing ON shares (listing);
+CREATE TABLE IF NOT EXISTS ftp_anonymous (
+    engagement TEXT NOT NULL, host TEXT NOT NULL, port INTEGER, banner TEXT, UNIQUE (engagement, host, port));
+"""
+
+INSERTS = {
+    PortRecord: ("ports", "INSERT OR REPLACE INTO ports VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                 lambda host, r: (host, r.protocol, r.port, r.state, r.service, r.product, r.version)),
+    NiktoFinding: ("nikto", "INSERT INTO nikto VALUES (?, ?, ?, ?, ?, ?, ?)",
+                   lambda host, r: (host, r.port, r.osvdb, r.method, r.uri, r.message)),
+    WebPath: ("web_paths", "INSERT INTO web_paths VALUES (?, ?, ?, ?, ?, ?)",
+              lambda host, r: (host, r.port, r.url, r.status, r.size)),
+    Credential: ("credentials", "INSERT OR IGNORE INTO credentials VALUES (?, ?, ?, ?, ?, ?)",
+                 lambda host, r: (host, r.port, r.service, r.login, r.password)),
+    Share: ("shares", "INSERT OR REPLACE INTO shares VALUES (?, ?, ?, ?, ?, ?)",
+            lambda host, r: (host, r.name, r.type, r.comment, r.listing)),
+    FtpResult: ("ftp_anonymous", "INSERT OR REPLACE INTO ftp_anonymous VALUES (?, ?, ?, ?)",
+                lambda host, r: (host, r.port, r.banner)),
+}
+
+
+class FindingsStore(object):
+    """FindingsStore ingests the records of a
+    host in one transaction, inserting them in
+    batches per table and replacing whatever
+    an earlier run of the same engagement
+    stored for the host. Engagements keep the
+    findings of different tests apart, so a
+    host seen in two of them keeps both. The
+    queries other tools ask for most are backed
+    by indexes, so they stay fast with
+    thousands of hosts stored
+    """
+    BATCH_SIZE = 500
+
+    def __init__(self, path=":memory:"):
+        """Initializes the FindingsStore,
+        creating the schema if it is missing
+
+        @keyword path: str representing the
+        database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL" if path != ":memory:" else "PRAGMA journal_mode=MEMORY")
+        unscoped = self._unscoped_tables()
+        with self._connection:
+            for table in unscoped: # Kept aside while the table is created again with its engagement
+                self._connection.execute("CREATE TABLE {0}_unscoped AS SELECT * FROM {0}".format(table))
+                self._connection.execute("DROP TABLE {}".format(table))
+        self._connection.executescript(SCHEMA)
+        with self._connection:
+            for table in unscoped: # Findings stored before engagements existed belong to the default one
+                self._connection.execute("INSERT INTO {0} SELECT ?, * FROM {0}_unscoped".format(table),
+                                         (DEFAULT_ENGAGEMENT,))
+                self._connection.execute("DROP TABLE {}_unscoped".format(table))
+
+    def ingest(self, host, records, engagement=DEFAULT_ENGAGEMENT):
+        """Replaces the findings of the host in
+        the engagement
+
+        @param host: str representing the host
+        the records are about
+
+        @param records: iterable of PortRecord,
+        NiktoFinding, WebPath, Credential, Share
+        and FtpResult. Other records are ignored
+
+        @keyword engagement: str naming the test
+        the records were found in
+
+        @return int: number of records stored
+        """
+        with self._lock, self._connection:
+            for table, _, _ in INSERTS.values():
+                self._connection.execute("DELETE FROM {} WHERE engagement = ? AND host = ?".format(table),
+                                         (engagement, host))
+            batches = dict((kind, []) for kind in INSERTS)
+            count = 0
+            for record in records:
+                batch = batches.get(type(record))
+                if batch is None:
+                    continue
+                batch.append((engagement,) + INSERTS[type(record)][2](host, record))
+                count += 1
+                if len(batch) >= self.BATCH_SIZE:
+                    self._flush(type(record), batch)
+            for kind, batch in batches.items():
+                self._flush(kind, batch)
+        return count
+
+    def engagements(self):
+        """@return list: str of every engagement
+        with findings stored
+        """
+        tables = " UNION ".join("SELECT engagement FROM {}".format(table) for table, _, _ in INSERTS.values())
+        return [row[0] for row in self._query("SELECT engagement FROM ({}) ORDER BY engagement".format(tables))]
+
+    def hosts(self, engagement=None):
+        """@keyword engagement: str only returns
+        the hosts of the engagement
+
+        @return list: str of every host with
+        an open port
+        """
+        clauses, values = self._scope(["state = 'open'"], [], engagement)
+        sql = "SELECT DISTINCT host FROM ports WHERE {} ORDER BY host"
+        return [row[0] for row in self._query(sql.format(" AND ".join(clauses)), values)]
+
+    def services(self, port=None, service=None, product=None, version=None, engagement=None):
+        """Finds open ports, every given filter
+        must match
+
+        @keyword port: int port number
+
+        @keyword service: str service name, such
+        as http
+
+        @keyword product: str the product starts
+        with, such as Apache
+
+        @keyword version: str the version starts
+        with, such as 2.2
+
+        @keyword engagement: str the ports were
+        found in
+
+        @return list: Service
+        """
+        clauses, values = self._scope(["state = 'open'"], [], engagement)
+        for column, value, operator in (("port", port, "= ?"), ("service", service, "= ?"),
+                                        ("product", product, "LIKE ?"), ("version", version, "LIKE ?")):
+            if value is not None:
+                clauses.append("{} {}".format(column, operator))
+                values.append(value + "%" if operator == "LIKE ?" else value)
+        sql = "SELECT host, protocol, port, service, product, version FROM ports WHERE {} ORDER BY host, port"
+        return [Service(*row) for row in self._query(sql.format(" AND ".join(clauses)), values)]
+
+    def anonymous_ftp(self, engagement=None):
+        """@keyword engagement: str only returns
+        the servers of the engagement
+
+        @return list: FtpResult of every
+        server allowing anonymous logins
+        """
+        clauses, values = self._scope(["1"], [], engagement)
+        sql = "SELECT host, port, banner FROM ftp_anonymous WHERE {} ORDER BY host, port"
+        rows = self._query(sql.format(" AND ".join(clauses)), values)
+        return [FtpResult(host, port, True, banner, None, None) for host, port, banner in rows]
+
+    def credentials(self, service=None, engagement=None):
+        """@keyword service: str only returns the
+        credentials of the service, such as ftp
+
+        @keyword engagement: str only returns the
+        credentials of the engagement
+
+        @return list: Credential
+        """
+        clauses, values = self._scope(["1"], [], engagement)
+        if service is not None:
+            clauses.append("service = ?")
+            values.append(service)
+        sql = "SELECT host, port, service, login, password FROM credentials WHERE {} ORDER BY host, port"
+        return [Credential(*row) for row in self._query(sql.format(" AND ".join(clauses)), values)]
+
+    def shares(self, listing=None, engagement=None):
+        """@keyword listing: bool only returns the
+        shares enum4linux could or couldn't list
+
+        @keyword engagement: str only returns the
+        shares of the engagement
+
+        @return list: Share
+        """
+        clauses, values = self._scope(["1"], [], engagement)
+        if listing is not None:
+            clauses.append("listing = ?")
+            values.append(int(listing))
+        sql = "SELECT host, name, type, comment, listing FROM shares WHERE {} ORDER BY host, name"
+        rows = self._query(sql.format(" AND ".join(clauses)), values)
+        return [Share(host, name, kind, comment, None if seen is None else bool(seen))
+                for host, name, kind, comment, seen in rows]
+
+    def web_paths(self, contains=None, status=None, engagement=None):
+        """@keyword contains: str the URL must
+        contain
+
+        @keyword status: int HTTP status
+
+        @keyword engagement: str the paths were
+        found in
+
+        @return list: WebPath
+        """
+        clauses, values = self._scope(["1"], [], engagement)
+        if contains is not None:
+            clauses.append("instr(url, ?) > 0")
+            values.append(contains)
+        if status is not None:
+            clauses.append("status = ?")
+            values.append(status)
+        sql = "SELECT host, port, url, status, size FROM web_paths WHERE {} ORDER BY host, port, url"
+        return [WebPath(*row) for row in self._query(sql.format(" AND ".join(clauses)), values)]
+
+    def nikto(self, contains=None, osvdb=None, engagement=None):
+        """@keyword contains: str the URI or
+        message must contain
+
+        @keyword osvdb: int OSVDB identifier
+
+        @keyword engagement: str the findings
+        were made in
+
+        @return list: WebFinding
+        """
+        clauses, values = self._scope(["1"], [], engagement)
+        if contains is not None:
+            clauses.append("(instr(uri, ?) > 0 OR instr(message, ?) > 0)")
+            values.extend([contains, contains])
+        if osvdb is not None:
+            clauses.append("osvdb = ?")
+            values.append(osvdb)
+        sql = "SELECT host, port, osvdb, method, uri, message FROM nikto WHERE {} ORDER BY host, port, uri"
+        return [WebFinding(*row) for row in self._query(sql.format(" AND ".join(clauses)), values)]
+
+    def close(self):
+        """Closes the database"""
+        with self._lock:
+            self._connection.close()
+
+    def _flush(self, kind, batch):
+        """Inserts a batch of rows and empties
+        it
+        """
+        if batch:
+            self._connection.executemany(INSERTS[kind][1], batch)
+            del batch[:]
+
+    def _unscoped_tables(self):
+        """@return list: str tables of a database
+        written before findings were kept per
+        engagement
+        """
+        unscoped = []
+        for table, _, _ in INSERTS.values():
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info({})".format(table))]
+            if columns and "engagement" not in columns:
+                unscoped.append(table)
+        return unscoped
+
+    @staticmethod
+    def _scope(clauses, values, engagement):
+        """Adds the engagement filter, if any, to
+        the clauses of a query
+
+        @return tuple: the clauses and values
+        """
+        if engagement is not None:
+            clauses.append("engagement = ?")
+            values.append(engagement)
+        return clauses, values
+
+    def _query(self, sql, values=()):
+        """@return list: rows the query returned"""
+        with self._lock:
+            return self._connection.execute(sql, values).fetchall()
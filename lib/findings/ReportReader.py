@@ -0,0 +1,173 @@
+"""This module defines the ReportReader class
+that is used to read the findings out of the
+tool reports of a host's output directory
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import os
+import re
+from collections import namedtuple
+
+from lib.ftp.AnonymousFtpChecker import FtpResult
+from lib.hydra.ShardedHydra import ShardedHydra
+from lib.nikto.NiktoCsvReader import NiktoCsvReader, NiktoFinding
+from lib.nmap.NmapXmlReader import NmapXmlReader, PortRecord
+
+
+WebPath = namedtuple("WebPath", ["host", "port", "url", "status", "size"])
+Share = namedtuple("Share", ["host", "name", "type", "comment", "listing"])
+
+NIKTO_PATTERN = re.compile(r"^\+ (?:OSVDB-(\d+): )?(?:([A-Z]+) )?(/\S*): (.*?)\s*$")
+DIRB_PATTERN = re.compile(r"^\+ (\S+) \(CODE:(\d+)\|SIZE:(\d+)\)")
+DIRB_DIRECTORY_PATTERN = re.compile(r"^==> DIRECTORY: (\S+)")
+SHARE_PATTERN = re.compile(r"^\s+(\S+)\s+(Disk|IPC|Printer)\b\s*(.*?)\s*$")
+MAPPING_PATTERN = re.compile(r"^//[^/]+/(\S+)\s+Mapping: (\w+),? Listing: (\w+)")
+FTP_PATTERN = re.compile(r"^Anonymous FTP login allowed on (\S+):(\d+)$")
+
+
+class ReportReader(object):
+    """ReportReader yields PortRecord, NiktoFinding,
+    WebPath, Credential, Share and FtpResult
+    records from the reports enumerator writes
+    to an output directory. Missing reports are
+    skipped, so a directory can be read at any
+    point of its host's run
+    """
+    NMAP_FILES = ("nmap_full.xml", "nmap_full_ports.xml")
+    WEB_PORTS = {"80": 80, "443": 443}
+
+    def __init__(self, output_directory, host=None):
+        """Initializes the ReportReader
+
+        @param output_directory: str representing
+        the directory holding the reports
+
+        @keyword host: str representing the host
+        the reports are about, the directory name
+        when None
+        """
+        self._directory = output_directory
+        self.host = host or os.path.basename(os.path.normpath(output_directory))
+
+    def __iter__(self):
+        """@return iterator of every record the
+        reports hold
+        """
+        for reader in (self.ports, self.nikto, self.web_paths, self.credentials, self.shares, self.anonymous_ftp):
+            for record in reader():
+                yield record
+
+    def ports(self):
+        """@return iterator of PortRecord, from
+        the service scan if it finished and the
+        port scan otherwise
+        """
+        for name in self.NMAP_FILES:
+            path = self._path(name)
+            if path:
+                for record in NmapXmlReader(path):
+                    if isinstance(record, PortRecord):
+                        yield record
+                return
+
+    def nikto(self):
+        """@return iterator of NiktoFinding, from
+        nikto's text or CSV reports
+        """
+        for suffix, port in sorted(self.WEB_PORTS.items()):
+            path = self._path("nikto_{}.txt".format(suffix))
+            if not path:
+                continue
+            with open(path, errors="replace") as f:
+                csv = f.read(1) == '"'
+            if csv:
+                for finding in NiktoCsvReader(path):
+                    yield finding
+                continue
+            for line in self._lines(path):
+                match = NIKTO_PATTERN.match(line)
+                if match:
+                    osvdb, method, uri, message = match.groups()
+                    yield NiktoFinding(self.host, self.host, port, int(osvdb) if osvdb else None,
+                                       method or "GET", uri, message)
+
+    def web_paths(self):
+        """@return iterator of WebPath found by
+        content discovery, directories have no
+        status or size
+        """
+        for suffix, port in sorted(self.WEB_PORTS.items()):
+            path = self._path("dirb_{}.txt".format(suffix))
+            if not path:
+                continue
+            for line in self._lines(path):
+                match = DIRB_PATTERN.match(line)
+                if match:
+                    yield WebPath(self.host, port, match.group(1), int(match.group(2)), int(match.group(3)))
+                    continue
+                match = DIRB_DIRECTORY_PATTERN.match(line)
+                if match:
+                    yield WebPath(self.host, port, match.group(1), None, None)
+
+    def credentials(self):
+        """@return iterator of Credential found
+        by hydra
+        """
+        for name in sorted(os.listdir(self._directory)):
+            if name.endswith("_accounts.txt"):
+                for line in self._lines(os.path.join(self._directory, name)):
+                    credential = ShardedHydra.parse_credential(line)
+                    if credential:
+                        yield credential
+
+    def shares(self):
+        """@return iterator of Share listed by
+        enum4linux, with listing True or False
+        when it tried to list the share
+        """
+        path = self._path("enum_info.txt")
+        if not path:
+            return
+        shares = {}
+        listings = {}
+        for line in self._lines(path):
+            match = MAPPING_PATTERN.match(line)
+            if match:
+                listings[match.group(1)] = match.group(3).upper() == "OK"
+                continue
+            match = SHARE_PATTERN.match(line)
+            if match and match.group(1) != "Sharename":
+                shares.setdefault(match.group(1), match.groups())
+        for name, (_, kind, comment) in shares.items():
+            yield Share(self.host, name, kind, comment, listings.get(name))
+
+    def anonymous_ftp(self):
+        """@return iterator of FtpResult for the
+        servers allowing anonymous logins
+        """
+        path = self._path("ftp_anonymous.txt")
+        if not path:
+            return
+        lines = list(self._lines(path))
+        for i, line in enumerate(lines):
+            match = FTP_PATTERN.match(line)
+            if match:
+                banner = lines[i + 2] if i + 2 < len(lines) and lines[i + 1] == "Banner:" else ""
+                yield FtpResult(match.group(1), int(match.group(2)), True, banner, None, None)
+
+    def _path(self, name):
+        """@return str: path of the report, or
+        None if it wasn't written
+        """
+        path = os.path.join(self._directory, name)
+        return path if os.path.isfile(path) else None
+
+    def _lines(self, path):
+        """@return iterator of the lines of a
+        report, without line endings
+        """
+        with open(path, errors="replace") as f:
+            for line in f:
+                yield line.rstrip("\r\n")
@@ -0,0 +1,199 @@
+"""This module defines the AnonymousFtpChecker
+class that is used to test many FTP servers
+for anonymous access at once
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import asyncio
+import os
+import re
+from collections import namedtuple
+
+
+FtpResult = namedtuple("FtpResult", ["host", "port", "anonymous", "banner", "listing", "error"])
+PASSIVE_PATTERN = re.compile(r"(\d+),(\d+),(\d+),(\d+),(\d+),(\d+)")
+
+
+class FtpError(Exception):
+    """Raised when a server answers with
+    an unexpected reply"""
+
+
+class AnonymousFtpChecker(object):
+    """AnonymousFtpChecker logs in as anonymous
+    on every host and port it is given, all at
+    once on one event loop. Every connect and
+    every reply has a deadline, so a filtered or
+    silent server costs at most that long. The
+    banner is kept for every server, and the
+    root listing for those that let us in
+    """
+    ANONYMOUS_USER = "anonymous"
+    ANONYMOUS_PASSWORD = "anonymous@"
+    RESULT_FILE = "ftp_anonymous.txt"
+    MAX_LISTING = 1 << 16
+
+    def __init__(self, concurrency=64, connect_timeout=5.0, read_timeout=10.0):
+        """Initializes the AnonymousFtpChecker
+
+        @keyword concurrency: int representing
+        the most servers checked at once
+
+        @keyword connect_timeout: float seconds
+        allowed for each connection to open
+
+        @keyword read_timeout: float seconds
+        allowed for each reply and for the
+        listing to arrive
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1, got {}".format(concurrency))
+        self._concurrency = concurrency
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+
+    def check(self, targets):
+        """Checks every target, blocking until
+        all of them are done
+
+        @param targets: iterable of (host, port)
+        tuples
+
+        @return list: FtpResult per target, in
+        the order given
+        """
+        return asyncio.run(self.check_all(targets))
+
+    async def check_all(self, targets):
+        """Coroutine counterpart of check
+
+        @return list: FtpResult per target
+        """
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def bounded(host, port):
+            async with semaphore:
+                return await self.check_one(host, port)
+        return await asyncio.gather(*[bounded(host, port) for host, port in targets])
+
+    async def check_one(self, host, port=21):
+        """Checks a single server. Never raises,
+        failures are reported in the result
+
+        @return FtpResult
+        """
+        state = {"banner": "", "anonymous": False, "listing": None}
+        try:
+            await self._session(host, port, state)
+            error = None
+        except (OSError, EOFError, FtpError, asyncio.TimeoutError) as e:
+            error = "{}: {}".format(type(e).__name__, e) if str(e) else type(e).__name__
+        return FtpResult(host, port, state["anonymous"], state["banner"], state["listing"], error)
+
+    def save(self, result, output_directory):
+        """Writes a positive result to the
+        output directory
+
+        @param result: FtpResult to be saved
+
+        @param output_directory: str representing
+        the directory the result is written to
+
+        @return str: path written, or None if
+        the server refused anonymous access
+        """
+        if not result.anonymous:
+            return None
+        path = os.path.join(output_directory, self.RESULT_FILE)
+        with open(path, "a") as f:
+            f.write("Anonymous FTP login allowed on {}:{}\n".format(result.host, result.port))
+            f.write("Banner:\n{}\n".format(result.banner))
+            f.write("Root listing:\n{}\n".format(result.listing or ""))
+        return path
+
+    async def _session(self, host, port, state):
+        """Runs the login and listing, filling
+        in the state as it goes
+        """
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self._connect_timeout)
+        try:
+            code, state["banner"] = await self._reply(reader)
+            if code != 220:
+                raise FtpError("unexpected banner {}".format(code))
+
+            code, _ = await self._command(reader, writer, "USER " + self.ANONYMOUS_USER)
+            if code == 331:
+                code, _ = await self._command(reader, writer, "PASS " + self.ANONYMOUS_PASSWORD)
+            if code != 230:
+                return
+            state["anonymous"] = True
+            state["listing"] = await self._list(host, reader, writer)
+            await self._command(reader, writer, "QUIT")
+        finally:
+            writer.close()
+
+    async def _list(self, host, reader, writer):
+        """Lists the root directory over a
+        passive data connection. The address
+        the server gives is ignored in favor of
+        the one we connected to, as ftplib does
+
+        @return str: the listing
+        """
+        code, text = await self._command(reader, writer, "PASV")
+        match = PASSIVE_PATTERN.search(text)
+        if code != 227 or not match:
+            raise FtpError("passive mode refused: {}".format(text))
+        data_port = int(match.group(5)) * 256 + int(match.group(6))
+
+        data_reader, data_writer = await asyncio.wait_for(asyncio.open_connection(host, data_port),
+                                                          self._connect_timeout)
+        try:
+            code, text = await self._command(reader, writer, "LIST")
+            if code not in (125, 150):
+                raise FtpError("listing refused: {}".format(text))
+            listing = b""
+            while len(listing) < self.MAX_LISTING:
+                block = await asyncio.wait_for(data_reader.read(self.MAX_LISTING - len(listing)), self._read_timeout)
+                if not block:
+                    break
+                listing += block
+        finally:
+            data_writer.close()
+        await self._reply(reader)
+        return listing.decode("utf-8", "replace").rstrip("\r\n")
+
+    async def _command(self, reader, writer, command):
+        """Sends a command and reads its reply
+
+        @return tuple: (int code, str text)
+        """
+        writer.write((command + "\r\n").encode("latin-1"))
+        await asyncio.wait_for(writer.drain(), self._read_timeout)
+        return await self._reply(reader)
+
+    async def _reply(self, reader):
+        """Reads a single, possibly multi
+        line, reply
+
+        @raise EOFError: if the server closes
+        the connection
+
+        @return tuple: (int code, str text)
+        """
+        lines = []
+        while True:
+            line = await asyncio.wait_for(reader.readline(), self._read_timeout)
+            if not line:
+                raise EOFError("connection closed by server")
+            line = line.decode("utf-8", "replace").rstrip("\r\n")
+            lines.append(line)
+            if len(lines) == 1 and line[3:4] != "-":
+                break
+            if len(lines) > 1 and line[:3] == lines[0][:3] and line[3:4] == " ":
+                break
+        if not lines[0][:3].isdigit():
+            raise FtpError("malformed reply {!r}".format(lines[0]))
+        return int(lines[0][:3]), "\n".join(lines)
@@ -0,0 +1,183 @@
+"""This module defines the ShardedHydra
+class that is used to split a password
+attack across several hydra processes
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import os
+import re
+import threading
+from collections import namedtuple
+
+from lib.scheduler.Job import Job
+
+
+Credential = namedtuple("Credential", ["host", "port", "service", "login", "password"])
+CREDENTIAL_PATTERN = re.compile(r"^\[(\d+)\]\[([\w-]+)\]\s+host:\s+(\S+)\s+login:\s+(.*?)\s+password:\s?(.*?)\s*$")
+
+
+class ShardedHydra(object):
+    """ShardedHydra writes the deduplicated
+    users once and deals the passwords out to
+    shard files in the output directory, then
+    runs one hydra per shard. The first valid
+    credential any shard reports stops all of
+    the others, and the shard results are
+    merged into a single accounts file
+    """
+    HYDRA_COMMAND = "hydra"
+    MIN_SHARD_SIZE = 500
+    USERS_FILE = ".hydra_{}_users.txt"
+    PASSWORDS_FILE = ".hydra_{}_passwords_{}.txt"
+    SHARD_RESULT_FILE = ".hydra_{}_{}.txt"
+    RESULT_FILE = "{}_accounts.txt"
+    STAGE = "hydra_{}"
+
+    def __init__(self, scheduler, shards=2, journal=None):
+        """Initializes the ShardedHydra
+
+        @param scheduler: JobScheduler the hydra
+        processes are submitted to
+
+        @keyword shards: int representing the most
+        hydra processes the passwords are split
+        between. Lists under MIN_SHARD_SIZE words
+        per shard use fewer
+
+        @keyword journal: CheckpointJournal the
+        attack is recorded in. It is not run again
+        once the journal holds it as complete
+
+        @raise ValueError: if shards is less than 1
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1, got {}".format(shards))
+        self._scheduler = scheduler
+        self._shards = shards
+        self._journal = journal
+
+    def run(self, host, service, users, passwords, output_directory):
+        """Runs the attack and blocks until it
+        is finished
+
+        @param host: str representing the host
+
+        @param service: str hydra service name,
+        such as ftp or ssh
+
+        @param users: Wordlist of logins
+
+        @param passwords: Wordlist of passwords
+
+        @param output_directory: str representing
+        the directory every file is written to
+
+        @raise OSError: if a hydra process fails
+        before any credential was found
+
+        @return list: Credential found, read back
+        from the accounts file
+        """
+        stage = self.STAGE.format(service)
+        result_file = os.path.join(output_directory, self.RESULT_FILE.format(service))
+        if self._journal and self._journal.is_complete(stage):
+            return self.read_results(result_file)
+
+        if self._journal:
+            self._journal.start(stage)
+        try:
+            self._attack(host, service, users, passwords, output_directory, result_file)
+        except Exception as e:
+            if self._journal:
+                self._journal.fail(stage, e)
+            raise
+        if self._journal:
+            self._journal.complete(stage, [result_file])
+        return self.read_results(result_file)
+
+    @staticmethod
+    def read_results(result_file):
+        """@return list: Credential per line of
+        a hydra results file
+        """
+        if not os.path.isfile(result_file):
+            return []
+        with open(result_file, errors="replace") as f:
+            return [ShardedHydra.parse_credential(line) for line in f if CREDENTIAL_PATTERN.match(line)]
+
+    @staticmethod
+    def parse_credential(line):
+        """@return Credential: the credential
+        on a hydra result line, or None
+        """
+        match = CREDENTIAL_PATTERN.match(line)
+        if not match:
+            return None
+        port, service, host, login, password = match.groups()
+        return Credential(host, int(port), service, login, password)
+
+    def _attack(self, host, service, users, passwords, output_directory, result_file):
+        """Writes the lists, runs the shards
+        and merges their results
+        """
+        users_file = os.path.join(output_directory, self.USERS_FILE.format(service))
+        password_files = [os.path.join(output_directory, self.PASSWORDS_FILE.format(service, i))
+                          for i in range(self._shards)]
+        users.write(users_file)
+        counts = passwords.write_shards(password_files, min_words=self.MIN_SHARD_SIZE) # Counted as they are written
+        shards = range(max(1, sum(1 for count in counts if count)))
+        shard_files = [os.path.join(output_directory, self.SHARD_RESULT_FILE.format(service, i)) for i in shards]
+
+        lock = threading.Lock()
+        futures = []
+        found = []
+
+        def stop_others(index):
+            def parser(line):
+                if not CREDENTIAL_PATTERN.match(line):
+                    return
+                with lock:
+                    found.append(index)
+                    others = [f for i, f in enumerate(futures) if i != index]
+                for future in others:
+                    self._scheduler.stop(future)
+            return parser
+
+        try:
+            for i in shards:
+                args = ("-L", users_file, "-P", password_files[i], "-f", "-o", shard_files[i],
+                        "{}://{}".format(service, host))
+                job = Job(self.HYDRA_COMMAND, args=args, host=host, parsers=[stop_others(i)])
+                future = self._scheduler.submit(job)
+                with lock:
+                    futures.append(future)
+                    stop = any(index != i for index in found)
+                if stop:
+                    self._scheduler.stop(future)
+
+            codes = [f.result() for f in futures if not f.cancelled()]
+            failed = [code for code in codes if code != 0]
+            self._merge(host, service, shard_files, result_file)
+            if failed and not found:
+                raise OSError("{} of {} hydra processes failed".format(len(failed), len(codes)))
+        finally:
+            for path in [users_file] + password_files + shard_files:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _merge(self, host, service, shard_files, result_file):
+        """Writes the unique credentials every
+        shard found to the accounts file
+        """
+        lines = []
+        for shard_file in shard_files:
+            if not os.path.isfile(shard_file):
+                continue
+            with open(shard_file, errors="replace") as f:
+                lines.extend(line.rstrip("\n") for line in f if CREDENTIAL_PATTERN.match(line))
+        with open(result_file, "w") as f:
+            f.write("# hydra {}://{}, {} shard(s)\n".format(service, host, len(shard_files)))
+            for line in dict.fromkeys(lines):
+                f.write(line + "\n")
@@ -0,0 +1,179 @@
+"""This module defines the CheckpointJournal
+class that is used to record the progress
+of a scan so an interrupted run can resume
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+STARTED = "started"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class CheckpointJournal(object):
+    """CheckpointJournal appends one JSON record
+    per stage event to a file in the output
+    directory. A stage counts as complete when
+    its last record says so and every output it
+    recorded still has the same hash, so a rerun
+    only repeats the stages that never finished
+    or whose results were changed or removed
+    """
+    JOURNAL_FILE = ".enumerator_journal.jsonl"
+    HASH_BLOCK_SIZE = 1 << 20
+
+    def __init__(self, output_directory):
+        """Initializes the CheckpointJournal,
+        loading any records already present
+
+        @param output_directory: str representing
+        the directory the journal is kept in
+        """
+        self.path = os.path.join(output_directory, self.JOURNAL_FILE)
+        self._lock = threading.Lock()
+        self._stages = self._load()
+        self._terminate_partial_line()
+
+    @classmethod
+    def exists(cls, output_directory):
+        """@return bool: if the given directory
+        holds a journal to resume from
+        """
+        return os.path.isfile(os.path.join(output_directory, cls.JOURNAL_FILE))
+
+    def is_complete(self, stage):
+        """Checks if the given stage finished
+        and its outputs are unchanged
+
+        @param stage: str representing the stage
+
+        @return bool
+        """
+        with self._lock:
+            record = self._stages.get(stage)
+        if not record or record["status"] != COMPLETED:
+            return False
+        outputs = record.get("outputs", {})
+        return all(self._hash(path) == digest for path, digest in outputs.items())
+
+    def start(self, stage):
+        """Records that the stage started
+
+        @param stage: str representing the stage
+        """
+        self._append({"stage": stage, "status": STARTED})
+
+    def complete(self, stage, outputs=()):
+        """Records that the stage completed
+
+        @param stage: str representing the stage
+
+        @keyword outputs: iterable of str paths the
+        stage wrote, hashed now so later changes
+        are noticed
+        """
+        hashes = dict((path, self._hash(path)) for path in outputs)
+        self._append({"stage": stage, "status": COMPLETED, "outputs": hashes})
+
+    def fail(self, stage, error):
+        """Records that the stage failed
+
+        @param stage: str representing the stage
+
+        @param error: object describing the failure
+        """
+        self._append({"stage": stage, "status": FAILED, "error": str(error)})
+
+    def track(self, stage, future, outputs=()):
+        """Records the stage as started and records
+        its outcome once the future resolves. An exit
+        code other than 0 counts as a failure
+
+        @param stage: str representing the stage
+
+        @param future: concurrent.futures.Future of
+        the stage, resolving to an exit code
+
+        @keyword outputs: iterable of str paths
+        the stage writes
+
+        @return: the given future
+        """
+        outputs = tuple(outputs)
+        self.start(stage)
+
+        def done(f):
+            if f.cancelled():
+                self.fail(stage, "cancelled")
+            elif f.exception() is not None:
+                self.fail(stage, f.exception())
+            elif f.result() != 0:
+                self.fail(stage, "exit code {}".format(f.result()))
+            else:
+                self.complete(stage, outputs)
+        future.add_done_callback(done)
+        return future
+
+    def _append(self, record):
+        """Appends and syncs a single record
+
+        @param record: dict to be written
+        """
+        record["time"] = time.time()
+        line = json.dumps(record, sort_keys=True) + "\n"
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._stages[record["stage"]] = record
+
+    def _load(self):
+        """Loads the last record of every stage.
+        A line cut short by a crash is ignored
+
+        @return dict: stage to record
+        """
+        stages = {}
+        if not os.path.isfile(self.path):
+            return stages
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and "stage" in record and "status" in record:
+                    stages[record["stage"]] = record
+        return stages
+
+    def _terminate_partial_line(self):
+        """Ends a line cut short by a crash so
+        the next record starts on its own line
+        """
+        if not os.path.isfile(self.path) or not os.path.getsize(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _hash(self, path):
+        """@return str: hex sha256 of the file,
+        or None if it doesn't exist
+        """
+        if not os.path.isfile(path):
+            return None
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(self.HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
@@ -41,3 +41,16 @@ class AbstractNikto(object):
         to the output.
         """
         pass
+
+    @abstractmethod
+    def scan_findings(self, host):
+        """Scans the given host, yielding
+        findings as they are reported.
+
+        @param host: str representing
+        the IP address of the host to
+        be scanned.
+
+        @return iterator of NiktoFinding
+        """
+        pass
@@ -5,12 +5,17 @@ that is used for scanning web servers
 @contact: cjmcgraw(- at -)u.washington.edu
 @version: 1.0
 """
+import os
 import re
 import operator
+import tempfile
+import threading
+from itertools import islice
 
 from lib.adapter.ProcessAdapter import ProcessAdapter
 from lib.adapter.OSPathAdapter import OSPathAdapter
 from .AbstractNikto import AbstractNikto
+from .NiktoCsvReader import NiktoCsvReader
 
 
 NIKTO_VERSION_NAME = "nikto main"
@@ -26,8 +31,9 @@ class Nikto(AbstractNikto):
     NIKTO_COMMAND = "nikto"
     VERSION_FLAG = "-Version"
     VERSION_SEPARATOR = "---"
+    CSV_FORMAT = "csv"
 
-    def __init__(self, process_adapter=None, ospath_adapter=None):
+    def __init__(self, process_adapter=None, ospath_adapter=None, capability_cache=None):
         """Initializes the Nikto object
 
         @keyword process_adapter: AbstractProcessAdapter
@@ -36,20 +42,44 @@ class Nikto(AbstractNikto):
 
         @keyword ospath_adapter: OSPathAdapter class that
         is to be initialized as the path adapter.
+
+        @keyword capability_cache: CapabilityCache used
+        to remember the version data of the installed
+        nikto. Without one nikto is probed every time
         """
         self._output = None
         self._command_adapter = process_adapter if process_adapter else ProcessAdapter()
         self._os_path_adapter = ospath_adapter if ospath_adapter else OSPathAdapter()
+        self._capability_cache = capability_cache
 
-        self._verify_nikto_present()
+        self.version_data = self._verify_nikto_present()
 
     def _verify_nikto_present(self):
         """Verifies that the nikto command
         is currently present
+
+        @return: dict of str to int tuple
+        that represent package to version
+        numbers
         """
-        p = self._command_adapter.execute(self.NIKTO_COMMAND, self.VERSION_FLAG)
-        version_data = self._parse_version_data(p)
+        if self._capability_cache:
+            cached = self._capability_cache.lookup(self.NIKTO_COMMAND, self._probe_version_data)
+            version_data = dict((name, tuple(version)) for name, version in cached.items())
+        else:
+            version_data = self._probe_version_data()
         self._validate_current_nikto_version(version_data)
+        return version_data
+
+    def _probe_version_data(self):
+        """Runs nikto to retrieve its
+        version data
+
+        @return: dict of str to int tuple
+        that represent package to version
+        numbers
+        """
+        p = self._command_adapter.execute(self.NIKTO_COMMAND, self.VERSION_FLAG)
+        return self._parse_version_data(p)
 
     def _parse_version_data(self, process):
         """Parses the current version data
@@ -78,10 +108,11 @@ class Nikto(AbstractNikto):
         @param process: subprocess.Popen
         object that represents the process
 
-        @return: list of tuples representing
+        @return: iterator of lists representing
         the parsed lines from the process
         """
-        return filter(lambda x: len(x) >= 2, [re.split("\s\s+", line.rstrip()) for line in process.stdout][5:])
+        lines = (line.decode(errors="replace").rstrip() for line in islice(process.stdout, 5, None))
+        return filter(lambda x: len(x) >= 2, (re.split("\s\s+", line) for line in lines))
 
     def _validate_current_nikto_version(self, version_data):
         """Validates the current version of nikto
@@ -146,4 +177,61 @@ class Nikto(AbstractNikto):
         kwargs = {"host": host}
         if self._output:
             kwargs["output"] = self._output
-        return self._command_adapter.execute(self.NIKTO_COMMAND, **kwargs)
\ No newline at end of file
+        return self._command_adapter.execute(self.NIKTO_COMMAND, **kwargs)
+
+    def scan_findings(self, host):
+        """Scans the given host, asking nikto
+        for a CSV report and yielding each finding
+        as nikto writes it. The report goes to the
+        previously set output path, or to a temporary
+        file removed once the scan is finished.
+        Closing the iterator early stops nikto
+
+        @param host: str representing
+        the host to be scanned
+
+        @return iterator of NiktoFinding
+        """
+        output = self._output
+        if not output:
+            fd, output = tempfile.mkstemp(prefix="nikto_", suffix=".csv")
+            os.close(fd)
+            os.remove(output)
+
+        process = self._command_adapter.execute(self.NIKTO_COMMAND, host=host, output=output,
+                                                Format=self.CSV_FORMAT)
+        drain = threading.Thread(target=self._drain, args=(process,))
+        drain.start()
+        try:
+            for finding in NiktoCsvReader(output, follow=drain.is_alive):
+                yield finding
+        except GeneratorExit:
+            process.terminate()
+            raise
+        finally:
+            drain.join()
+            if not self._output and os.path.exists(output):
+                os.remove(output)
+
+    def _drain(self, process):
+        """Discards the console output of
+        the process so nikto never blocks
+        on a full pipe, then waits on it
+
+        @param process: subprocess.Popen
+        object that represents the process
+        """
+        errors = threading.Thread(target=self._discard, args=(process.stderr,))
+        errors.start()
+        self._discard(process.stdout)
+        errors.join()
+        process.wait()
+
+    def _discard(self, pipe):
+        """Reads the pipe until it is closed
+
+        @param pipe: iterable file object,
+        None is ignored
+        """
+        for _ in pipe or ():
+            pass
@@ -0,0 +1,87 @@
+"""This module defines the NiktoCsvReader
+class that is used to read nikto's CSV
+report while nikto is writing it
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import csv
+import os
+import re
+import time
+from collections import namedtuple
+
+
+NiktoFinding = namedtuple("NiktoFinding", ["host", "ip", "port", "osvdb", "method", "uri", "message"])
+
+
+class NiktoCsvReader(object):
+    """NiktoCsvReader yields a NiktoFinding for
+    every item line of a nikto CSV report. Only
+    complete lines are parsed, so in follow mode
+    the report can be read while nikto appends
+    to it, like tail -f
+    """
+    POLL_INTERVAL = 0.2
+    FINDING_COLUMNS = 7
+    OSVDB_PATTERN = re.compile(r"(\d+)")
+
+    def __init__(self, path, follow=None):
+        """Initializes the NiktoCsvReader
+
+        @param path: str representing the
+        path to the CSV report
+
+        @keyword follow: callable returning True
+        while nikto is still writing the report.
+        None reads what the report holds once
+        """
+        self._path = path
+        self._follow = follow
+
+    def __iter__(self):
+        """@return iterator of NiktoFinding"""
+        while self._follow is not None and not os.path.exists(self._path) and self._follow():
+            time.sleep(self.POLL_INTERVAL)
+        if not os.path.exists(self._path):
+            return
+
+        partial = ""
+        with open(self._path) as f:
+            while True:
+                writing = self._follow is not None and self._follow()
+                line = f.readline()
+                if line.endswith("\n") or (line and not writing):
+                    finding = self._parse(partial + line)
+                    partial = ""
+                    if finding:
+                        yield finding
+                elif line:
+                    partial += line
+                elif writing:
+                    time.sleep(self.POLL_INTERVAL)
+                else:
+                    break
+        if partial: # Read while nikto was writing, and it stopped before ending the line
+            finding = self._parse(partial)
+            if finding:
+                yield finding
+
+    def _parse(self, line):
+        """Parses a single report line
+
+        @param line: str representing the line
+
+        @return NiktoFinding or None if the
+        line isn't a finding
+        """
+        rows = list(csv.reader([line.strip()]))
+        if not rows or len(rows[0]) < self.FINDING_COLUMNS:
+            return None
+        host, ip, port, osvdb, method, uri, message = rows[0][:self.FINDING_COLUMNS]
+        if not port.isdigit():
+            return None
+        match = self.OSVDB_PATTERN.search(osvdb)
+        osvdb_id = int(match.group(1)) if match and int(match.group(1)) else None
+        return NiktoFinding(host, ip, int(port), osvdb_id, method, uri, message)
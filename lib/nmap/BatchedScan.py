@@ -0,0 +1,277 @@
+"""This module defines the BatchedScan class
+that is used to run the port discovery of
+many hosts in shared nmap processes
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import os
+import shutil
+import tempfile
+import threading
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import Future, as_completed
+
+from lib.nmap.NmapXmlReader import NmapXmlReader
+from lib.nmap.NmapXmlWriter import NmapXmlWriter
+from lib.nmap.OpenPortParser import OpenPortParser
+from lib.nmap.ShardedScan import ShardedScan, FIRST_PORT, LAST_PORT
+
+
+class BatchedScan(object):
+    """BatchedScan gathers the hosts asking for
+    a full scan into batches, and discovers the
+    open ports of a whole batch with one nmap
+    per port range, so nmap's startup and
+    timing calibration are paid once per batch
+    and nmap spreads its probes over all of
+    the hosts. The merged result is split back
+    into each host's nmap_full_ports.xml, and
+    the -A service scan then runs per host
+    against only its own open ports. A batch
+    starts when it is full, or once the first
+    host in it has waited LINGER seconds. The
+    nmap of a batch is throttled and accounted
+    for as a job against each of its hosts
+    """
+    LINGER = 1.0
+
+    def __init__(self, scheduler, shards=4, batch_size=16, work_directory=None):
+        """Initializes the BatchedScan
+
+        @param scheduler: JobScheduler the nmap
+        processes are submitted to
+
+        @keyword shards: int representing the
+        number of port ranges scanned at once
+
+        @keyword batch_size: int representing the
+        most hosts given to one nmap
+
+        @keyword work_directory: str representing
+        the directory batch results are written to
+        before being split, the system temporary
+        directory when None
+
+        @raise ValueError: if batch_size is less
+        than 1 or shards is out of range
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1, got {}".format(batch_size))
+        if not FIRST_PORT <= shards <= LAST_PORT:
+            raise ValueError("shards must be between 1 and {}, got {}".format(LAST_PORT, shards))
+        self._scheduler = scheduler
+        self._shards = shards
+        self._batch_size = batch_size
+        self._work_directory = work_directory
+        self._lock = threading.Lock()
+        self._pending = []
+
+    def scan(self, host, output_directory, parsers=None, journal=None):
+        """Discovers the host's open ports as part
+        of a batch, then runs its service scan.
+        Blocks until both are finished
+
+        @param host: str representing the host
+
+        @param output_directory: str representing
+        the directory results are written to
+
+        @keyword parsers: list of callables handed
+        each line nmap writes about this host
+
+        @keyword journal: CheckpointJournal of the
+        host. A host whose ports were found in an
+        earlier run skips the batch, and one with
+        some port ranges done sits out of the nmap
+        processes of those ranges
+
+        @raise OSError: if one of the nmap
+        processes exits with an error. The ranges
+        that were scanned are still written to the
+        ports file
+
+        @return list: sorted list of int open ports
+        """
+        sharded = ShardedScan(self._scheduler, shards=self._shards, journal=journal)
+        if journal is not None and journal.is_complete(ShardedScan.PORTS_STAGE):
+            return sharded.scan(host, output_directory, parsers=parsers)
+
+        try:
+            shard_files = self._enqueue(host, output_directory, journal, parsers).result()
+        except Exception:
+            sharded.write_partial(output_directory)
+            raise
+        ports_file = os.path.join(output_directory, ShardedScan.PORTS_FILE)
+        ShardedScan.merge(shard_files, ports_file)
+        if journal is not None:
+            journal.complete(ShardedScan.PORTS_STAGE, [ports_file])
+        for shard_file in shard_files:
+            os.remove(shard_file)
+        return sharded.scan_services(host, ShardedScan.open_ports(ports_file), output_directory)
+
+    @staticmethod
+    def split(xml_file, shard_files):
+        """Splits an nmap XML document of many
+        hosts into a document per host, in one
+        pass. Each host element is written out
+        as soon as it is read, so no more than one
+        is held. A document cut off where nmap was
+        stopped is split up to the cut
+
+        @param xml_file: str path of the document
+
+        @param shard_files: dict of str address or
+        hostname a host was scanned as to the list
+        of str paths its results are written to
+
+        @raise OSError: if the document can't be
+        read
+
+        @raise ElementTree.ParseError: if it is not
+        XML. What was read up to the error is still
+        written
+        """
+        reader = NmapXmlReader(xml_file)
+        writers = {}
+        try:
+            for element in reader.elements():
+                if element.tag != "host":
+                    continue
+                names = [address.get("addr") for address in element.findall("address")]
+                names += [name.get("name") for name in element.findall("hostnames/hostname")]
+                for host in dict.fromkeys(name for name in names if name in shard_files):
+                    for path in shard_files[host]:
+                        if path not in writers:
+                            writers[path] = NmapXmlWriter(path)
+                        writers[path].write(reader.root, element)
+        finally:
+            for writer in writers.values():
+                writer.close(reader.root)
+            if reader.root is not None: # Hosts nmap reported nothing about get an empty document
+                for path in (path for paths in shard_files.values() for path in paths if path not in writers):
+                    NmapXmlWriter(path).close(reader.root)
+
+    def _enqueue(self, host, output_directory, journal, parsers):
+        """Adds the host to the batch being
+        gathered, starting the batch if it is
+        full and its timer if it is new
+
+        @return Future: resolves to the list of
+        the host's shard files, one per range
+        """
+        future = Future()
+        with self._lock:
+            batch = self._pending
+            batch.append((host, output_directory, journal, list(parsers or []), future))
+            full = len(batch) >= self._batch_size
+            if full:
+                self._pending = []
+        if full:
+            self._run(batch)
+        elif len(batch) == 1:
+            timer = threading.Timer(self.LINGER, self._flush, args=(batch,))
+            timer.daemon = True
+            timer.start()
+        return future
+
+    def _flush(self, batch):
+        """Starts the batch when its time is up,
+        unless it was already started full
+        """
+        with self._lock:
+            if self._pending is not batch:
+                return
+            self._pending = []
+        self._run(batch)
+
+    def _run(self, batch):
+        """Discovers the open ports of every host
+        in the batch, one nmap per port range
+        given the hosts that still need it. Each
+        range is split into the shard file of
+        every host and journaled as soon as its
+        nmap is done, so an interrupted scan
+        resumes with the ranges left
+        """
+        sharded = ShardedScan(self._scheduler, shards=self._shards)
+        directory = tempfile.mkdtemp(prefix=".nmap_batch_", dir=self._work_directory)
+        try:
+            running = {}
+            for first, last in sharded.port_ranges():
+                stage = ShardedScan.SHARD_STAGE.format(first, last)
+                entries = [entry for entry in batch if entry[2] is None or not entry[2].is_complete(stage)]
+                hosts = list(dict.fromkeys(host for host, _, _, _, _ in entries))
+                if not hosts:
+                    continue
+                for _, _, journal, _, _ in entries:
+                    if journal is not None:
+                        journal.start(stage)
+                batch_file = ShardedScan.shard_file(directory, first, last)
+                job = sharded.shard_job(hosts, first, last, batch_file, [self._router(entries)], self._label(hosts))
+                running[self._scheduler.submit(job)] = (stage, first, last, batch_file, entries)
+
+            errors = []
+            for future in as_completed(running):
+                stage, first, last, batch_file, entries = running[future]
+                error = future.exception() or (None if future.result() == 0 else
+                                               OSError("exit code {}".format(future.result())))
+                shard_files = {}
+                for host, output_directory, _, _, _ in entries:
+                    shard_files.setdefault(host, []).append(ShardedScan.shard_file(output_directory, first, last))
+                try: # Split even when nmap failed, it is not journaled as done
+                    self.split(batch_file, shard_files)
+                except (OSError, ElementTree.ParseError): # A stopped nmap may leave nothing behind
+                    if error is None:
+                        raise
+                for host, output_directory, journal, _, _ in entries:
+                    shard_file = ShardedScan.shard_file(output_directory, first, last)
+                    if journal is None:
+                        continue
+                    if error is None:
+                        journal.complete(stage, [shard_file])
+                    else:
+                        journal.fail(stage, error)
+                if error is not None:
+                    errors.append(error)
+            if errors:
+                raise OSError("{} of {} nmap processes failed".format(len(errors), len(running)))
+        except Exception as e:
+            failure = e
+        else:
+            failure = None
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        for _, output_directory, _, _, future in batch: # Once the batch files are gone
+            if failure is not None:
+                future.set_exception(failure)
+            else:
+                future.set_result([ShardedScan.shard_file(output_directory, first, last)
+                                   for first, last in sharded.port_ranges()])
+
+    @staticmethod
+    def _label(hosts):
+        """@return str: what a job against the
+        hosts is shown as
+        """
+        return hosts[0] if len(hosts) == 1 else "{}+{}".format(hosts[0], len(hosts) - 1)
+
+    def _router(self, batch):
+        """@return callable: parser handing each
+        "Discovered open port" line to the parsers
+        of the host it is about
+        """
+        routes = {}
+        for host, _, _, parsers, _ in batch:
+            routes.setdefault(host, []).extend(parsers)
+
+        def route(line):
+            match = OpenPortParser.DISCOVERED_PATTERN.match(line)
+            if not match:
+                return
+            name, address = match.group(3), match.group(4)
+            for parser in routes.get(name) or routes.get(address) or []:
+                parser(line)
+        return route
@@ -0,0 +1,168 @@
+"""This module defines the NmapXmlReader
+class that is used to read nmap XML output
+incrementally, in constant memory
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import os
+import time
+from collections import namedtuple
+from xml.etree.ElementTree import XMLPullParser
+
+
+HostRecord = namedtuple("HostRecord", ["address", "hostname", "state"])
+PortRecord = namedtuple("PortRecord", ["address", "protocol", "port", "state", "service", "product", "version"])
+
+
+class NmapXmlReader(object):
+    """NmapXmlReader yields a PortRecord for every
+    port and a HostRecord once each host closes,
+    in document order. Elements are dropped as
+    soon as they are yielded, so memory stays
+    flat however many hosts and ports the file
+    holds. Whole host elements can be read the
+    same way through elements. In follow mode
+    the file is read as nmap writes it, like
+    tail -f. A file cut off where nmap was
+    stopped yields what it holds up to the cut
+    """
+    BLOCK_SIZE = 1 << 16
+    POLL_INTERVAL = 0.2
+
+    def __init__(self, path, follow=None):
+        """Initializes the NmapXmlReader
+
+        @param path: str representing the
+        path to the nmap XML file
+
+        @keyword follow: callable returning True
+        while nmap is still writing the file. The
+        reader then waits for the file to appear and
+        to grow until the callable returns False.
+        None reads what the file holds once
+        """
+        self._path = path
+        self._follow = follow
+        self.root = None
+
+    def __iter__(self):
+        """@return iterator of HostRecord and
+        PortRecord, in document order
+        """
+        parser = XMLPullParser(events=("start", "end"))
+        state = {"root": None, "depth": 0, "address": None, "hostname": None, "status": None}
+        for block in self._blocks():
+            parser.feed(block)
+            for record in self._records(parser, state):
+                yield record
+
+    def elements(self):
+        """Reads whole children of the nmaprun
+        root rather than records, such as each
+        host along with its ports. The root is
+        kept in the root attribute once read,
+        without its children
+
+        @return iterator of ElementTree.Element:
+        each child of the root once it closes, in
+        document order. It is cleared as soon as
+        the next one is asked for
+        """
+        parser = XMLPullParser(events=("start", "end"))
+        self.root = None
+        depth = 0
+        for block in self._blocks():
+            parser.feed(block)
+            for event, element in parser.read_events():
+                if event == "start":
+                    depth += 1
+                    if self.root is None:
+                        self.root = element
+                    continue
+                depth -= 1
+                if depth == 1:
+                    yield element
+                    element.clear()
+                    self.root.remove(element)
+
+    def _blocks(self):
+        """@return iterator of bytes: the file
+        block by block, waiting for it to grow
+        while in follow mode
+        """
+        with self._open() as f:
+            while True:
+                writing = self._follow is not None and self._follow()
+                block = f.read(self.BLOCK_SIZE)
+                if block:
+                    yield block
+                elif writing:
+                    time.sleep(self.POLL_INTERVAL)
+                else:
+                    break
+
+    def _open(self):
+        """Opens the file, waiting for it to
+        appear while in follow mode
+
+        @raise IOError: if the file doesn't exist
+        and nmap isn't writing it
+
+        @return file
+        """
+        while self._follow is not None and not os.path.exists(self._path) and self._follow():
+            time.sleep(self.POLL_INTERVAL)
+        return open(self._path, "rb")
+
+    def _records(self, parser, state):
+        """Turns the parser events read so far
+        into records, dropping the elements.
+        Every finished child of the root is
+        removed, hosts as well as the hints and
+        task progress nmap writes between them
+
+        @return iterator of records
+        """
+        for event, element in parser.read_events():
+            tag = element.tag
+            if event == "start":
+                state["depth"] += 1
+                if state["root"] is None:
+                    state["root"] = element
+                elif tag == "host":
+                    state["address"] = state["hostname"] = state["status"] = None
+                continue
+
+            state["depth"] -= 1
+
+            if tag == "address" and state["address"] is None:
+                state["address"] = element.get("addr")
+            elif tag == "hostname" and state["hostname"] is None:
+                state["hostname"] = element.get("name")
+            elif tag == "status":
+                state["status"] = element.get("state")
+            elif tag == "port":
+                yield self._port_record(state["address"], element)
+                element.clear()
+            elif tag == "host":
+                yield HostRecord(state["address"], state["hostname"] or "", state["status"])
+            if state["depth"] == 1:
+                element.clear()
+                state["root"].remove(element)
+
+    def _port_record(self, address, element):
+        """@return PortRecord: the record for
+        the given port element
+        """
+        port_state = element.find("state")
+        service = element.find("service")
+        service = service if service is not None else {}
+        return PortRecord(address,
+                          element.get("protocol"),
+                          int(element.get("portid")),
+                          port_state.get("state") if port_state is not None else None,
+                          service.get("name", ""),
+                          service.get("product", ""),
+                          service.get("version", ""))
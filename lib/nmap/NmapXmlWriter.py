@@ -0,0 +1,71 @@
+"""This module defines the NmapXmlWriter
+class that is used to write nmap XML output
+one element at a time
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+from xml.etree import ElementTree
+from xml.sax.saxutils import quoteattr
+
+
+class NmapXmlWriter(object):
+    """NmapXmlWriter writes an nmap XML document
+    as its elements come, such as those read by
+    NmapXmlReader.elements, so no more than one
+    of them is held at a time
+    """
+    ROOT_TAG = "nmaprun"
+
+    def __init__(self, path):
+        """Opens the file to be written
+
+        @param path: str representing the
+        path of the nmap XML file
+        """
+        self._file = open(path, "wb")
+        self._started = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, root, element):
+        """Writes an element under the root,
+        starting the document with the root's
+        attributes if it is the first
+
+        @param root: ElementTree.Element nmaprun
+        the element comes from
+
+        @param element: ElementTree.Element
+        """
+        self._start(root)
+        self._file.write(ElementTree.tostring(element))
+
+    def close(self, root=None):
+        """Ends the document and closes the file
+
+        @keyword root: ElementTree.Element whose
+        attributes start the document if nothing
+        was written
+        """
+        if self._file.closed:
+            return
+        try:
+            self._start(root)
+            self._file.write("</{}>\n".format(self.ROOT_TAG).encode())
+        finally:
+            self._file.close()
+
+    def _start(self, root):
+        if self._started:
+            return
+        self._started = True
+        attributes = "".join(" {}={}".format(name, quoteattr(value))
+                             for name, value in (root.attrib if root is not None else {}).items())
+        self._file.write('<?xml version="1.0" encoding="UTF-8"?>\n<{}{}>'.format(self.ROOT_TAG, attributes)
+                         .encode("utf-8"))
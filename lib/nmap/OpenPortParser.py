@@ -0,0 +1,38 @@
+"""This module defines the OpenPortParser
+class that is used to pick open ports out
+of nmap's verbose output as it is written
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import re
+
+
+class OpenPortParser(object):
+    """OpenPortParser is handed nmap's stdout
+    one line at a time and reports every
+    "Discovered open port" line the moment it
+    arrives. nmap only prints these lines when
+    run with -v
+    """
+    DISCOVERED_PATTERN = re.compile(r"^Discovered open port (\d+)/(\w+) on (\S+)(?: \(([^)]+)\))?")
+
+    def __init__(self, callback):
+        """Initializes the OpenPortParser
+
+        @param callback: callable taking the str
+        host, int port and str protocol of every
+        open port found
+        """
+        self._callback = callback
+
+    def __call__(self, line):
+        """Parses a single line of output
+
+        @param line: str line written by nmap
+        """
+        match = self.DISCOVERED_PATTERN.match(line)
+        if match:
+            port, protocol, name, address = match.groups()
+            self._callback(address if address else name, int(port), protocol)
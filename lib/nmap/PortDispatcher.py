@@ -0,0 +1,107 @@
+"""This module defines the PortDispatcher
+class that is used to start follow-up
+scanners as soon as a port is found open
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class PortDispatcher(object):
+    """PortDispatcher maps ports to follow-up
+    handlers. Each (host, port, protocol) is
+    dispatched once however many scans report
+    it, and handlers run on a small pool so that
+    the scan output feeding the dispatcher is
+    never held up by them
+    """
+
+    def __init__(self, handlers, protocol="tcp", workers=4):
+        """Initializes the PortDispatcher
+
+        @param handlers: dict of int port to a list
+        of callables taking the str host. A handler
+        may return a Future, a list of Futures or
+        None; returned Futures are waited on by wait
+
+        @keyword protocol: str protocol handlers
+        apply to, ports on others are ignored
+
+        @keyword workers: int representing the
+        number of handlers running at once
+        """
+        self._handlers = handlers
+        self._protocol = protocol
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._dispatched = set()
+        self._futures = []
+
+    def open_port(self, host, port, protocol="tcp"):
+        """Reports an open port, starting its
+        handlers unless it was seen before
+
+        @param host: str representing the host
+
+        @param port: int representing the port
+
+        @keyword protocol: str representing the
+        protocol of the port
+
+        @return bool: if the port was dispatched
+        by this call
+        """
+        key = (host, int(port), protocol)
+        with self._lock:
+            if protocol != self._protocol or key in self._dispatched:
+                return False
+            self._dispatched.add(key)
+            for handler in self._handlers.get(int(port), []):
+                self._futures.append(self._executor.submit(handler, host))
+        return True
+
+    def dispatched(self):
+        """@return set: the (host, port, protocol)
+        tuples that were dispatched
+        """
+        with self._lock:
+            return set(self._dispatched)
+
+    def wait(self):
+        """Blocks until every handler and every
+        Future returned by a handler is done, then
+        stops the pool. No ports may be reported
+        afterwards
+
+        @return list: the exceptions raised by
+        handlers or their Futures
+        """
+        errors = []
+        for future in self._pending():
+            try:
+                result = future.result()
+            except Exception as e:
+                errors.append(e)
+                continue
+            results = result if isinstance(result, (list, tuple)) else [result]
+            for nested in results:
+                if isinstance(nested, Future) and nested.exception() is not None:
+                    errors.append(nested.exception())
+        self._executor.shutdown()
+        return errors
+
+    def _pending(self):
+        """Yields handler futures, including
+        any added while waiting
+        """
+        i = 0
+        while True:
+            with self._lock:
+                if i >= len(self._futures):
+                    return
+                future = self._futures[i]
+            yield future
+            i += 1
@@ -0,0 +1,349 @@
+"""This module defines the ShardedScan
+class that is used to split the full
+port scan of a host across several
+nmap processes
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import copy
+import os
+import xml.etree.ElementTree as ElementTree
+
+from lib.nmap.NmapXmlReader import NmapXmlReader, PortRecord
+from lib.nmap.NmapXmlWriter import NmapXmlWriter
+from lib.scheduler.Job import Job
+
+
+FIRST_PORT = 1
+LAST_PORT = 65535
+
+
+class ShardedScan(object):
+    """ShardedScan discovers open ports by
+    running one nmap per port range, merges
+    the XML results into a single document and
+    then runs the -A service scan against only
+    the ports that were found open
+    """
+    NMAP_COMMAND = "nmap"
+    DISCOVERY_FLAGS = ("-v", "-T4", "--open")
+    SERVICE_FLAGS = ("-A", "-T4")
+    PORTS_FILE = "nmap_full_ports.xml"
+    SERVICE_TEXT_FILE = "nmap_full.txt"
+    SERVICE_XML_FILE = "nmap_full.xml"
+    SHARD_STAGE = "nmap_shard_{}-{}"
+    PORTS_STAGE = "nmap_full_ports"
+    SERVICE_STAGE = "nmap_service"
+
+    def __init__(self, scheduler, shards=4, journal=None):
+        """Initializes the ShardedScan
+
+        @param scheduler: JobScheduler the nmap
+        processes are submitted to
+
+        @keyword shards: int representing the
+        number of port ranges scanned at once
+
+        @keyword journal: CheckpointJournal each
+        shard, the merge and the service scan are
+        recorded in. Stages it holds as complete
+        are not run again
+
+        @raise ValueError: if shards is not
+        between 1 and the number of ports
+        """
+        if not FIRST_PORT <= shards <= LAST_PORT:
+            raise ValueError("shards must be between 1 and {}, got {}".format(LAST_PORT, shards))
+        self._scheduler = scheduler
+        self._shards = shards
+        self._journal = journal
+
+    def port_ranges(self):
+        """Splits the port space into
+        contiguous ranges of near equal size
+
+        @return list: list of (first, last)
+        int tuples, both inclusive
+        """
+        total = LAST_PORT - FIRST_PORT + 1
+        size, extra = divmod(total, self._shards)
+        ranges = []
+        first = FIRST_PORT
+        for i in range(self._shards):
+            last = first + size - 1 + (1 if i < extra else 0)
+            ranges.append((first, last))
+            first = last + 1
+        return ranges
+
+    def scan(self, host, output_directory, parsers=None):
+        """Runs the sharded discovery and the
+        service scan of the open ports. Blocks
+        until both are finished
+
+        @param host: str representing the host
+
+        @param output_directory: str representing
+        the directory results are written to
+
+        @keyword parsers: list of callables handed
+        each line the discovery processes write,
+        as they write it
+
+        @raise OSError: if one of the nmap
+        processes exits with an error. The ranges
+        that were scanned are still written to the
+        ports file
+
+        @return list: sorted list of int open ports
+        """
+        ports_file = os.path.join(output_directory, self.PORTS_FILE)
+        if not self._is_complete(self.PORTS_STAGE):
+            try:
+                shard_files = self.discover([host], output_directory, parsers)
+            except OSError:
+                self.write_partial(output_directory)
+                raise
+            self.merge(shard_files, ports_file)
+            if self._journal:
+                self._journal.complete(self.PORTS_STAGE, [ports_file])
+            for shard_file in shard_files:
+                os.remove(shard_file)
+
+        return self.scan_services(host, self.open_ports(ports_file), output_directory)
+
+    def scan_services(self, host, ports, output_directory):
+        """Runs the -A service scan against the
+        open ports, or notes that there were none.
+        Blocks until it is finished
+
+        @param host: str representing the host
+
+        @param ports: list of int open ports
+
+        @param output_directory: str representing
+        the directory results are written to
+
+        @raise OSError: if nmap exits with an
+        error
+
+        @return list: the given ports
+        """
+        if self._is_complete(self.SERVICE_STAGE):
+            return ports
+        if ports:
+            self._service_scan(host, ports, output_directory)
+        else:
+            text_file = os.path.join(output_directory, self.SERVICE_TEXT_FILE)
+            with open(text_file, "w") as f:
+                f.write("No open TCP ports found on {}\n".format(host))
+            if self._journal:
+                self._journal.complete(self.SERVICE_STAGE, [text_file])
+        return ports
+
+    def _is_complete(self, stage):
+        """@return bool: if the journal holds
+        the given stage as complete
+        """
+        return bool(self._journal) and self._journal.is_complete(stage)
+
+    def _submit(self, stage, job, outputs):
+        """Submits the job unless its stage is
+        already complete, recording it in the
+        journal
+
+        @return concurrent.futures.Future or
+        None if the stage was skipped
+        """
+        if self._is_complete(stage):
+            return None
+        future = self._scheduler.submit(job)
+        if self._journal:
+            self._journal.track(stage, future, outputs)
+        return future
+
+    def discover(self, hosts, output_directory, parsers=None, label=None):
+        """Runs one nmap per port range against
+        all of the hosts. Blocks until every
+        range is done
+
+        @param hosts: list of str hosts
+
+        @param output_directory: str representing
+        the directory the shard files are put in
+
+        @keyword parsers: list of callables handed
+        each line the processes write
+
+        @keyword label: str the jobs are reported
+        under, the first host when None
+
+        @raise OSError: if one of the nmap
+        processes exits with an error
+
+        @return list: list of str XML result
+        files, one per shard
+        """
+        futures = []
+        shard_files = []
+        for first, last in self.port_ranges():
+            shard_file = self.shard_file(output_directory, first, last)
+            job = self.shard_job(hosts, first, last, shard_file, parsers, label)
+            futures.append(self._submit(self.SHARD_STAGE.format(first, last), job, [shard_file]))
+            shard_files.append(shard_file)
+        self._wait(futures)
+        return shard_files
+
+    @staticmethod
+    def shard_file(output_directory, first, last):
+        """@return str: path of the XML results
+        of one port range in the directory
+        """
+        return os.path.join(output_directory, ".nmap_shard_{}-{}.xml".format(first, last))
+
+    def shard_job(self, hosts, first, last, shard_file, parsers=None, label=None):
+        """@param hosts: list of str hosts
+
+        @param first: int first port of the range
+
+        @param last: int last port of the range
+
+        @param shard_file: str the XML results
+        are written to
+
+        @keyword parsers: list of callables handed
+        each line the process writes
+
+        @keyword label: str the job is reported
+        under, the first host when None
+
+        @return Job: discovery of the port range
+        on all of the hosts
+        """
+        args = ("-p", "{}-{}".format(first, last)) + self.DISCOVERY_FLAGS + ("-oX", shard_file) + tuple(hosts)
+        return Job(self.NMAP_COMMAND, args=args, host=label or hosts[0], parsers=parsers, hosts=hosts)
+
+    def write_partial(self, output_directory):
+        """Merges the hosts the shard files hold
+        into the ports file of a discovery that
+        did not finish, up to where nmap was
+        stopped. The ports file is not journaled
+        and the shard files are kept, so a later
+        run still redoes the ranges that are
+        missing
+
+        @param output_directory: str representing
+        the directory the shard files are in
+
+        @return bool: if there was anything to
+        write
+        """
+        shard_files = [shard_file for shard_file in (self.shard_file(output_directory, first, last)
+                                                     for first, last in self.port_ranges())
+                       if os.path.exists(shard_file)]
+        if not shard_files:
+            return False
+        try:
+            self.merge(shard_files, os.path.join(output_directory, self.PORTS_FILE))
+        except ElementTree.ParseError: # Not nmap XML at all
+            return False
+        return True
+
+    def _service_scan(self, host, ports, output_directory):
+        """Runs -A against the given ports"""
+        outputs = [os.path.join(output_directory, self.SERVICE_TEXT_FILE),
+                   os.path.join(output_directory, self.SERVICE_XML_FILE)]
+        args = self.SERVICE_FLAGS + ("-p", ",".join(map(str, ports)),
+                                     "-oN", outputs[0], "-oX", outputs[1], host)
+        job = Job(self.NMAP_COMMAND, args=args, host=host)
+        self._wait([self._submit(self.SERVICE_STAGE, job, outputs)])
+
+    def _wait(self, futures):
+        """Waits on every future, raising once
+        all of them are done
+
+        @param futures: list of Futures, None
+        standing for a skipped stage
+
+        @raise OSError: if a process exited
+        with an error
+        """
+        codes = [future.result() for future in futures if future is not None]
+        failed = [code for code in codes if code != 0]
+        if failed:
+            raise OSError("{} of {} nmap processes failed".format(len(failed), len(codes)))
+
+    @staticmethod
+    def merge(xml_files, path):
+        """Merges nmap XML results of the same
+        hosts into the first document, written to
+        the given path. The first document is
+        streamed through host by host, and only
+        the hosts of the other files are held, so
+        their ports can be added to it. Files cut
+        off where nmap was stopped add the hosts
+        they hold whole
+
+        @param xml_files: list of str paths
+
+        @param path: str the merged document is
+        written to
+
+        @raise ElementTree.ParseError: if a file
+        is not XML
+        """
+        held = {}
+        root = None
+        for xml_file in xml_files[1:]:
+            reader = NmapXmlReader(xml_file)
+            for element in reader.elements():
+                if element.tag != "host":
+                    continue
+                address = ShardedScan._address(element)
+                if address in held:
+                    ShardedScan._ports(held[address]).extend(element.findall("ports/port"))
+                else:
+                    held[address] = copy.deepcopy(element)
+            root = root if root is not None else reader.root
+
+        reader = NmapXmlReader(xml_files[0])
+        with NmapXmlWriter(path) as writer:
+            for element in reader.elements():
+                if element.tag == "runstats": # Hosts only the other files hold go last
+                    for host in held.values():
+                        writer.write(reader.root, host)
+                    held = {}
+                elif element.tag == "host" and ShardedScan._address(element) in held:
+                    host = held.pop(ShardedScan._address(element))
+                    ShardedScan._ports(element).extend(host.findall("ports/port"))
+                writer.write(reader.root, element)
+            root = reader.root if reader.root is not None else root
+            for host in held.values():
+                writer.write(root, host)
+            writer.close(root)
+
+    @staticmethod
+    def open_ports(path):
+        """Finds the open TCP ports in an
+        nmap XML document
+
+        @param path: str path of the document
+
+        @return list: sorted list of int ports
+        """
+        return sorted(set(record.port for record in NmapXmlReader(path)
+                          if isinstance(record, PortRecord) and record.protocol == "tcp" and record.state == "open"))
+
+    @staticmethod
+    def _ports(host):
+        """@return ElementTree.Element: the ports
+        element of the host, added if it has none
+        """
+        ports = host.find("ports")
+        return ports if ports is not None else ElementTree.SubElement(host, "ports")
+
+    @staticmethod
+    def _address(host):
+        address = host.find("address")
+        return address.get("addr") if address is not None else None
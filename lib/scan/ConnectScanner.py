@@ -0,0 +1,112 @@
+"""This module defines the ConnectScanner
+class that is used to find open TCP ports
+without starting an nmap process
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import asyncio
+
+
+OPEN = "open"
+REFUSED = "refused"
+
+
+class ConnectScanner(object):
+    """ConnectScanner tries a full TCP connect
+    to every host and port it is given, all from
+    one event loop with a bound on the number of
+    connections in flight. A port counts as open
+    when the connection is accepted. Refused and
+    timed out connections count as closed
+    """
+
+    def __init__(self, concurrency=256, timeout=1.0, on_open=None):
+        """Initializes the ConnectScanner
+
+        @keyword concurrency: int representing the
+        most connections attempted at once
+
+        @keyword timeout: float seconds each
+        connection attempt is given
+
+        @keyword on_open: callable taking the host,
+        the int port and the protocol, called as
+        soon as each open port is found
+
+        @raise ValueError: if concurrency is
+        less than 1 or timeout isn't positive
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1, got {}".format(concurrency))
+        if timeout <= 0:
+            raise ValueError("timeout must be positive, got {}".format(timeout))
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._on_open = on_open
+
+    def scan(self, hosts, ports):
+        """Scans every port of every host,
+        blocking until all are done
+
+        @param hosts: iterable of str hosts
+
+        @param ports: iterable of int ports
+
+        @return dict: host to the set of its
+        open int ports, as has_open_port reads
+        """
+        return asyncio.run(self.scan_async(hosts, ports))
+
+    async def scan_async(self, hosts, ports):
+        """Coroutine counterpart of scan
+
+        @return dict: host to set of open ports
+        """
+        hosts, ports = list(hosts), list(ports)
+        results = dict((host, set()) for host in hosts)
+        # Ports vary fastest so each host is
+        # finished before the next one starts
+        pairs = ((host, port) for host in hosts for port in ports)
+
+        async def worker():
+            for host, port in pairs:
+                if await self.is_open(host, port):
+                    results[host].add(port)
+                    if self._on_open is not None:
+                        self._on_open(host, port, "tcp")
+
+        workers = min(self._concurrency, len(hosts) * len(ports))
+        await asyncio.gather(*[worker() for _ in range(workers)])
+        return results
+
+    async def is_open(self, host, port):
+        """Attempts a single connection
+
+        @return bool: if the connection
+        was accepted in time
+        """
+        return await self.probe(host, port) == OPEN
+
+    async def probe(self, host, port):
+        """Attempts a single connection and tells
+        a refusal apart from no answer, since a
+        refusal still shows the host is up
+
+        @return str: OPEN if the connection was
+        accepted in time, REFUSED if the host
+        answered with a reset, None otherwise
+        """
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self._timeout)
+        except ConnectionRefusedError:
+            return REFUSED
+        except (OSError, asyncio.TimeoutError):
+            return None
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return OPEN
@@ -0,0 +1,214 @@
+"""This module defines the LivenessSweep
+class that is used to find which targets are
+up before any tool is run against them
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import asyncio
+import ipaddress
+import os
+import socket
+import struct
+from collections import namedtuple
+
+from lib.scan.ConnectScanner import ConnectScanner, OPEN, REFUSED
+
+
+Liveness = namedtuple("Liveness", ["host", "alive", "reason"])
+
+DEFAULT_PORTS = (80, 443, 22, 445, 139, 3389, 21, 25, 8080)
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+
+class LivenessSweep(object):
+    """LivenessSweep probes every target at once
+    with TCP connects to a few common ports and,
+    when this process may open an ICMP socket,
+    an echo request. A host is up as soon as one
+    port accepts or refuses the connection, or
+    the echo is answered, and it gets no further
+    probes. A host that answers nothing within
+    the timeout is reported down. Hostnames are
+    only probed over TCP
+    """
+
+    def __init__(self, ports=DEFAULT_PORTS, concurrency=256, timeout=1.0, icmp=None, refused_is_alive=True):
+        """Initializes the LivenessSweep
+
+        @keyword ports: iterable of int TCP ports
+        knocked on, in order
+
+        @keyword concurrency: int representing the
+        most connections attempted at once
+
+        @keyword timeout: float seconds each
+        probe is given
+
+        @keyword icmp: bool if echo requests are
+        sent. Defaults to whether an ICMP socket
+        can be opened
+
+        @keyword refused_is_alive: bool if a
+        refused connection counts as an answer.
+        Turned off, only open ports do, which
+        loopback addresses need since they refuse
+        every port
+
+        @raise ValueError: if there is nothing to
+        probe with, or concurrency or timeout are
+        out of range
+        """
+        self._ports = list(ports)
+        self._icmp = self.can_ping() if icmp is None else icmp
+        if not self._ports and not self._icmp:
+            raise ValueError("at least one port is needed without ICMP")
+        self._scanner = ConnectScanner(concurrency=concurrency, timeout=timeout)
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._refused_is_alive = refused_is_alive
+
+    @property
+    def icmp(self):
+        """@return bool: if echo requests are
+        sent
+        """
+        return self._icmp
+
+    @staticmethod
+    def can_ping():
+        """@return bool: if this process may open
+        an ICMP socket, raw as root or a ping
+        socket where the kernel allows them
+        """
+        sock = LivenessSweep._icmp_socket()
+        if sock is None:
+            return False
+        sock[0].close()
+        return True
+
+    def sweep(self, hosts):
+        """Probes every host, blocking until each
+        has answered or timed out
+
+        @param hosts: iterable of str hosts
+
+        @return list: Liveness of every host in
+        the order given, its reason the first
+        answer seen such as "tcp/80 open"
+        """
+        return asyncio.run(self.sweep_async(hosts))
+
+    async def sweep_async(self, hosts):
+        """Coroutine counterpart of sweep
+
+        @return list: Liveness of every host
+        """
+        hosts = list(dict.fromkeys(hosts))
+        reasons = {}
+        probes = [self._knock(hosts, reasons)]
+        if self._icmp:
+            probes.append(self._ping(hosts, reasons))
+        await asyncio.gather(*probes)
+        return [Liveness(host, host in reasons, reasons.get(host)) for host in hosts]
+
+    async def _knock(self, hosts, reasons):
+        """Connects to the ports of every host
+        until one answers. Hosts vary fastest, so
+        the first port of every host is tried
+        before the second of any
+        """
+        pairs = ((host, port) for port in self._ports for host in hosts)
+
+        async def worker():
+            for host, port in pairs:
+                if host in reasons:
+                    continue
+                state = await self._scanner.probe(host, port)
+                if state == OPEN or (state == REFUSED and self._refused_is_alive):
+                    reasons.setdefault(host, "tcp/{} {}".format(port, state))
+
+        workers = min(self._concurrency, len(hosts) * len(self._ports))
+        await asyncio.gather(*[worker() for _ in range(workers)])
+
+    async def _ping(self, hosts, reasons):
+        """Sends one echo request to every IPv4
+        host and waits for the replies until the
+        timeout
+        """
+        waiting = {}
+        for host in hosts:
+            try:
+                if ipaddress.ip_address(host).version == 4:
+                    waiting[host] = host
+            except ValueError:
+                pass
+        opened = self._icmp_socket()
+        if not waiting or opened is None:
+            return
+        sock, raw = opened
+        loop = asyncio.get_running_loop()
+        answered = asyncio.Event()
+        identifier = os.getpid() & 0xFFFF
+
+        def receive():
+            while True:
+                try:
+                    data, (address, _) = sock.recvfrom(1024)
+                except (BlockingIOError, InterruptedError):
+                    return
+                except OSError:
+                    continue
+                if raw: # Raw sockets see every reply with its IP header
+                    data = data[(data[0] & 0x0F) * 4:]
+                    if len(data) < 8 or struct.unpack("!H", data[4:6])[0] != identifier:
+                        continue
+                if data and data[0] == ICMP_ECHO_REPLY and waiting.pop(address, None) is not None:
+                    reasons.setdefault(address, "icmp echo")
+                    if not waiting:
+                        answered.set()
+
+        loop.add_reader(sock.fileno(), receive)
+        try:
+            for sequence, address in enumerate(list(waiting)):
+                try:
+                    sock.sendto(self._echo_request(identifier, sequence), (address, 0))
+                except OSError: # Unreachable networks are simply down
+                    waiting.pop(address, None)
+            if waiting:
+                await asyncio.wait_for(answered.wait(), self._timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(sock.fileno())
+            sock.close()
+
+    @staticmethod
+    def _icmp_socket():
+        """@return tuple: non blocking ICMP socket
+        and if it is raw, or None when neither
+        kind may be opened
+        """
+        for kind in (socket.SOCK_RAW, socket.SOCK_DGRAM):
+            try:
+                sock = socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP)
+            except OSError:
+                continue
+            sock.setblocking(False)
+            return sock, kind == socket.SOCK_RAW
+        return None
+
+    @staticmethod
+    def _echo_request(identifier, sequence):
+        """@return bytes: ICMP echo request with
+        its checksum
+        """
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, identifier, sequence & 0xFFFF)
+        payload = b"enumerator"
+        data = header + payload
+        total = sum(struct.unpack("!{}H".format(len(data) // 2), data))
+        total = (total >> 16) + (total & 0xFFFF)
+        total += total >> 16
+        return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, ~total & 0xFFFF, identifier, sequence & 0xFFFF) + payload
@@ -0,0 +1,73 @@
+"""This module defines the Job class
+that describes a single tool invocation
+handed to the JobScheduler
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+
+
+class Job(object):
+    """Job describes one run of a tool
+    against a host. The tool name is used
+    by the scheduler to find the limits
+    the job is dispatched under
+    """
+
+    def __init__(self, tool, args=(), flags=None, host=None, output_file=None, command=None, parsers=None,
+                 port=None, service=None, hosts=None):
+        """Initializes the Job
+
+        @param tool: str representing the tool
+        name, used as the scheduling key
+
+        @keyword args: tuple of str arguments
+        passed to the command in order
+
+        @keyword flags: dict of flag to value
+        passed to the process adapter
+
+        @keyword host: str representing the
+        target host, used for reporting only
+
+        @keyword output_file: str representing
+        the file the standard output of the
+        tool is written to. None discards it
+
+        @keyword command: str representing the
+        command to be executed. Defaults to the
+        tool name
+
+        @keyword parsers: list of callables that
+        are handed each line of standard output
+        as the tool produces it
+
+        @keyword port: int representing the port
+        the tool is run against, if any
+
+        @keyword service: str representing the
+        name of the service on the port, such as
+        http, if known. Port and service key the
+        runtime history along with the tool
+
+        @keyword hosts: iterable of str, every
+        target of a job run against several at
+        once. The rate budget and the resource
+        usage are shared out between them, and
+        host only labels the job. Defaults to
+        the host alone
+        """
+        self.tool = tool
+        self.args = tuple(args)
+        self.flags = dict(flags) if flags else {}
+        self.host = host
+        self.output_file = output_file
+        self.command = command if command else tool
+        self.parsers = list(parsers) if parsers else []
+        self.port = port
+        self.service = service
+        self.hosts = tuple(hosts) if hosts else ((host,) if host is not None else ())
+
+    def __repr__(self):
+        return "Job({!r}, host={!r})".format(self.tool, self.host)
@@ -0,0 +1,399 @@
+"""This module defines the JobScheduler
+class that is used to run tools under
+per tool, per resource class and global
+concurrency limits
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from functools import partial
+
+from lib.adapter.ProcessAdapter import ProcessAdapter
+from lib.adapter.ProcessStream import ProcessStream
+
+
+NETWORK_HEAVY = "network"
+CPU_HEAVY = "cpu"
+
+DEFAULT_TOOL_LIMITS = {
+    "nmap": (CPU_HEAVY, 8),
+    "nikto": (NETWORK_HEAVY, 4),
+    "dirb": (NETWORK_HEAVY, 4),
+    "hydra": (NETWORK_HEAVY, 2),
+    "enum4linux": (NETWORK_HEAVY, 4),
+}
+DEFAULT_CLASS_LIMITS = {
+    NETWORK_HEAVY: 12,
+    CPU_HEAVY: max(2, os.cpu_count() or 1),
+}
+UNKNOWN_TOOL_LIMIT = (NETWORK_HEAVY, 1)
+
+
+class JobScheduler(object):
+    """JobScheduler queues jobs and starts
+    them through a process adapter as soon
+    as the tool, its resource class and the
+    global limit all have a free slot. Jobs
+    are dispatched in submission order, by
+    stage under a time budget, and shortest
+    expected first with a runtime history, but
+    a job whose tool is saturated does not hold
+    back jobs for other tools
+    """
+
+    def __init__(self, process_adapter=None, max_children=16, tool_limits=None, class_limits=None, ledger=None,
+                 rate_budget=None, monitor=None, time_budget=None, history=None, aging=1.0):
+        """Initializes the JobScheduler
+
+        @keyword process_adapter: AbstractProcessAdapter
+        used to start the jobs
+
+        @keyword max_children: int representing
+        the most children running at once
+
+        @keyword tool_limits: dict of tool name
+        to a (resource class, limit) tuple. Merged
+        over DEFAULT_TOOL_LIMITS
+
+        @keyword class_limits: dict of resource
+        class to limit. Merged over
+        DEFAULT_CLASS_LIMITS
+
+        @keyword ledger: ResourceLedger the
+        resource usage of every finished job is
+        recorded in, under its tool and host
+
+        @keyword rate_budget: RateBudget each job
+        takes its share of the target's request
+        rate from, and reports timeouts to. A job
+        waits while its target has no free slot
+
+        @keyword monitor: object told about every
+        job through started(job), output(job, line)
+        for each line the job writes and
+        finished(job, exit_code, error), such as a
+        StatusView
+
+        @keyword time_budget: TimeBudget giving
+        each job its priority(job), lower started
+        first, and timeout(job), the seconds it
+        may run before it is stopped. Jobs still
+        pending once it has expired fail with
+        TimeoutError
+
+        @keyword history: RuntimeHistory giving
+        the seconds each job is expected to take.
+        Pending jobs are started shortest first,
+        within their stage, and the wall time of
+        every job that exits with 0 is recorded
+
+        @keyword aging: float seconds taken off a
+        pending job's expected time for every
+        second it has waited, so long jobs are
+        started in the end however many short
+        ones keep arriving
+
+        @raise ValueError: if max_children is less
+        than 1 or aging is negative
+        """
+        if max_children < 1:
+            raise ValueError("max_children must be at least 1, got {}".format(max_children))
+        if aging < 0:
+            raise ValueError("aging can't be negative, got {}".format(aging))
+
+        self._process_adapter = process_adapter if process_adapter else ProcessAdapter()
+        self._max_children = max_children
+        self._tool_limits = dict(DEFAULT_TOOL_LIMITS)
+        self._tool_limits.update(tool_limits or {})
+        self._class_limits = dict(DEFAULT_CLASS_LIMITS)
+        self._class_limits.update(class_limits or {})
+        self._ledger = ledger
+        self._rate_budget = rate_budget
+        self._monitor = monitor
+        self._time_budget = time_budget
+        self._history = history
+        self._aging = aging
+
+        self._lock = threading.Condition()
+        self._pending = deque()
+        self._queued = {}
+        self._running_tools = {}
+        self._running_classes = {}
+        self._running = 0
+        self._streams = {}
+        self._stopped = set()
+        self._dispatching = False
+        if rate_budget is not None:
+            rate_budget.add_listener(self._redispatch)
+
+    def submit(self, job):
+        """Queues the given job
+
+        @param job: Job to be run
+
+        @return concurrent.futures.Future: future
+        that resolves to the exit code of the job
+        """
+        future = Future()
+        with self._lock:
+            self._enqueue(job, future)
+            self._dispatch()
+        return future
+
+    def wait(self):
+        """Blocks until every submitted
+        job has finished
+        """
+        with self._lock:
+            while self._running or any(not future.cancelled() for _, future in self._pending):
+                self._lock.wait()
+
+    def stop(self, future):
+        """Stops a submitted job. A pending job
+        is cancelled, a running one has its
+        process terminated and resolves to the
+        exit code that leaves it with
+
+        @param future: Future returned by submit
+
+        @return bool: if the job was still
+        pending or running
+        """
+        with self._lock:
+            if future.cancel():
+                self._lock.notify_all()
+                return True
+            if future.done():
+                return False
+            self._stopped.add(future)
+            stream = self._streams.get(future)
+        if stream is not None:
+            stream.terminate()
+        return True
+
+    def running(self):
+        """@return int: number of jobs
+        currently running
+        """
+        with self._lock:
+            return self._running
+
+    def pending(self):
+        """@return int: number of jobs
+        waiting for a free slot
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def _enqueue(self, job, future):
+        """Queues the job, noting when. Must be
+        called holding the lock
+        """
+        self._pending.append((job, future))
+        self._queued[future] = time.monotonic()
+
+    def _ordered(self):
+        """Orders the pending jobs by stage, then
+        by expected time less the aging of the
+        time they have waited. Must be called
+        holding the lock
+
+        @return deque: (job, future) tuples in
+        the order they are to be started
+        """
+        if self._time_budget is None and self._history is None:
+            return self._pending
+        now = time.monotonic()
+
+        def rank(entry):
+            job, future = entry
+            stage = self._time_budget.priority(job) if self._time_budget is not None else 0
+            if self._history is None:
+                return stage, 0.0
+            waited = now - self._queued.get(future, now)
+            return stage, self._history.expected(job) - self._aging * waited
+        return deque(sorted(self._pending, key=rank))
+
+    def _limits_for(self, tool):
+        """@return tuple: (resource class,
+        limit) for the given tool
+        """
+        return self._tool_limits.get(tool, UNKNOWN_TOOL_LIMIT)
+
+    def _has_slot(self, tool):
+        """Checks if the given tool may
+        be started now. Must be called
+        holding the lock
+
+        @return bool
+        """
+        resource_class, tool_limit = self._limits_for(tool)
+        class_limit = self._class_limits.get(resource_class, self._max_children)
+        return (self._running < self._max_children and
+                self._running_tools.get(tool, 0) < tool_limit and
+                self._running_classes.get(resource_class, 0) < class_limit)
+
+    def _dispatch(self):
+        """Starts every pending job that
+        has a free slot. Must be called
+        holding the lock
+        """
+        self._dispatching = True
+        try:
+            self._dispatch_pending()
+        finally:
+            self._dispatching = False
+
+    def _dispatch_pending(self):
+        waiting = deque()
+        expired = self._time_budget is not None and self._time_budget.expired()
+        if self._running < self._max_children or expired:
+            self._pending = self._ordered()
+        while self._pending and (expired or self._running < self._max_children):
+            job, future = self._pending.popleft()
+            if future.cancelled():
+                self._queued.pop(future, None)
+                continue
+            if expired:
+                self._queued.pop(future, None)
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(TimeoutError("time budget spent before {} was started".format(job)))
+                self._lock.notify_all()
+                continue
+            throttled = self._throttle(job) if self._has_slot(job.tool) else None
+            if throttled is None:
+                waiting.append((job, future))
+            elif future.set_running_or_notify_cancel():
+                self._queued.pop(future, None)
+                self._acquire(job.tool)
+                threading.Thread(target=self._run, args=(job, future, throttled)).start()
+            elif self._rate_budget is not None:
+                self._rate_budget.release(throttled)
+        waiting.extend(self._pending)
+        self._pending = waiting
+
+    def _throttle(self, job):
+        """Claims the job's share of the rate
+        budget. Must be called holding the lock
+
+        @return Job: the job to be started, or
+        None if its target has no free slot
+        """
+        if self._rate_budget is None:
+            return job
+        return self._rate_budget.throttle(job)
+
+    def _redispatch(self):
+        """Starts the jobs that were waiting on
+        a slot of the rate budget, unless this is
+        a slot given back by the dispatch itself
+        """
+        with self._lock:
+            if not self._dispatching:
+                self._dispatch()
+
+    def _acquire(self, tool):
+        resource_class = self._limits_for(tool)[0]
+        self._running += 1
+        self._running_tools[tool] = self._running_tools.get(tool, 0) + 1
+        self._running_classes[resource_class] = self._running_classes.get(resource_class, 0) + 1
+
+    def _release(self, tool):
+        resource_class = self._limits_for(tool)[0]
+        self._running -= 1
+        self._running_tools[tool] -= 1
+        self._running_classes[resource_class] -= 1
+
+    def _run(self, job, future, throttled):
+        """Runs the job to completion and
+        frees its slot
+
+        @param job: Job to be run
+
+        @param future: Future to be resolved
+
+        @param throttled: Job given by the rate
+        budget, the one actually started
+        """
+        if self._monitor is not None:
+            self._monitor.started(job)
+        started = time.monotonic()
+        try:
+            return_code = self._run_process(throttled, future)
+            if self._history is not None and return_code == 0:
+                self._history.record(job, time.monotonic() - started)
+        except Exception as e:
+            if self._monitor is not None:
+                self._monitor.finished(job, None, e)
+            future.set_exception(e)
+        else:
+            if self._monitor is not None:
+                self._monitor.finished(job, return_code, None)
+            future.set_result(return_code)
+        finally:
+            with self._lock:
+                self._streams.pop(future, None)
+                self._stopped.discard(future)
+                self._release(job.tool)
+                self._dispatch()
+                self._lock.notify_all()
+
+    def _run_process(self, job, future):
+        """Starts the job's process, throttled
+        to its share of the target's rate budget,
+        and streams its output until it exits
+
+        @param job: Job to be run, as throttled
+
+        @param future: Future the process is
+        registered under, so it can be stopped
+
+        @return int: exit code of the process
+        """
+        observers = [] if self._monitor is None else [partial(self._monitor.output, job)]
+        if self._rate_budget is None:
+            return self._stream(job, future, observers)
+        try:
+            return self._stream(job, future, observers + [self._rate_budget.observer(job)])
+        finally:
+            self._rate_budget.release(job)
+
+    def _stream(self, job, future, observers=()):
+        """Streams the job's output until it
+        exits, handing both pipes to the observers
+
+        @return int: exit code of the process
+        """
+        process = self._process_adapter.execute(job.command, *job.args, **job.flags)
+        stream = ProcessStream(process, output_file=job.output_file)
+        with self._lock:
+            self._streams[future] = stream # Stopped through the stream, the one place the child is reaped
+            stopped = future in self._stopped
+        if stopped:
+            stream.terminate()
+        for parser in job.parsers:
+            stream.add_parser(parser)
+        for observer in observers:
+            stream.add_parser(observer, ProcessStream.STDOUT)
+            stream.add_parser(observer, ProcessStream.STDERR)
+        timer = None
+        if self._time_budget is not None: # Stopped like any other job once its time is up
+            timer = threading.Timer(self._time_budget.timeout(job), self.stop, args=(future,))
+            timer.daemon = True
+            timer.start()
+        try:
+            return stream.run()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if self._ledger is not None and stream.usage is not None:
+                if len(job.hosts) > 1:
+                    self._ledger.record_shared(job.tool, job.hosts, stream.usage)
+                else:
+                    self._ledger.record(job.tool, job.host, stream.usage)
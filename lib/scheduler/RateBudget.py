@@ -0,0 +1,262 @@
+"""This module defines the RateBudget class
+that is used to share a request rate per
+target between the tools run against it
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import re
+import threading
+import time
+
+from lib.scheduler.Job import Job
+
+
+def _nmap(rate):
+    return ("--max-rate", "{:g}".format(round(rate, 3)))
+
+
+def _nikto(rate):
+    return ("-Pause", "{:.3f}".format(1.0 / rate))
+
+
+def _dirb(rate):
+    return ("-z", "{:.0f}".format(1000.0 / rate))
+
+
+def _hydra(rate):
+    # hydra has no rate option, -t caps its parallel
+    # tasks instead. Each task waits on the answer
+    # to its login attempt, so one task is given per
+    # request per second of the share, at least one
+    return ("-t", str(max(1, min(16, int(rate)))))
+
+
+# Turns a share of the budget, in requests per
+# second, into the tool's own throttle options
+TOOL_THROTTLES = {
+    "nmap": _nmap,
+    "nikto": _nikto,
+    "dirb": _dirb,
+    "hydra": _hydra,
+}
+DISTRESS_PATTERN = re.compile(r"timed out|timeout|connection reset|reset by peer|broken pipe", re.IGNORECASE)
+
+
+class RateBudget(object):
+    """RateBudget holds a requests per second
+    budget for every target, split into a fixed
+    number of slots. Each throttled job started
+    against a target takes a slot and an equal
+    part of what the running jobs have left of
+    the budget, passed to the tool through its
+    throttle options, so the jobs running
+    against a target never add up to more than
+    its budget. A job finds no slot while the
+    target has slots jobs running. Timeouts and
+    resets in any tool's output halve the
+    target's budget, and every job that finishes
+    without them wins back a little of it. The
+    options of a running tool can't be changed,
+    so a backoff is felt by the jobs started
+    after it
+    """
+
+    def __init__(self, rate, floor=1.0, backoff=0.5, recovery=0.1, cooldown=1.0, slots=4):
+        """Initializes the RateBudget
+
+        @param rate: float representing the most
+        requests per second sent to one target
+
+        @keyword floor: float representing the
+        lowest the budget backs off to
+
+        @keyword backoff: float the budget is
+        multiplied by when a tool reports distress
+
+        @keyword recovery: float fraction of the
+        full rate won back per clean job
+
+        @keyword cooldown: float seconds after a
+        backoff during which the same target is
+        not backed off again
+
+        @keyword slots: int representing the most
+        throttled jobs run against one target at
+        once
+
+        @raise ValueError: if the rates, the
+        backoff or the slots are out of range
+        """
+        if not rate > 0 or not 0 < floor <= rate:
+            raise ValueError("rate and floor must satisfy 0 < floor <= rate, got {} and {}".format(rate, floor))
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1, got {}".format(backoff))
+        if slots < 1:
+            raise ValueError("slots must be at least 1, got {}".format(slots))
+        self._rate = float(rate)
+        self._floor = float(floor)
+        self._backoff = backoff
+        self._recovery = recovery
+        self._cooldown = cooldown
+        self._slots = slots
+        self._lock = threading.Condition()
+        self._rates = {}
+        self._active = {}
+        self._distress = {}
+        self._last_backoff = {}
+        self._listeners = []
+
+    def rate(self, host):
+        """@return float: requests per second
+        the target may currently receive
+        """
+        with self._lock:
+            return self._rates.get(host, self._rate)
+
+    def claimed(self, host):
+        """@return float: requests per second
+        handed out to the jobs running against
+        the target
+        """
+        with self._lock:
+            return sum(self._active.get(host, {}).values())
+
+    def add_listener(self, listener):
+        """Registers a callable, run without
+        arguments each time a job gives its slot
+        back, such as a scheduler holding jobs
+        back for lack of one
+
+        @param listener: callable
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def throttle(self, job):
+        """Claims a slot and a share of the
+        target's budget for the job. Must be
+        followed by a call to release once the
+        job has finished
+
+        @param job: Job about to be started
+
+        @return Job: the job with the tool's
+        throttle options appended, the given job
+        if its tool can't be throttled, or None
+        if one of its targets has no free slot
+        """
+        throttle = TOOL_THROTTLES.get(job.tool)
+        if throttle is None or job.host is None:
+            return job
+        with self._lock:
+            if not self._has_slot(job):
+                return None
+            shares = self._shares(job)
+            throttled = Job(job.tool, args=job.args + throttle(sum(shares.values())), flags=job.flags,
+                            host=job.host, output_file=job.output_file, command=job.command,
+                            parsers=job.parsers, port=job.port, service=job.service, hosts=job.hosts)
+            self._claim(throttled, shares)
+        return throttled
+
+    def acquire(self, job):
+        """Claims a slot and a share of the
+        target's budget for a job that paces
+        itself rather than through options, such
+        as one run inside this process, waiting
+        for a slot if there is none. Must be
+        followed by a call to release once the
+        job has finished
+
+        @param job: Job about to be run
+
+        @return float: requests per second the
+        job may send, None if it has no host
+        """
+        if job.host is None:
+            return None
+        with self._lock:
+            while not self._has_slot(job):
+                self._lock.wait()
+            shares = self._shares(job)
+            self._claim(job, shares)
+        return sum(shares.values())
+
+    def _has_slot(self, job):
+        """@return bool: if every target of the
+        job has a free slot. The lock is held
+        """
+        return all(len(self._active.get(host, ())) < self._slots for host in job.hosts)
+
+    def _shares(self, job):
+        """@return dict: what the job gets of
+        each of its targets if started now, what
+        is left of the target's budget split over
+        its free slots, and never below the floor
+        split over all of them. The lock is held
+        """
+        shares = {}
+        for host in job.hosts:
+            active = self._active.get(host, {})
+            left = self._rates.get(host, self._rate) - sum(active.values())
+            shares[host] = max(self._floor / self._slots, left / (self._slots - len(active)))
+        return shares
+
+    def _claim(self, job, shares):
+        """Counts the job's shares against each
+        of its targets. The lock is held
+        """
+        for host, share in shares.items():
+            key = (host, id(job))
+            self._active.setdefault(host, {})[key] = share
+            self._distress[key] = 0
+
+    def observer(self, job):
+        """@param job: Job given to throttle
+
+        @return callable: parser counting the
+        timeouts and resets the job reports
+        """
+        def observe(line):
+            if DISTRESS_PATTERN.search(line):
+                for host in job.hosts:
+                    self._report_distress(host, (host, id(job)))
+        return observe
+
+    def release(self, job):
+        """Returns the job's slot and share. A
+        job that reported no distress lets the
+        target's budget recover
+
+        @param job: Job returned by throttle
+        """
+        with self._lock:
+            released = False
+            for host in job.hosts:
+                key = (host, id(job))
+                if key not in self._distress:
+                    continue
+                released = True
+                self._active[host].pop(key, None)
+                if not self._distress.pop(key):
+                    current = self._rates.get(host, self._rate)
+                    self._rates[host] = min(self._rate, current + self._recovery * self._rate)
+            self._lock.notify_all()
+            listeners = list(self._listeners) if released else []
+        for listener in listeners:
+            listener()
+
+    def _report_distress(self, host, key):
+        """Backs the target off, at most once
+        per cooldown
+        """
+        now = time.time()
+        with self._lock:
+            if key in self._distress:
+                self._distress[key] += 1
+            if now - self._last_backoff.get(host, 0) < self._cooldown:
+                return
+            self._last_backoff[host] = now
+            current = self._rates.get(host, self._rate)
+            self._rates[host] = max(self._floor, current * self._backoff)
@@ -0,0 +1,106 @@
+"""This module defines the RuntimeHistory
+class that is used to remember how long
+tools took between runs
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import os
+import threading
+
+from lib.tools.JsonFile import JsonFile
+
+
+DEFAULT_HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".cache", "enumerator", "runtimes.json")
+DEFAULT_EXPECTED = {
+    "enum4linux": 60.0,
+    "hydra": 300.0,
+    "dirb": 300.0,
+    "nikto": 600.0,
+    "nmap": 600.0,
+}
+UNKNOWN_EXPECTED = 120.0
+
+
+class RuntimeHistory(object):
+    """RuntimeHistory keeps a moving average of
+    the wall time of every tool, keyed by the
+    tool, the name of the service it ran
+    against and the port, all known as soon as
+    the quick scan finds the port open. A job
+    is expected to take the average of the most
+    specific key that has been seen: tool,
+    service and port, then tool and service,
+    then the tool alone, then a default for the
+    tool. The averages are kept in a JSON file,
+    saved each time a job is recorded
+    """
+    SMOOTHING = 0.3
+
+    def __init__(self, history_file=DEFAULT_HISTORY_FILE, defaults=None):
+        """Initializes the RuntimeHistory
+
+        @keyword history_file: str representing
+        the path of the JSON history file, its
+        directory created when first saved. None
+        keeps the history in memory only
+
+        @keyword defaults: dict of tool name to
+        the seconds expected of a tool never seen.
+        Merged over DEFAULT_EXPECTED
+        """
+        self._file = JsonFile(history_file) if history_file else None
+        self._defaults = dict(DEFAULT_EXPECTED)
+        self._defaults.update(defaults or {})
+        self._lock = threading.Lock()
+        self._entries = self._file.load() if self._file else {}
+
+    def expected(self, job):
+        """@param job: Job to be run
+
+        @return float: seconds the job is
+        expected to take
+        """
+        with self._lock:
+            for key in self.keys(job):
+                entry = self._entries.get(key)
+                if isinstance(entry, dict) and "seconds" in entry:
+                    return entry["seconds"]
+        return self._defaults.get(job.tool, UNKNOWN_EXPECTED)
+
+    def record(self, job, seconds):
+        """Adds a finished run to the average of
+        each of the job's keys and saves them
+
+        @param job: Job that was run
+
+        @param seconds: float wall time it took
+        """
+        with self._lock:
+            for key in self.keys(job):
+                entry = self._entries.get(key)
+                if isinstance(entry, dict) and "seconds" in entry:
+                    average = entry["seconds"] + self.SMOOTHING * (seconds - entry["seconds"])
+                    self._entries[key] = {"seconds": average, "runs": entry.get("runs", 0) + 1}
+                else:
+                    self._entries[key] = {"seconds": seconds, "runs": 1}
+            if self._file:
+                try:
+                    self._file.save(self._entries)
+                except OSError:
+                    pass # Still used for the rest of this run
+
+    @staticmethod
+    def keys(job):
+        """@return list: str keys of the job,
+        most specific first
+        """
+        port = "" if job.port is None else str(job.port)
+        service = job.service or ""
+        keys = ["{}|{}|{}".format(job.tool, service, port)]
+        if service and port:
+            keys.append("{}|{}|".format(job.tool, service))
+        if service or port:
+            keys.append("{}||".format(job.tool))
+        return keys
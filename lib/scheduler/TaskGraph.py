@@ -0,0 +1,228 @@
+"""This module defines the TaskGraph class
+that runs the follow-up scanners of a host
+as a graph of tasks keyed on the tool, host
+and service they apply to
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import threading
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+Task = namedtuple("Task", "tool host service")
+Rule = namedtuple("Rule", "tool function requires")
+
+
+class TaskError(Exception):
+    """Raised for a task that did not run
+    because a task it requires failed
+    """
+
+
+class TaskGraph(object):
+    """TaskGraph holds rules naming the tools
+    run for each service, and the tools of
+    the same service each must wait for. A
+    task runs once per (tool, host, service)
+    however many times it is asked for, and
+    its result is kept in its Future, so ports
+    sharing a service share its tasks. Tasks
+    whose requirements are done run in
+    parallel on a small pool
+    """
+
+    def __init__(self, rules, workers=4):
+        """Initializes the TaskGraph
+
+        @param rules: dict of str service to a
+        list of Rule. Rule.function takes the str
+        host and may return a Future, which the
+        task then finishes with. Rule.requires
+        names tools of the same service
+
+        @keyword workers: int representing the
+        number of tasks running at once
+
+        @raise ValueError: if a rule requires a
+        tool its service does not have, or the
+        requirements form a cycle
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1, got {}".format(workers))
+        self._rules = {}
+        for service, service_rules in rules.items():
+            self._rules[service] = dict((rule.tool, rule) for rule in service_rules)
+            self._check(service)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._order = []
+
+    def add(self, host, service):
+        """Asks for every task of the service on
+        the host. Tasks asked for before are not
+        started again
+
+        @param host: str representing the host
+
+        @param service: str representing the
+        service, those without rules are ignored
+
+        @return list: a Future per rule of the
+        service
+        """
+        return [self.task(tool, host, service) for tool in self._rules.get(service, {})]
+
+    def task(self, tool, host, service):
+        """Asks for a single task, and first for
+        the tasks it requires
+
+        @param tool: str naming a rule of the
+        service
+
+        @param host: str representing the host
+
+        @param service: str representing the
+        service
+
+        @return Future: the memoized Future of
+        the task, holding what its function
+        returned
+
+        @raise ValueError: if the service has no
+        rule for the tool
+        """
+        key = Task(tool, host, service)
+        rule = self._rules.get(service, {}).get(tool)
+        if rule is None:
+            raise ValueError("No rule for {} on service {}".format(tool, service))
+        with self._lock:
+            if key in self._futures:
+                return self._futures[key]
+            future = self._futures[key] = Future()
+            self._order.append(key)
+        requires = [self.task(name, host, service) for name in rule.requires]
+        self._after(requires, lambda: self._start(rule, key, future, requires))
+        return future
+
+    def tasks(self):
+        """@return dict: Task to Future of every
+        task asked for so far
+        """
+        with self._lock:
+            return dict(self._futures)
+
+    def wait(self):
+        """Blocks until every task is done, then
+        stops the pool. No tasks may be asked for
+        afterwards
+
+        @return list: the exceptions of failed
+        tasks, in the order they were asked for
+        """
+        errors = []
+        for future in self._pending():
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                errors.append(error)
+        self._executor.shutdown()
+        return errors
+
+    def _check(self, service):
+        """Validates the requirements of the
+        rules of a service
+        """
+        rules = self._rules[service]
+        for rule in rules.values():
+            for name in rule.requires:
+                if name not in rules:
+                    raise ValueError("{} requires {}, which {} has no rule for".format(rule.tool, name, service))
+        done = set()
+        for tool in rules:
+            self._visit(rules, tool, [], done)
+
+    def _visit(self, rules, tool, path, done):
+        """Depth first search for a cycle of
+        requirements through the tool
+        """
+        if tool in path:
+            raise ValueError("Requirements form a cycle: {}".format(" -> ".join(path + [tool])))
+        if tool in done:
+            return
+        for name in rules[tool].requires:
+            self._visit(rules, name, path + [tool], done)
+        done.add(tool)
+
+    def _after(self, futures, callback):
+        """Calls the callback once every Future
+        is done, at once if there are none
+        """
+        if not futures:
+            return callback()
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                callback()
+
+        for future in futures:
+            future.add_done_callback(done)
+
+    def _start(self, rule, key, future, requires):
+        """Runs the task on the pool unless a
+        task it requires failed
+        """
+        for name, required in zip(rule.requires, requires):
+            if required.cancelled() or required.exception() is not None:
+                future.set_exception(TaskError("{} on {} skipped, {} did not finish".format(
+                    key.tool, key.host, name)))
+                return
+        self._executor.submit(self._run, rule, key, future)
+
+    def _run(self, rule, key, future):
+        """Calls the rule's function, finishing
+        the task with its result or with the
+        Future it returned
+        """
+        try:
+            result = rule.function(key.host)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        if isinstance(result, Future):
+            result.add_done_callback(lambda done: self._settle(future, done))
+        else:
+            future.set_result(result)
+
+    def _settle(self, future, done):
+        """Finishes the task the same way as the
+        Future its function returned
+        """
+        if done.cancelled():
+            future.cancel()
+        elif done.exception() is not None:
+            future.set_exception(done.exception())
+        else:
+            future.set_result(done.result())
+
+    def _pending(self):
+        """Yields task futures, including any
+        asked for while waiting
+        """
+        i = 0
+        while True:
+            with self._lock:
+                if i >= len(self._order):
+                    return
+                future = self._futures[self._order[i]]
+            yield future
+            i += 1
@@ -0,0 +1,138 @@
+"""This module defines the TimeBudget class
+that is used to fit a whole run into a fixed
+window of wall clock time
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import math
+import time
+
+
+QUICK = "quick"
+FOLLOW_UP = "follow_up"
+FULL = "full"
+STAGES = (QUICK, FOLLOW_UP, FULL)
+
+DEFAULT_TOOL_STAGES = {
+    "nikto": FOLLOW_UP,
+    "dirb": FOLLOW_UP,
+    "hydra": FOLLOW_UP,
+    "enum4linux": FOLLOW_UP,
+    "nmap": FULL,
+}
+DEFAULT_SHARES = {
+    QUICK: 0.05,
+    FOLLOW_UP: 0.6,
+    FULL: 0.35,
+}
+MIN_TIMEOUT = 1.0
+
+
+class TimeBudget(object):
+    """TimeBudget splits a run's wall clock time
+    across hosts and stages in the order their
+    results are worth most: the quick checks,
+    then the web and SMB follow-ups, then the
+    full scans. The quick and follow-up stages
+    of a host are given their share of the
+    budget divided by the number of waves the
+    hosts run in; full scans get whatever is
+    left. It is handed to the JobScheduler, which
+    starts jobs of earlier stages first, stops
+    each job when its time is up and no longer
+    starts any once the budget is spent
+    """
+
+    def __init__(self, seconds, hosts=1, hosts_in_flight=1, shares=None, tool_stages=None, clock=time.monotonic,
+                 started=None):
+        """Initializes the TimeBudget, starting
+        the clock
+
+        @param seconds: float seconds the whole
+        run may take
+
+        @keyword hosts: int representing the
+        number of hosts in the run
+
+        @keyword hosts_in_flight: int representing
+        the number of hosts enumerated at once
+
+        @keyword shares: dict of stage to the
+        fraction of the budget it is given. Merged
+        over DEFAULT_SHARES
+
+        @keyword tool_stages: dict of tool name to
+        the stage its jobs belong to. Merged over
+        DEFAULT_TOOL_STAGES, unknown tools are
+        follow-ups
+
+        @keyword clock: callable returning the
+        current time in seconds
+
+        @keyword started: float time of the clock
+        the run began at, such as before the hosts
+        to share the budget were known. Now when
+        None
+
+        @raise ValueError: if seconds isn't
+        positive and finite or hosts is less
+        than 1
+        """
+        if not 0 < seconds < math.inf:
+            raise ValueError("seconds must be positive and finite, got {}".format(seconds))
+        if hosts < 1 or hosts_in_flight < 1:
+            raise ValueError("hosts and hosts_in_flight must be at least 1, got {} and {}"
+                             .format(hosts, hosts_in_flight))
+        self.seconds = seconds
+        self._waves = math.ceil(hosts / hosts_in_flight)
+        self._shares = dict(DEFAULT_SHARES)
+        self._shares.update(shares or {})
+        self._tool_stages = dict(DEFAULT_TOOL_STAGES)
+        self._tool_stages.update(tool_stages or {})
+        self._clock = clock
+        self._deadline = (clock() if started is None else started) + seconds
+
+    def remaining(self):
+        """@return float: seconds left, never
+        below 0
+        """
+        return max(0.0, self._deadline - self._clock())
+
+    def expired(self):
+        """@return bool: if the budget is spent"""
+        return self.remaining() <= 0
+
+    def stage(self, tool):
+        """@return str: the stage jobs of the
+        given tool belong to
+        """
+        return self._tool_stages.get(tool, FOLLOW_UP)
+
+    def priority(self, job):
+        """@return int: the job's place in the
+        order of stages, lower starts first
+        """
+        return STAGES.index(self.stage(job.tool))
+
+    def stage_timeout(self, stage):
+        """Seconds a step of the given stage may
+        run for a single host. Never less than
+        MIN_TIMEOUT, unless less is left
+
+        @param stage: str, one of STAGES
+
+        @return float: 0 once the budget is spent
+        """
+        remaining = self.remaining()
+        if stage == FULL:
+            return remaining
+        window = self.seconds * self._shares[stage] / self._waves
+        return min(remaining, max(window, MIN_TIMEOUT))
+
+    def timeout(self, job):
+        """@return float: seconds the job may run
+        for, 0 once the budget is spent
+        """
+        return self.stage_timeout(self.stage(job.tool))
@@ -0,0 +1,6 @@
+"""Allows for easy importing of this package
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
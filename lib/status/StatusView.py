@@ -0,0 +1,199 @@
+"""This module defines the StatusView class
+that shows the progress of every running
+tool in a single terminal
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import re
+import shutil
+import sys
+import threading
+import time
+from collections import namedtuple
+
+
+JobRecord = namedtuple("JobRecord", ["tool", "host", "exit_code", "error", "wall_time", "lines"])
+
+CONTROL_PATTERN = re.compile(r"\x1b\[[0-9;]*[A-Za-z]|[\x00-\x1f\x7f]")
+ERASE_BLOCK = "\x1b[{}F\x1b[J"
+
+
+class StatusView(object):
+    """StatusView is handed to the JobScheduler
+    as its monitor. On a terminal it keeps a
+    block at the bottom of the screen with one
+    line per running job, its run time, how many
+    lines it wrote and the last of them, redrawn
+    in place; messages and finished jobs are
+    printed above it. Anywhere else only the
+    messages and finished jobs are printed.
+    Every finished job is kept with its exit
+    code for the end of the run
+    """
+    REFRESH_INTERVAL = 1.0
+
+    def __init__(self, stream=None, live=None, clock=time.time):
+        """Initializes the StatusView
+
+        @keyword stream: file the view is written
+        to, standard output when None
+
+        @keyword live: bool if the running jobs
+        are redrawn in place. Defaults to whether
+        the stream is a terminal
+
+        @keyword clock: callable returning the
+        current time in seconds
+        """
+        self._stream = stream if stream is not None else sys.stdout
+        self._live = live if live is not None else self._stream.isatty()
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._running = {}
+        self._finished = []
+        self._drawn = 0
+        self._refresher = None
+        self._stopped = threading.Event()
+
+    def started(self, job):
+        """@param job: Job that was started"""
+        with self._lock:
+            self._running[job] = {"started": self._clock(), "lines": 0, "last": ""}
+
+    def output(self, job, line):
+        """@param job: Job that wrote the line
+
+        @param line: str written by the job
+        """
+        with self._lock:
+            state = self._running.get(job)
+            if state is not None:
+                state["lines"] += 1
+                last = CONTROL_PATTERN.sub("", line).strip()
+                if last:
+                    state["last"] = last
+
+    def finished(self, job, exit_code, error=None):
+        """Records the job and prints its exit
+        code
+
+        @param job: Job that finished
+
+        @param exit_code: int exit code, None if
+        it could not be run
+
+        @param error: Exception it failed with
+        """
+        with self._lock:
+            state = self._running.pop(job, None) or {"started": self._clock(), "lines": 0}
+            record = JobRecord(job.tool, job.host, exit_code, error, self._clock() - state["started"], state["lines"])
+            self._finished.append(record)
+            self.print(self._describe(record))
+
+    def print(self, message):
+        """Prints a message above the block of
+        running jobs
+
+        @param message: str without line ending
+        """
+        with self._lock:
+            self._erase()
+            self._stream.write(message + "\n")
+            self._draw()
+
+    def render(self):
+        """@return list: str lines of the block
+        of running jobs, headed by the counts
+        """
+        with self._lock:
+            now = self._clock()
+            width = max(40, shutil.get_terminal_size().columns - 1)
+            lines = [self._header()]
+            for job, state in sorted(self._running.items(), key=lambda item: item[1]["started"]):
+                line = "  {:<10} {:<15} {:>5.0f}s {:>6} lines  {}".format(
+                    job.tool, job.host or "-", now - state["started"], state["lines"], state["last"])
+                lines.append(line[:width])
+            return lines
+
+    def summary(self):
+        """@return dict: number of running,
+        finished and failed jobs
+        """
+        with self._lock:
+            return {"running": len(self._running), "finished": len(self._finished), "failed": len(self.failed())}
+
+    def jobs(self):
+        """@return list: JobRecord of every
+        finished job, in the order they finished
+        """
+        with self._lock:
+            return list(self._finished)
+
+    def failed(self):
+        """@return list: JobRecord of the jobs
+        that exited with an error or did not run
+        """
+        with self._lock:
+            return [record for record in self._finished if record.exit_code != 0]
+
+    def start(self):
+        """Starts redrawing the running jobs
+        every REFRESH_INTERVAL seconds, when live
+        """
+        if self._live and self._refresher is None:
+            self._stopped.clear()
+            self._refresher = threading.Thread(target=self._refresh, daemon=True)
+            self._refresher.start()
+
+    def stop(self):
+        """Stops redrawing and removes the block
+        of running jobs
+        """
+        self._stopped.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+        with self._lock:
+            self._erase()
+            self._stream.flush()
+
+    def _refresh(self):
+        while not self._stopped.wait(self.REFRESH_INTERVAL):
+            with self._lock:
+                self._erase()
+                self._draw()
+
+    def _header(self):
+        failed = len(self.failed())
+        return "[status] {} running, {} finished{}".format(
+            len(self._running), len(self._finished), ", {} failed".format(failed) if failed else "")
+
+    def _describe(self, record):
+        """@return str: the line printed for a
+        finished job
+        """
+        if record.error is not None:
+            outcome = "failed: {}".format(record.error)
+        else:
+            outcome = "exit {}".format(record.exit_code)
+        return "[done] {} {} {} in {:.1f}s".format(record.tool, record.host or "-", outcome, record.wall_time)
+
+    def _erase(self):
+        """Removes the block of running jobs
+        drawn last, if any
+        """
+        if self._drawn:
+            self._stream.write(ERASE_BLOCK.format(self._drawn))
+            self._drawn = 0
+
+    def _draw(self):
+        """Draws the block of running jobs at
+        the bottom of a live view
+        """
+        if self._live and not self._stopped.is_set() and self._refresher is not None:
+            lines = self.render()
+            self._stream.write("\n".join(lines) + "\n")
+            self._drawn = len(lines)
+        self._stream.flush()
@@ -0,0 +1,147 @@
+"""This module defines the TargetParser
+class that is used to expand the targets
+given on the command line into hosts
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+from ipaddress import ip_address, ip_network
+
+
+class TargetParser(object):
+    """TargetParser expands single
+    addresses, CIDR blocks and target
+    files into an ordered sequence of
+    unique hosts. The hosts of a CIDR
+    block are produced one at a time, so
+    a large block is never held in memory
+    """
+    COMMENT_PREFIX = "#"
+    CIDR_SEPARATOR = "/"
+
+    def parse(self, targets, target_file=None):
+        """Expands the given targets into
+        unique hosts, keeping the order in
+        which they were first seen. Every
+        target is checked up front, so a bad
+        one is reported before any host is
+        produced
+
+        @param targets: iterable of str each
+        representing an address, a hostname
+        or a CIDR block
+
+        @keyword target_file: str representing
+        the path to a file holding one target
+        per line. Blank lines and lines starting
+        with "#" are ignored
+
+        @raise ValueError: if a CIDR block is
+        not a valid network
+
+        @raise IOError: if the target file
+        can't be read
+
+        @return iterator: str representing
+        each host to be scanned
+        """
+        targets = list(targets)
+        if target_file:
+            targets.extend(self._read_target_file(target_file))
+        return self._hosts([self._parse_target(target) for target in targets])
+
+    def _read_target_file(self, target_file):
+        """Reads the targets from the
+        given file
+
+        @param target_file: str representing
+        the path to the target file
+
+        @return list: list of str targets
+        """
+        with open(target_file) as f:
+            lines = [line.strip() for line in f]
+        return [line for line in lines if line and not line.startswith(self.COMMENT_PREFIX)]
+
+    def _parse_target(self, target):
+        """@param target: str representing
+        the target
+
+        @raise ValueError: if a CIDR block is
+        not a valid network
+
+        @return: str single host, None for a
+        blank target, or an ip_network of
+        more than one address
+        """
+        target = target.strip()
+        if self.CIDR_SEPARATOR not in target:
+            return target or None
+        network = ip_network(u"" + target, strict=False)
+        return str(network.network_address) if network.num_addresses == 1 else network
+
+    def _hosts(self, targets):
+        """Yields the hosts of the parsed
+        targets. Single hosts are remembered to
+        drop repeats, and of each block only the
+        range of hosts it yielded is kept, so
+        its hosts are dropped when seen again
+
+        @param targets: list of what
+        _parse_target returned
+
+        @return iterator of str hosts
+        """
+        singles = set()
+        networks = []
+        for target in targets:
+            if target is None:
+                continue
+            if isinstance(target, str):
+                if target not in singles and not self._in_networks(target, networks):
+                    singles.add(target)
+                    yield target
+                continue
+            first = last = None
+            for host in self._expand(target):
+                if host not in singles and not self._in_networks(host, networks):
+                    yield host
+                first, last = first or host, host
+            networks.append((ip_address(first), ip_address(last)))
+
+    @staticmethod
+    def _in_networks(host, networks):
+        """@param networks: list of the first
+        and last ip_address each expanded block
+        yielded, its hosts being contiguous
+
+        @return bool: if the host is an
+        address one of the blocks yielded
+        """
+        if not networks:
+            return False
+        try:
+            address = ip_address(host)
+        except ValueError: # A hostname
+            return False
+        return any(first.version == address.version and first <= address <= last
+                   for first, last in networks)
+
+    @staticmethod
+    def _expand(network):
+        """Expands a block into its hosts,
+        leaving out the network and broadcast
+        addresses unless that leaves none
+
+        @param network: ip_network
+
+        @return iterator of str hosts
+        """
+        empty = True
+        for host in network.hosts():
+            empty = False
+            yield str(host)
+        if empty:
+            for address in network:
+                yield str(address)
@@ -0,0 +1,80 @@
+"""This module defines the CapabilityCache
+class that is used to remember what was
+learned about a tool binary between runs
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import json
+import os
+import threading
+from shutil import which
+
+from lib.tools.JsonFile import JsonFile
+
+
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "enumerator", "capabilities.json")
+
+
+class CapabilityCache(object):
+    """CapabilityCache stores the result of
+    probing a tool on disk, keyed by the resolved
+    path of its binary. An entry is only reused
+    while the binary keeps the same mtime and
+    size, so upgrading a tool re-probes it
+    """
+
+    def __init__(self, cache_file=DEFAULT_CACHE_FILE):
+        """Initializes the CapabilityCache
+
+        @keyword cache_file: str representing
+        the path of the JSON cache file. Its
+        directory is created when first saved
+        """
+        self._file = JsonFile(cache_file)
+        self._lock = threading.Lock()
+        self._entries = self._file.load()
+
+    def lookup(self, command, probe):
+        """Returns the capabilities of the given
+        command, probing it only when there is no
+        valid cached entry
+
+        @param command: str representing the command
+        name or path, resolved through the PATH
+
+        @param probe: callable taking no arguments and
+        returning JSON serializable capability data
+
+        @raise OSError: if the command can't be found
+
+        @return: the capability data, as loaded
+        from JSON when it was cached
+        """
+        path, stamp = self._stat(command)
+        with self._lock:
+            entry = self._entries.get(path)
+            if isinstance(entry, dict) and entry.get("stamp") == stamp:
+                return entry["data"]
+
+        data = json.loads(json.dumps(probe()))
+        with self._lock:
+            self._entries[path] = {"stamp": stamp, "data": data}
+            self._file.save(self._entries)
+        return data
+
+    def _stat(self, command):
+        """Resolves the given command
+
+        @raise OSError: if the command can't be found
+
+        @return tuple: (str real path, list of
+        [mtime in ns, size])
+        """
+        found = which(command)
+        if not found:
+            raise OSError("Command <{}> was not found on the PATH".format(command))
+        path = os.path.realpath(found)
+        st = os.stat(path)
+        return path, [st.st_mtime_ns, st.st_size]
@@ -0,0 +1,57 @@
+"""This module defines the JsonFile class
+that is used to keep a JSON object on disk
+between runs
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import json
+import os
+
+
+class JsonFile(object):
+    """JsonFile loads and saves a single JSON
+    object, such as a cache kept between runs.
+    A missing or unreadable file loads as empty,
+    and saving writes a temporary file that
+    then replaces the old one, so a run stopped
+    halfway leaves the last whole save behind
+    """
+
+    def __init__(self, path):
+        """Initializes the JsonFile
+
+        @param path: str representing the path of
+        the file. Its directory is created when
+        first saved
+        """
+        self.path = path
+
+    def load(self):
+        """@return dict: the object the file
+        holds, empty if it is missing, unreadable
+        or not an object
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self, data):
+        """Atomically writes the object
+
+        @param data: dict JSON serializable
+
+        @raise OSError: if the file can't be
+        written
+        """
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        temp_file = "{}.{}.tmp".format(self.path, os.getpid())
+        with open(temp_file, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(temp_file, self.path)
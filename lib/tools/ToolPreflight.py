@@ -0,0 +1,108 @@
+"""This module defines the ToolPreflight
+class that is used to check every external
+tool before a run starts
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from subprocess import TimeoutExpired
+
+from lib.adapter.ProcessAdapter import ProcessAdapter
+from lib.nikto.Nikto import Nikto, NIKTO_VERSION_NAME
+from .CapabilityCache import CapabilityCache
+
+
+VERSION_PATTERN = r"(\d+(?:\.\d+)+)"
+
+TOOL_PROBES = {
+    "nmap": (("--version",), r"Nmap version " + VERSION_PATTERN),
+    "dirb": ((), r"DIRB v" + VERSION_PATTERN),
+    "hydra": (("-h",), r"Hydra v" + VERSION_PATTERN),
+    "enum4linux": ((), r"enum4linux v" + VERSION_PATTERN),
+}
+
+
+class ToolPreflight(object):
+    """ToolPreflight probes the versions of
+    nmap, nikto, dirb, hydra and enum4linux in
+    parallel, going through a CapabilityCache
+    so that a tool is only started again once
+    its binary changed
+    """
+    PROBE_TIMEOUT = 30
+
+    def __init__(self, process_adapter=None, capability_cache=None):
+        """Initializes the ToolPreflight
+
+        @keyword process_adapter: AbstractProcessAdapter
+        used to start the probes
+
+        @keyword capability_cache: CapabilityCache
+        the probe results are kept in
+        """
+        self._process_adapter = process_adapter if process_adapter else ProcessAdapter()
+        self._capability_cache = capability_cache if capability_cache else CapabilityCache()
+
+    def check(self, tools=None):
+        """Probes the given tools in parallel
+
+        @keyword tools: iterable of str tool names,
+        defaults to every known tool
+
+        @return tuple: (dict of tool to capability
+        data for each tool that passed, dict of tool
+        to the exception raised for each that didn't)
+        """
+        tools = list(tools) if tools else sorted(list(TOOL_PROBES) + [Nikto.NIKTO_COMMAND])
+        found, missing = {}, {}
+        with ThreadPoolExecutor(max_workers=len(tools)) as pool:
+            futures = dict((tool, pool.submit(self._check_tool, tool)) for tool in tools)
+        for tool, future in futures.items():
+            try:
+                found[tool] = future.result()
+            except Exception as e:
+                missing[tool] = e
+        return found, missing
+
+    def _check_tool(self, tool):
+        """Checks a single tool
+
+        @param tool: str tool name
+
+        @raise OSError: if the tool is missing
+        or its version can't be found
+
+        @return dict: the capability data
+        """
+        if tool == Nikto.NIKTO_COMMAND:
+            nikto = Nikto(process_adapter=self._process_adapter, capability_cache=self._capability_cache)
+            return {"version": "{}.{}.{}".format(*nikto.version_data[NIKTO_VERSION_NAME])}
+        if tool not in TOOL_PROBES:
+            raise ValueError("Unknown tool <{}>".format(tool))
+        return self._capability_cache.lookup(tool, lambda: self._probe(tool))
+
+    def _probe(self, tool):
+        """Runs the tool to find its version
+
+        @param tool: str tool name
+
+        @raise OSError: if the version isn't
+        part of the tool's output
+
+        @return dict: the capability data
+        """
+        args, pattern = TOOL_PROBES[tool]
+        process = self._process_adapter.execute(tool, *args)
+        try:
+            stdout, stderr = process.communicate(timeout=self.PROBE_TIMEOUT)
+        except TimeoutExpired:
+            process.kill()
+            stdout, stderr = process.communicate()
+
+        match = re.search(pattern, (stdout + stderr).decode(errors="replace"))
+        if not match:
+            raise OSError("Could not find the version of <{}>".format(tool))
+        return {"version": match.group(1)}
@@ -0,0 +1,449 @@
+"""This module defines the ContentDiscovery
+class that is used to find the files and
+directories a web server holds, in the
+manner of dirb
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import asyncio
+import os
+import resource
+import ssl
+import time
+import uuid
+from collections import deque, namedtuple
+from urllib.parse import quote, urlsplit
+
+from lib.adapter.ProcessStream import ProcessUsage
+
+
+Hit = namedtuple("Hit", ["url", "status", "size", "location"])
+Response = namedtuple("Response", ["status", "headers", "body", "size", "keep_alive"])
+
+
+class Target(object):
+    """Connection details of the server
+    being scanned, shared by the workers
+    """
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError("Not an http(s) URL <{}>".format(base_url))
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.base_path = parts.path if parts.path.endswith("/") else parts.path + "/"
+        default_port = self.port == (443 if parts.scheme == "https" else 80)
+        self.host_header = self.host if default_port else "{}:{}".format(self.host, self.port)
+        self.base_url = "{}://{}{}".format(self.scheme, self.host_header, self.base_path)
+        self.pipelining = True
+        self.next_send = 0.0
+
+
+class ContentDiscovery(object):
+    """ContentDiscovery requests one path per
+    word over a small pool of keep-alive
+    connections. Once a connection has shown
+    that the server keeps HTTP/1.1 connections
+    open, requests are pipelined on it, and a
+    server that drops a pipelined batch is sent
+    one request at a time from then on. Before
+    the words are tried, made up paths are
+    requested so that servers answering every
+    path alike, soft 404s, are recognized once
+    and their answers left out of the hits.
+    Given a rate, batches are spaced so that
+    no more than that many requests a second
+    are sent over all of the connections.
+    What each discovery took is kept in the
+    usage attribute, as for a tool's process
+    """
+    DEFAULT_WORDLIST = "/usr/share/dirb/wordlists/common.txt"
+    FALLBACK_WORDS = ("admin", "administrator", "backup", "cgi-bin", "config", "css", "dav", "images",
+                      "img", "includes", "index.html", "index.php", "js", "login", "manager", "phpinfo.php",
+                      "phpmyadmin", "robots.txt", "server-status", "test", "tmp", "upload", "uploads", "webdav")
+    USER_AGENT = "Mozilla/5.0 (compatible; enumerator)"
+    MAX_BODY = 1 << 16
+    MAX_ATTEMPTS = 3
+    SIZE_TOLERANCE = 32
+
+    def __init__(self, connections=8, pipeline_depth=8, timeout=10.0, rate=None):
+        """Initializes the ContentDiscovery
+
+        @keyword connections: int representing the
+        most connections open to the server at once
+
+        @keyword pipeline_depth: int representing
+        the most requests in flight on one
+        connection. 1 disables pipelining
+
+        @keyword timeout: float seconds allowed
+        for connecting and for each read
+
+        @keyword rate: float representing the most
+        requests per second sent to the server,
+        unlimited when None
+
+        @raise ValueError: if connections or
+        pipeline_depth is less than 1, or the
+        rate isn't positive
+        """
+        if connections < 1 or pipeline_depth < 1:
+            raise ValueError("connections and pipeline_depth must be at least 1, got {} and {}"
+                             .format(connections, pipeline_depth))
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive, got {}".format(rate))
+        self._connections = connections
+        self._pipeline_depth = pipeline_depth
+        self._timeout = timeout
+        self._rate = rate
+        self.usage = None
+
+    @classmethod
+    def default_words(cls):
+        """@return list: the words of dirb's
+        common list when it's installed, or a
+        short built-in list
+        """
+        if os.path.isfile(cls.DEFAULT_WORDLIST):
+            with open(cls.DEFAULT_WORDLIST, errors="replace") as f:
+                return [line.strip() for line in f if line.strip()]
+        return list(cls.FALLBACK_WORDS)
+
+    def discover(self, base_url, words, time_limit=None):
+        """Requests every word below the base URL,
+        blocking until all are answered
+
+        @param base_url: str http or https URL
+
+        @param words: iterable of str or bytes
+
+        @keyword time_limit: float seconds after
+        which the requests still outstanding are
+        dropped and the hits found so far are
+        returned. None waits for every word
+
+        @raise OSError: if the server can't
+        be reached
+
+        @return list: Hit for every path found,
+        in word order. Its wall time and the CPU
+        time of the thread it ran in are then
+        kept in the usage attribute, exit code 1
+        if it raised
+        """
+        started = time.monotonic()
+        user, system = self._cpu_times()
+        exit_code = 1
+        try:
+            hits = asyncio.run(self.discover_async(base_url, words, time_limit))
+            exit_code = 0
+            return hits
+        finally:
+            user_after, system_after = self._cpu_times()
+            self.usage = ProcessUsage(exit_code, time.monotonic() - started, user_after - user,
+                                      system_after - system, 0, 0, 0)
+
+    @staticmethod
+    def _cpu_times():
+        """@return tuple: user and system CPU
+        seconds of the calling thread, all of it
+        counted as user time where threads can't
+        be measured on their own
+        """
+        if hasattr(resource, "RUSAGE_THREAD"):
+            usage = resource.getrusage(resource.RUSAGE_THREAD)
+            return usage.ru_utime, usage.ru_stime
+        return time.thread_time(), 0.0
+
+    async def discover_async(self, base_url, words, time_limit=None):
+        """Coroutine counterpart of discover
+
+        @return list: Hit per path found
+        """
+        target = Target(base_url)
+        paths = [target.base_path + quote(self._text(word).strip().lstrip("/"), safe="/~.-_!$&'()*+,;=:@")
+                 for word in words if self._text(word).strip()]
+        queue = deque(enumerate(paths))
+        hits = {}
+        task = asyncio.ensure_future(self._discover(target, queue, hits))
+        done, _ = await asyncio.wait([task], timeout=time_limit)
+        if done:
+            task.result()
+        else: # Out of time, the hits found so far are kept
+            queue.clear() # Workers whose cancellation wait_for swallows stop after their batch
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return [hits[index] for index in sorted(hits)]
+
+    async def _discover(self, target, queue, hits):
+        """Tries every path on the queue, adding
+        the hits by the index of their word
+        """
+        baseline = await self._soft_404_baseline(target)
+        attempts = {}
+        workers = min(self._connections, len(queue))
+        await asyncio.gather(*[self._worker(target, queue, attempts, hits, baseline) for _ in range(workers)])
+
+    def write_report(self, base_url, hits, path, words=None):
+        """Writes the hits in dirb's layout
+
+        @param base_url: str URL that was scanned
+
+        @param hits: list of Hit
+
+        @param path: str representing the file
+
+        @keyword words: int number of words tried
+        """
+        base_url = Target(base_url).base_url
+        with open(path, "w") as f:
+            f.write("-----------------\nenumerator content discovery\n-----------------\n\n")
+            f.write("URL_BASE: {}\n".format(base_url))
+            if words is not None:
+                f.write("GENERATED WORDS: {}\n".format(words))
+            f.write("\n---- Scanning URL: {} ----\n".format(base_url))
+            for hit in hits:
+                location = " --> {}".format(hit.location) if hit.location else ""
+                f.write("+ {} (CODE:{}|SIZE:{}){}\n".format(hit.url, hit.status, hit.size, location))
+            f.write("\n-----------------\nFOUND: {}\n".format(len(hits)))
+
+    async def _soft_404_baseline(self, target):
+        """Requests two paths that can't exist
+
+        @return list: (status, size, location)
+        fingerprints of the answers
+        """
+        probes = [target.base_path + uuid.uuid4().hex, target.base_path + uuid.uuid4().hex + ".html"]
+        reader, writer = await self._connect(target)
+        try:
+            fingerprints = []
+            for path in probes:
+                await self._send(writer, target, [path])
+                response = await self._read_response(reader)
+                fingerprints.append(self._fingerprint(response, path))
+                if not response.keep_alive and path is not probes[-1]:
+                    writer.close()
+                    reader, writer = await self._connect(target)
+            return fingerprints
+        finally:
+            writer.close()
+
+    async def _worker(self, target, queue, attempts, hits, baseline):
+        """Takes batches of paths off the queue
+        until it is empty, keeping its connection
+        open between them
+        """
+        connection = None
+        depth = 1
+        try:
+            while queue:
+                if connection is None:
+                    depth = 1
+                batch = [queue.popleft() for _ in range(min(depth, len(queue)))]
+                if connection is None: # Taken first, so no connection is opened once the queue is empty
+                    try:
+                        connection = await self._connect(target)
+                    except BaseException:
+                        queue.extendleft(reversed(batch))
+                        raise
+                if not await self._exchange(connection, target, batch, hits, baseline, queue, attempts):
+                    connection[1].close()
+                    connection = None
+                elif target.pipelining:
+                    depth = self._pipeline_depth
+        finally:
+            if connection is not None:
+                connection[1].close()
+
+    async def _exchange(self, connection, target, batch, hits, baseline, queue, attempts):
+        """Sends a batch of requests on the
+        connection and reads their responses,
+        requeueing those left unanswered
+
+        @return bool: if the connection can
+        be used again
+        """
+        answered = 0
+        keep_alive = False
+        try:
+            await self._pace(target, len(batch))
+            await self._send(connection[1], target, [path for _, path in batch])
+            for index, path in batch:
+                response = await self._read_response(connection[0])
+                answered += 1
+                keep_alive = response.keep_alive
+                if self._is_hit(response, path, baseline):
+                    hits[index] = Hit("{}://{}{}".format(target.scheme, target.host_header, path),
+                                      response.status, response.size, response.headers.get("location"))
+                if not keep_alive:
+                    break
+        except (OSError, EOFError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            if len(batch) > 1:
+                target.pipelining = False
+        self._requeue(queue, attempts, batch[answered:])
+        return keep_alive and answered == len(batch)
+
+    def _requeue(self, queue, attempts, unanswered):
+        """Puts unanswered paths back at the
+        front of the queue, dropping those
+        tried MAX_ATTEMPTS times
+        """
+        for index, path in reversed(unanswered):
+            attempts[index] = attempts.get(index, 0) + 1
+            if attempts[index] < self.MAX_ATTEMPTS:
+                queue.appendleft((index, path))
+
+    async def _pace(self, target, requests):
+        """Waits for the batch's turn, each batch
+        taking requests / rate seconds of the
+        target's schedule, when there is a rate
+        """
+        if self._rate is None:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, target.next_send)
+        target.next_send = start + requests / self._rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _connect(self, target):
+        """@return tuple: (reader, writer) of a
+        new connection to the target
+        """
+        context = None
+        if target.scheme == "https":
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        return await asyncio.wait_for(asyncio.open_connection(target.host, target.port, ssl=context),
+                                      self._timeout)
+
+    async def _send(self, writer, target, paths):
+        """Writes a GET request per path in
+        a single write
+        """
+        requests = "".join("GET {} HTTP/1.1\r\nHost: {}\r\nUser-Agent: {}\r\nAccept: */*\r\n"
+                           "Connection: keep-alive\r\n\r\n".format(path, target.host_header, self.USER_AGENT)
+                           for path in paths)
+        writer.write(requests.encode("latin-1", "replace"))
+        await asyncio.wait_for(writer.drain(), self._timeout)
+
+    async def _read_response(self, reader):
+        """Reads one response, skipping interim
+        1xx responses. Bodies longer than MAX_BODY
+        are read through but only their start
+        is kept
+
+        @raise EOFError: if the server closed
+        the connection before answering
+
+        @return Response
+        """
+        while True:
+            status_line = await self._readline(reader)
+            if not status_line:
+                raise EOFError("connection closed by server")
+            parts = status_line.decode("latin-1").split(None, 2)
+            if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+                raise ValueError("malformed status line {!r}".format(status_line))
+            version, status = parts[0], int(parts[1])
+
+            headers = {}
+            while True:
+                line = await self._readline(reader)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if not 100 <= status < 200:
+                break
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = "close" not in connection if version == "HTTP/1.1" else "keep-alive" in connection
+        if status in (204, 304):
+            body, size = b"", 0
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            body, size = await self._read_chunked(reader)
+        elif headers.get("content-length", "").isdigit():
+            body, size = await self._read_body(reader, int(headers["content-length"]))
+        else:
+            body, size = await self._read_body(reader, None)
+            keep_alive = False
+        return Response(status, headers, body, size, keep_alive)
+
+    async def _read_body(self, reader, length):
+        """Reads length bytes, or up to the end
+        of the stream if length is None
+
+        @return tuple: (bytes kept, int size)
+        """
+        kept, size = b"", 0
+        while length is None or size < length:
+            want = 1 << 16 if length is None else min(1 << 16, length - size)
+            block = await asyncio.wait_for(reader.read(want), self._timeout)
+            if not block:
+                if length is None:
+                    break
+                raise EOFError("connection closed mid body")
+            size += len(block)
+            if len(kept) < self.MAX_BODY:
+                kept += block[:self.MAX_BODY - len(kept)]
+        return kept, size
+
+    async def _read_chunked(self, reader):
+        """Reads a chunked body and its trailer
+
+        @return tuple: (bytes kept, int size)
+        """
+        kept, size = b"", 0
+        while True:
+            line = await self._readline(reader)
+            chunk_size = int(line.split(b";")[0].strip() or b"0", 16)
+            if not chunk_size:
+                break
+            block, _ = await self._read_body(reader, chunk_size)
+            size += chunk_size
+            if len(kept) < self.MAX_BODY:
+                kept += block[:self.MAX_BODY - len(kept)]
+            await self._readline(reader)
+        while (await self._readline(reader)) not in (b"\r\n", b"\n", b""):
+            pass
+        return kept, size
+
+    async def _readline(self, reader):
+        return await asyncio.wait_for(reader.readline(), self._timeout)
+
+    def _is_hit(self, response, path, baseline):
+        """@return bool: if the response shows
+        the path exists
+        """
+        if response.status == 404:
+            return False
+        status, size, location = self._fingerprint(response, path)
+        for base_status, base_size, base_location in baseline:
+            if (status == base_status and location == base_location and
+                    abs(size - base_size) <= self.SIZE_TOLERANCE):
+                return False
+        return True
+
+    @staticmethod
+    def _fingerprint(response, path):
+        """Describes a response with the
+        requested path taken out of it, so
+        pages echoing the path still match
+
+        @return tuple: (status, size, location)
+        """
+        name = path.rstrip("/").rsplit("/", 1)[-1].encode("latin-1", "replace")
+        body = response.body.replace(name, b"") if name else response.body
+        size = response.size - (len(response.body) - len(body))
+        location = response.headers.get("location", "").replace(name.decode("latin-1"), "") if name else ""
+        return response.status, size, location
+
+    @staticmethod
+    def _text(word):
+        return word.decode("utf-8", "replace") if isinstance(word, bytes) else word
@@ -0,0 +1,195 @@
+"""This module defines the Wordlist class
+that is used to read, deduplicate and split
+user and password lists
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.0
+"""
+import hashlib
+import mmap
+import os
+from array import array
+
+
+class DigestSet(object):
+    """DigestSet remembers words by a 64 bit
+    digest, held in a single open addressing
+    array, so it takes 16 bytes a word at most
+    however long the words are. Two words
+    sharing a digest are taken as one, which is
+    unlikely below billions of words
+    """
+    INITIAL_SLOTS = 1 << 16
+
+    def __init__(self):
+        """Initializes the DigestSet"""
+        self._slots = array("Q", [0]) * self.INITIAL_SLOTS
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, word):
+        """Adds a word to the set
+
+        @param word: bytes representing the word
+
+        @return bool: if the word was not in the
+        set before
+        """
+        digest = int.from_bytes(hashlib.blake2b(word, digest_size=8).digest(), "little") or 1
+        if not self._insert(self._slots, digest):
+            return False
+        self._size += 1
+        if 2 * self._size > len(self._slots):
+            self._grow()
+        return True
+
+    @staticmethod
+    def _insert(slots, digest):
+        """Linear probing from the slot the low
+        bits of the digest point at, 0 marks an
+        empty slot
+
+        @return bool: if the digest was inserted
+        """
+        mask = len(slots) - 1
+        i = digest & mask
+        while slots[i]:
+            if slots[i] == digest:
+                return False
+            i = (i + 1) & mask
+        slots[i] = digest
+        return True
+
+    def _grow(self):
+        slots = array("Q", [0]) * (2 * len(self._slots))
+        for digest in self._slots:
+            if digest:
+                self._insert(slots, digest)
+        self._slots = slots
+
+
+class Wordlist(object):
+    """Wordlist reads words, one per line, from
+    any number of files and inline words. Files
+    are memory mapped, so lists of any size are
+    read without loading them whole, and words
+    are deduplicated through a DigestSet rather
+    than kept. Each word is kept once, in the
+    order first seen. Words are handled as
+    bytes, as the tools read them
+    """
+
+    def __init__(self, sources=(), words=()):
+        """Initializes the Wordlist
+
+        @keyword sources: iterable of str paths
+        to wordlist files
+
+        @keyword words: iterable of str words
+        read before the files
+        """
+        self._sources = list(sources)
+        self._words = list(words)
+
+    def __iter__(self):
+        """@return iterator of bytes: every
+        unique, non empty word in order
+        """
+        seen = DigestSet()
+        for word in self._all_words():
+            if word and seen.add(word):
+                yield word
+
+    def write(self, path):
+        """Writes the unique words to a file
+
+        @param path: str representing the file
+
+        @return int: number of words written
+        """
+        return self.write_shards([path])[0]
+
+    def write_shards(self, paths, min_words=1):
+        """Deals the unique words out to the files
+        in turn, so every shard starts with its
+        share of the most likely words. The list
+        is read once; a list too short to give
+        every file min_words words is dealt again
+        to fewer files, leaving the rest empty
+
+        @param paths: list of str shard files
+
+        @keyword min_words: int representing the
+        fewest words worth a shard of their own
+
+        @return list: number of words in each
+        """
+        counts = [0] * len(paths)
+        files = [open(path, "wb") for path in paths]
+        try:
+            for i, word in enumerate(self):
+                files[i % len(files)].write(word + b"\n")
+                counts[i % len(files)] += 1
+        finally:
+            for f in files:
+                f.close()
+
+        total = sum(counts)
+        used = max(1, min(len(paths), -(-total // max(1, min_words))))
+        if used < len(paths):
+            counts = self._deal_again(paths, total, used)
+        return counts
+
+    @staticmethod
+    def _deal_again(paths, total, used):
+        """Deals the words of short shards out
+        to the first used files, in the order
+        they were first dealt
+
+        @return list: number of words in each
+        """
+        shards = []
+        for path in paths:
+            with open(path, "rb") as f:
+                shards.append(f.read().split(b"\n")[:-1])
+        words = [shards[i % len(paths)][i // len(paths)] for i in range(total)]
+        counts = [0] * len(paths)
+        for i, path in enumerate(paths):
+            with open(path, "wb") as f:
+                if i < used:
+                    dealt = words[i::used]
+                    f.write(b"".join(word + b"\n" for word in dealt))
+                    counts[i] = len(dealt)
+        return counts
+
+    def _all_words(self):
+        """@return iterator of bytes: every
+        word, duplicates included
+        """
+        for word in self._words:
+            yield word.strip().encode("utf-8")
+        for source in self._sources:
+            for word in self._mapped_lines(source):
+                yield word
+
+    @staticmethod
+    def _mapped_lines(path):
+        """Reads the lines of a file through
+        a memory map
+
+        @return iterator of bytes: the lines,
+        without their line endings
+        """
+        with open(path, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                start, size = 0, len(mapped)
+                while start < size:
+                    end = mapped.find(b"\n", start)
+                    end = size if end == -1 else end
+                    yield mapped[start:end].rstrip(b"\r")
+                    start = end + 1
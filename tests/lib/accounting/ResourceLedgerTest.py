@@ -0,0 +1,111 @@
+"""This module provides the testing class for
+ResourceLedger
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase, main
+
+from lib.accounting.ResourceLedger import ResourceLedger
+from lib.adapter.ProcessStream import ProcessUsage
+
+
+def usage(exit_code=0, wall_time=1.0, user_time=0.5, system_time=0.25, max_rss=1000, stdout=10, stderr=2):
+    return ProcessUsage(exit_code, wall_time, user_time, system_time, max_rss, stdout, stderr)
+
+
+class ResourceLedgerTest(TestCase):
+    """Utilized for unit testing the
+    ResourceLedger class"""
+
+    def setUp(self):
+        self.ledger = ResourceLedger()
+        self.ledger.record("nmap", "10.0.0.1", usage(max_rss=3000))
+        self.ledger.record("nmap", "10.0.0.1", usage(exit_code=1, wall_time=2.0))
+        self.ledger.record("nmap", "10.0.0.2", usage(max_rss=5000))
+        self.ledger.record("dirb", "10.0.0.2", usage(stdout=100))
+
+    def tearDown(self):
+        del self.ledger
+
+    def test_by_tool_sums_and_keeps_largest_rss(self):
+        # Apply
+        totals = self.ledger.by_tool()["nmap"]
+
+        # Assert
+        self.assertEqual(3, totals["processes"])
+        self.assertEqual(1, totals["failures"])
+        self.assertAlmostEqual(4.0, totals["wall_time"])
+        self.assertAlmostEqual(1.5, totals["user_time"])
+        self.assertEqual(5000, totals["max_rss"])
+
+    def test_by_tool_limited_to_host(self):
+        # Apply
+        totals = self.ledger.by_tool("10.0.0.2")
+
+        # Assert
+        self.assertEqual(["dirb", "nmap"], sorted(totals))
+        self.assertEqual(1, totals["nmap"]["processes"])
+
+    def test_by_host(self):
+        # Apply
+        totals = self.ledger.by_host()
+
+        # Assert
+        self.assertEqual(2, totals["10.0.0.1"]["processes"])
+        self.assertEqual(110, totals["10.0.0.2"]["stdout_bytes"])
+
+    def test_record_shared_charges_each_host_a_share(self):
+        # Arrange
+        ledger = ResourceLedger()
+
+        # Apply
+        ledger.record_shared("nmap", ["10.0.0.1", "10.0.0.2"], usage(wall_time=3.0, max_rss=4000, stdout=11))
+
+        # Assert
+        totals = ledger.by_host()
+        for host in ("10.0.0.1", "10.0.0.2"):
+            self.assertEqual(1, totals[host]["processes"])
+            self.assertAlmostEqual(1.5, totals[host]["wall_time"])
+            self.assertEqual(5, totals[host]["stdout_bytes"])
+            self.assertEqual(4000, totals[host]["max_rss"])
+
+    def test_prometheus_has_a_sample_per_tool_and_host(self):
+        # Apply
+        text = self.ledger.prometheus()
+
+        # Assert
+        self.assertIn("# TYPE enumerator_process_wall_seconds_total counter", text)
+        self.assertIn('enumerator_processes_total{tool="nmap",host="10.0.0.1"} 2', text)
+        self.assertIn('enumerator_process_max_rss_kilobytes{tool="nmap",host="10.0.0.2"} 5000', text)
+        self.assertIn('enumerator_process_stdout_bytes_total{tool="dirb",host="10.0.0.2"} 100', text)
+
+    def test_export_writes_host_files(self):
+        # Arrange
+        directory = tempfile.mkdtemp()
+
+        # Apply
+        try:
+            paths = self.ledger.export(directory, host="10.0.0.1")
+            with open(paths[0]) as f:
+                summary = json.load(f)
+            with open(paths[1]) as f:
+                text = f.read()
+            listing = sorted(os.listdir(directory))
+        finally:
+            shutil.rmtree(directory)
+
+        # Assert
+        self.assertEqual([ResourceLedger.JSON_FILE, ResourceLedger.PROMETHEUS_FILE], listing)
+        self.assertEqual(["nmap"], list(summary["tools"]))
+        self.assertEqual(["10.0.0.1"], list(summary["hosts"]))
+        self.assertNotIn("10.0.0.2", text)
+
+
+if __name__ == "__main__":
+    main()
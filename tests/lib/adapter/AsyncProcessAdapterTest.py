@@ -0,0 +1,89 @@
+"""This module provides the testing class for
+AsyncProcessAdapter
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import asyncio
+import sys
+from unittest import TestCase, main
+
+from lib.adapter.AsyncProcessAdapter import AsyncProcessAdapter
+from lib.adapter.ProcessAdapter import POSIX_SPAWN
+
+
+class AsyncProcessAdapterTest(TestCase):
+    """Utilized for testing the AsyncProcessAdapter
+    class against real child processes"""
+
+    def setUp(self):
+        self.adapter = AsyncProcessAdapter()
+
+    def tearDown(self):
+        del self.adapter
+
+    def test_execute_reads_stdout(self):
+        # Arrange
+        async def run():
+            process = await self.adapter.execute(sys.executable, "-c", "print('hello')")
+            output = await process.stdout.read()
+            await process.wait()
+            return output
+
+        # Apply
+        output = asyncio.run(run())
+
+        # Assert
+        self.assertEqual(b"hello", output.strip())
+
+    def test_execute_reads_stderr_and_exit_code(self):
+        # Arrange
+        code = "import sys; sys.stderr.write('oops'); sys.exit(3)"
+
+        async def run():
+            process = await self.adapter.execute(sys.executable, "-c", code)
+            error = await process.stderr.read()
+            return error, await process.wait()
+
+        # Apply
+        error, return_code = asyncio.run(run())
+
+        # Assert
+        self.assertEqual(b"oops", error)
+        self.assertEqual(3, return_code)
+
+    def test_execute_many_children_on_one_loop(self):
+        # Arrange
+        async def run():
+            processes = [await self.adapter.execute(sys.executable, "-c", "print(%d)" % i) for i in range(20)]
+            outputs = await asyncio.gather(*[p.communicate() for p in processes])
+            return [int(out) for out, _ in outputs]
+
+        # Apply + Assert
+        self.assertEqual(list(range(20)), asyncio.run(run()))
+
+    def test_execute_stdin_is_devnull(self):
+        # Arrange
+        async def run():
+            process = await self.adapter.execute(sys.executable, "-c", "import sys; print(repr(sys.stdin.read()))")
+            output, _ = await process.communicate()
+            return output
+
+        # Apply
+        output = asyncio.run(run())
+
+        # Assert
+        self.assertEqual(b"''", output.strip())
+
+    def test_unsupported_backend(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, AsyncProcessAdapter, backend=POSIX_SPAWN)
+
+    def test_execute_with_invalid_flag_value(self):
+        # Apply + Assert
+        self.assertRaises(NameError, asyncio.run, self.adapter.execute("cmd", f="-x"))
+
+
+if __name__ == "__main__":
+    main()
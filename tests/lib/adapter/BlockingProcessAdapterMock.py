@@ -0,0 +1,137 @@
+"""This package describes the
+BlockingProcessAdapterMock class used
+for testing code that waits on processes
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import threading
+
+from lib.adapter.AbstractProcessAdapter import AbstractProcessAdapter
+
+
+class BlockingPipeMock(object):
+    """Binary pipe whose data is only written,
+    and its write end closed, once the process
+    is released
+    """
+
+    def __init__(self, released, data):
+        """Initializes the BlockingPipeMock"""
+        self._read, write = os.pipe()
+        self._closed = False
+        threading.Thread(target=self._write, args=(released, write, data.encode()), daemon=True).start()
+
+    @staticmethod
+    def _write(released, write, data):
+        released.wait()
+        with open(write, "wb") as f:
+            f.write(data)
+
+    def fileno(self):
+        """@return int: the read end"""
+        return self._read
+
+    def close(self):
+        """Closes the pipe"""
+        if not self._closed:
+            self._closed = True
+            os.close(self._read)
+
+
+class BlockingPopenMock(object):
+    """Popen stand in that only finishes
+    once it is released
+    """
+
+    def __init__(self, adapter, command, flags, stdout, returncode):
+        """Initializes the BlockingPopenMock"""
+        self._adapter = adapter
+        self.command = command
+        self.flags = flags
+        self.returncode = None
+        self._returncode = returncode
+        self.released = threading.Event()
+        self.stdout = BlockingPipeMock(self.released, stdout)
+        self.stderr = BlockingPipeMock(self.released, "")
+
+    def wait(self):
+        """Blocks until released
+
+        @return int: the pre set exit code
+        """
+        self.released.wait()
+        if self.returncode is None:
+            self.returncode = self._returncode
+            self._adapter._finished(self)
+        return self.returncode
+
+    def terminate(self):
+        """Releases the process with the
+        exit code of a SIGTERM
+        """
+        self._returncode = -15
+        self.released.set()
+
+
+class BlockingProcessAdapterMock(AbstractProcessAdapter):
+    """Records every started process and
+    the peak number of them alive at once.
+    Processes only finish once released
+    """
+
+    def __init__(self, stdout="", returncode=0):
+        """Initializes the mock object"""
+        self.stdout = stdout
+        self.returncode = returncode
+        self.started = []
+        self.alive = 0
+        self.peak = 0
+        self.peak_by_command = {}
+        self.releasing = False
+        self._alive_by_command = {}
+        self._lock = threading.Condition()
+
+    def execute(self, command, *args, **flags):
+        """Records the call and returns
+        a process that blocks until released
+
+        @return BlockingPopenMock
+        """
+        with self._lock:
+            process = BlockingPopenMock(self, (command,) + args, flags, self.stdout, self.returncode)
+            if self.releasing:
+                process.released.set()
+            self.started.append(process)
+            self.alive += 1
+            self.peak = max(self.peak, self.alive)
+            alive = self._alive_by_command.get(command, 0) + 1
+            self._alive_by_command[command] = alive
+            self.peak_by_command[command] = max(self.peak_by_command.get(command, 0), alive)
+            self._lock.notify_all()
+        return process
+
+    def _finished(self, process):
+        with self._lock:
+            self.alive -= 1
+            self._alive_by_command[process.command[0]] -= 1
+
+    def wait_for_started(self, count, timeout=5):
+        """Blocks until at least count
+        processes were started
+
+        @return bool: if the count was reached
+        """
+        with self._lock:
+            return self._lock.wait_for(lambda: len(self.started) >= count, timeout)
+
+    def release_all(self):
+        """Lets every started process finish,
+        along with any started afterwards
+        """
+        with self._lock:
+            self.releasing = True
+            for process in self.started:
+                process.released.set()
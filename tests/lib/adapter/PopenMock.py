@@ -19,3 +19,20 @@ class PopenMock(object):
         self.stdout = []
         self.stderr = []
         self.stdin = []
+        self.returncode = 0
+        self.terminated = False
+
+    def communicate(self, timeout=None):
+        """Emits the pre set output
+
+        @return tuple: bytes (stdout, stderr)
+        """
+        return b"".join(self.stdout), b"".join(self.stderr)
+
+    def wait(self):
+        """@return int: the pre set exit code"""
+        return self.returncode
+
+    def terminate(self):
+        """Records that the process was stopped"""
+        self.terminated = True
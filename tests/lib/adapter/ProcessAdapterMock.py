@@ -17,7 +17,7 @@ class ProcessAdapterMock(AbstractProcessAdapter):
     out the normal ProcessAdapter and feeding
     pre-set responses and recording input
     """
-    VERSION_DATA = [""] * 5 + [NIKTO_VERSION_NAME + "    99.99.99"]
+    VERSION_DATA = [b""] * 5 + [(NIKTO_VERSION_NAME + "    99.99.99").encode()]
     POPEN_VERSION = PopenMock()
 
     def __init__(self):
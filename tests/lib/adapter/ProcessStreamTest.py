@@ -0,0 +1,182 @@
+"""This module provides the testing class for
+ProcessStream
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import signal
+import sys
+import tempfile
+from unittest import TestCase, main
+
+from lib.adapter.ProcessAdapter import ProcessAdapter
+from lib.adapter.ProcessStream import ProcessStream
+
+
+CHATTY_CHILD = """
+import sys
+for i in range({lines}):
+    sys.stdout.write('out %d\\n' % i)
+    sys.stderr.write('err %d\\n' % i)
+sys.exit({code})
+"""
+
+
+class ProcessStreamTest(TestCase):
+    """Utilized for testing the ProcessStream
+    class against real child processes"""
+
+    def setUp(self):
+        self.adapter = ProcessAdapter()
+        fd, self.output_file = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.output_file)
+        del self.adapter
+
+    def _chatty(self, lines, code=0):
+        return self.adapter.execute(sys.executable, "-c", CHATTY_CHILD.format(lines=lines, code=code))
+
+    def test_run_drains_both_pipes_past_pipe_buffer(self):
+        # Arrange
+        errors = []
+        stream = ProcessStream(self._chatty(50000), output_file=self.output_file)
+        stream.add_parser(errors.append, ProcessStream.STDERR)
+
+        # Apply
+        return_code = stream.run()
+
+        # Assert
+        self.assertEqual(0, return_code)
+        self.assertEqual(50000, len(errors))
+        with open(self.output_file) as f:
+            self.assertEqual(50000, sum(1 for _ in f))
+
+    def test_run_hands_lines_to_parsers_in_order(self):
+        # Arrange
+        lines = []
+        stream = ProcessStream(self._chatty(3)).add_parser(lines.append)
+
+        # Apply
+        stream.run()
+
+        # Assert
+        self.assertEqual(["out 0\n", "out 1\n", "out 2\n"], lines)
+
+    def test_run_returns_exit_code(self):
+        # Apply + Assert
+        self.assertEqual(4, ProcessStream(self._chatty(1, code=4)).run())
+
+    def test_run_parser_error_is_raised_after_draining(self):
+        # Arrange
+        def parser(line):
+            raise ValueError(line)
+        process = self._chatty(20000)
+        stream = ProcessStream(process).add_parser(parser)
+
+        # Apply + Assert
+        self.assertRaises(ValueError, stream.run)
+        self.assertEqual(0, process.returncode)
+
+    def test_run_records_usage(self):
+        # Arrange
+        stream = ProcessStream(self._chatty(10, code=3))
+
+        # Apply
+        stream.run()
+
+        # Assert
+        self.assertEqual(3, stream.usage.exit_code)
+        self.assertEqual(sum(len("out %d\n" % i) for i in range(10)), stream.usage.stdout_bytes)
+        self.assertEqual(sum(len("err %d\n" % i) for i in range(10)), stream.usage.stderr_bytes)
+        self.assertGreater(stream.usage.wall_time, 0)
+        self.assertGreater(stream.usage.max_rss, 0)
+        self.assertGreater(stream.usage.user_time + stream.usage.system_time, 0)
+
+    def test_run_keeps_bytes_that_are_not_text(self):
+        # Arrange
+        code = "import sys; sys.stdout.buffer.write(b'before\\n\\xff\\xfe banner\\nafter\\n')"
+        lines = []
+        stream = ProcessStream(self.adapter.execute(sys.executable, "-c", code), output_file=self.output_file)
+        stream.add_parser(lines.append)
+
+        # Apply
+        return_code = stream.run()
+
+        # Assert
+        self.assertEqual(0, return_code)
+        self.assertEqual(3, len(lines))
+        self.assertEqual(23, stream.usage.stdout_bytes)
+        with open(self.output_file, "rb") as f:
+            self.assertEqual(b"before\n\xff\xfe banner\nafter\n", f.read())
+
+    def test_run_writes_output_byte_for_byte(self):
+        # Arrange
+        code = "import sys; sys.stdout.buffer.write(b'a\\r\\nb\\rc\\xff\\n')"
+        lines = []
+        stream = ProcessStream(self.adapter.execute(sys.executable, "-c", code), output_file=self.output_file)
+        stream.add_parser(lines.append)
+
+        # Apply
+        stream.run()
+
+        # Assert
+        with open(self.output_file, "rb") as f:
+            self.assertEqual(b"a\r\nb\rc\xff\n", f.read())
+        self.assertEqual(8, stream.usage.stdout_bytes)
+        self.assertEqual(["a\n", "b\n", "c\ufffd\n"], lines)
+
+    def test_run_splits_lines_across_reads(self):
+        # Arrange
+        code = ("import sys, time\n"
+                "for part in (b'first\\r', b'\\nsec', b'ond\\n', b'x' * 70000, b'\\nlast'):\n"
+                "    sys.stdout.buffer.write(part); sys.stdout.flush(); time.sleep(0.05)")
+        lines = []
+        stream = ProcessStream(self.adapter.execute(sys.executable, "-c", code)).add_parser(lines.append)
+
+        # Apply
+        stream.run()
+
+        # Assert
+        cut = ProcessStream.MAX_LINE
+        self.assertEqual(["first\n", "second\n", "x" * cut + "\n", "x" * (70000 - cut) + "\n", "last"], lines)
+
+    def test_terminate_stops_the_process_it_reaps(self):
+        # Arrange
+        process = self.adapter.execute(sys.executable, "-c", "import time; print('up', flush=True); time.sleep(30)")
+        stream = ProcessStream(process)
+        stream.add_parser(lambda line: stream.terminate())
+
+        # Apply
+        return_code = stream.run()
+
+        # Assert
+        self.assertEqual(-signal.SIGTERM, return_code)
+        self.assertGreater(stream.usage.max_rss, 0)
+
+    def test_run_process_reaped_elsewhere(self):
+        # Arrange
+        process = self.adapter.execute(sys.executable, "-c", "print('done')")
+        process.wait()
+        process.returncode = None
+
+        # Apply
+        return_code = ProcessStream(process).run()
+
+        # Assert
+        self.assertEqual(0, return_code)
+
+    def test_add_parser_unknown_stream(self):
+        # Arrange
+        stream = ProcessStream(self._chatty(0))
+
+        # Apply + Assert
+        self.assertRaises(ValueError, stream.add_parser, len, "stdin")
+        stream.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""This module provides the testing class for
+SpawnedProcess
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import sys
+import tempfile
+import threading
+from subprocess import TimeoutExpired
+from unittest import TestCase, main
+
+from lib.adapter.ProcessAdapter import ProcessAdapter, POSIX_SPAWN
+from lib.adapter.ProcessStream import ProcessStream
+from lib.adapter.SpawnedProcess import SpawnedProcess
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+class SpawnedProcessTest(TestCase):
+    """Utilized for testing the SpawnedProcess
+    class against real child processes"""
+
+    def test_communicate_reads_both_streams(self):
+        # Arrange
+        process = SpawnedProcess(python("import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"))
+
+        # Apply
+        stdout, stderr = process.communicate(timeout=10)
+
+        # Assert
+        self.assertEqual((b"out\n", b"err\n"), (stdout, stderr))
+        self.assertEqual(3, process.returncode)
+
+    def test_stdin_is_devnull(self):
+        # Arrange
+        process = SpawnedProcess(python("import sys; print(repr(sys.stdin.read()))"))
+
+        # Apply
+        stdout, _ = process.communicate(timeout=10)
+
+        # Assert
+        self.assertEqual(b"''\n", stdout)
+
+    def test_no_shell_is_involved(self):
+        # Arrange
+        process = SpawnedProcess(python("import sys; print(sys.argv[1])") + ["$HOME; echo injected"])
+
+        # Apply
+        stdout, _ = process.communicate(timeout=10)
+
+        # Assert
+        self.assertEqual(b"$HOME; echo injected\n", stdout)
+
+    def test_communicate_timeout_then_kill(self):
+        # Arrange
+        process = SpawnedProcess(python("import time; print('started', flush=True); time.sleep(30)"))
+
+        # Apply
+        self.assertRaises(TimeoutExpired, process.communicate, timeout=0.5)
+        process.kill()
+        stdout, _ = process.communicate()
+
+        # Assert
+        self.assertEqual(b"started\n", stdout)
+        self.assertEqual(-9, process.returncode)
+
+    def test_terminate_and_poll(self):
+        # Arrange
+        process = SpawnedProcess(python("import time; time.sleep(30)"))
+
+        # Apply
+        running = process.poll()
+        process.terminate()
+        code = process.wait(timeout=10)
+        process.communicate()
+
+        # Assert
+        self.assertIsNone(running)
+        self.assertEqual(-15, code)
+
+    def test_missing_command(self):
+        # Apply + Assert
+        self.assertRaises(FileNotFoundError, SpawnedProcess, ["enumerator-no-such-tool"])
+
+    def test_descriptors_are_not_leaked(self):
+        # Arrange
+        before = len(os.listdir("/proc/self/fd"))
+
+        # Apply
+        for _ in range(5):
+            SpawnedProcess(python("pass")).communicate(timeout=10)
+
+        # Assert
+        self.assertEqual(before, len(os.listdir("/proc/self/fd")))
+
+    def test_devnull_is_opened_once_across_threads(self):
+        # Arrange
+        opened = SpawnedProcess._devnull
+        SpawnedProcess._devnull = None
+        barrier = threading.Barrier(8)
+        descriptors = []
+
+        def null():
+            barrier.wait()
+            descriptors.append(SpawnedProcess._null())
+        threads = [threading.Thread(target=null) for _ in range(8)]
+
+        # Apply
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            for descriptor in set(descriptors):
+                os.close(descriptor)
+            SpawnedProcess._devnull = opened
+
+        # Assert
+        self.assertEqual(8, len(descriptors))
+        self.assertEqual(1, len(set(descriptors)))
+
+    def test_adapter_backend_streams_with_usage(self):
+        # Arrange
+        adapter = ProcessAdapter(backend=POSIX_SPAWN)
+        lines = []
+
+        # Apply
+        process = adapter.execute(sys.executable, "-c", "print('one'); print('two')")
+        stream = ProcessStream(process)
+        stream.add_parser(lines.append)
+        code = stream.run()
+
+        # Assert
+        self.assertIsInstance(process, SpawnedProcess)
+        self.assertEqual(0, code)
+        self.assertEqual(["one\n", "two\n"], lines)
+        self.assertGreater(stream.usage.max_rss, 0)
+
+    def test_adapter_backend_keeps_bytes_that_are_not_text(self):
+        # Arrange
+        adapter = ProcessAdapter(backend=POSIX_SPAWN)
+        fd, output_file = tempfile.mkstemp()
+        os.close(fd)
+        lines = []
+
+        # Apply
+        process = adapter.execute(sys.executable, "-c", "import sys; sys.stdout.buffer.write(b'a\\r\\n\\xff\\nb\\n')")
+        stream = ProcessStream(process, output_file=output_file)
+        stream.add_parser(lines.append)
+        code = stream.run()
+        with open(output_file, "rb") as f:
+            written = f.read()
+        os.remove(output_file)
+
+        # Assert
+        self.assertEqual(0, code)
+        self.assertEqual(b"a\r\n\xff\nb\n", written)
+        self.assertEqual(["a\n", "\ufffd\n", "b\n"], lines)
+
+    def test_adapter_invalid_backend(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, ProcessAdapter, backend="fork")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""This module provides the testing class for
+FindingsStore
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest import TestCase, main
+
+from lib.findings.FindingsStore import FindingsStore, Service
+from lib.findings.ReportReader import WebPath, Share
+from lib.ftp.AnonymousFtpChecker import FtpResult
+from lib.hydra.ShardedHydra import Credential
+from lib.nikto.NiktoCsvReader import NiktoFinding
+from lib.nmap.NmapXmlReader import PortRecord
+
+
+def records(host, product="Apache httpd", version="2.2.8"):
+    return [
+        PortRecord(host, "tcp", 21, "open", "ftp", "vsftpd", "2.3.4"),
+        PortRecord(host, "tcp", 80, "open", "http", product, version),
+        PortRecord(host, "tcp", 8080, "closed", "http-proxy", "", ""),
+        NiktoFinding(host, host, 80, 3268, "GET", "/icons/", "Directory indexing found."),
+        WebPath(host, 80, "http://{}/admin".format(host), 200, 11),
+        Credential(host, 21, "ftp", "admin", "s3cret"),
+        Share(host, "tmp", "Disk", "oh noes!", True),
+        FtpResult(host, 21, True, "220 (vsFTPd 2.3.4)", None, None),
+    ]
+
+
+class FindingsStoreTest(TestCase):
+    """Utilized for unit testing the
+    FindingsStore class"""
+
+    def setUp(self):
+        self.store = FindingsStore()
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_ingest_counts_known_records(self):
+        # Apply
+        count = self.store.ingest("10.0.0.1", records("10.0.0.1") + ["not a record"])
+
+        # Assert
+        self.assertEqual(8, count)
+        self.assertEqual(["10.0.0.1"], self.store.hosts())
+
+    def test_ingest_in_batches(self):
+        # Arrange
+        FindingsStore.BATCH_SIZE = 3
+        ports = [PortRecord("10.0.0.1", "tcp", port, "open", "", "", "") for port in range(1, 11)]
+
+        # Apply
+        try:
+            self.store.ingest("10.0.0.1", ports)
+        finally:
+            FindingsStore.BATCH_SIZE = 500
+
+        # Assert
+        self.assertEqual(10, len(self.store.services()))
+
+    def test_ingest_replaces_earlier_findings_of_host(self):
+        # Arrange
+        self.store.ingest("10.0.0.1", records("10.0.0.1"))
+        self.store.ingest("10.0.0.2", records("10.0.0.2"))
+
+        # Apply
+        self.store.ingest("10.0.0.1", records("10.0.0.1")[:1])
+
+        # Assert
+        self.assertEqual(["10.0.0.2"], [r.host for r in self.store.anonymous_ftp()])
+        self.assertEqual(["10.0.0.1", "10.0.0.2"], [s.host for s in self.store.services(port=21)])
+
+    def test_ingest_replaces_only_the_engagement_of_host(self):
+        # Arrange
+        self.store.ingest("10.0.0.1", records("10.0.0.1"), engagement="acme")
+        self.store.ingest("10.0.0.1", records("10.0.0.1", product="nginx"), engagement="initech")
+
+        # Apply
+        self.store.ingest("10.0.0.1", records("10.0.0.1")[:1], engagement="acme")
+
+        # Assert
+        self.assertEqual(["acme", "initech"], self.store.engagements())
+        self.assertEqual([21], [s.port for s in self.store.services(engagement="acme")])
+        self.assertEqual([21, 80], [s.port for s in self.store.services(engagement="initech")])
+        self.assertEqual(3, len(self.store.services()))
+        self.assertEqual([], self.store.anonymous_ftp(engagement="acme"))
+        self.assertEqual(1, len(self.store.credentials("ftp", engagement="initech")))
+        self.assertEqual(["10.0.0.1"], self.store.hosts(engagement="initech"))
+        self.assertEqual([], self.store.hosts(engagement="hooli"))
+
+    def test_services_by_product_and_version(self):
+        # Arrange
+        self.store.ingest("10.0.0.1", records("10.0.0.1"))
+        self.store.ingest("10.0.0.2", records("10.0.0.2", version="2.4.7"))
+        self.store.ingest("10.0.0.3", records("10.0.0.3", product="nginx", version="1.2"))
+
+        # Apply
+        apache = self.store.services(product="apache")
+        apache_22 = self.store.services(product="Apache", version="2.2")
+
+        # Assert
+        self.assertEqual(["10.0.0.1", "10.0.0.2"], [s.host for s in apache])
+        self.assertEqual([Service("10.0.0.1", "tcp", 80, "http", "Apache httpd", "2.2.8")], apache_22)
+
+    def test_services_only_open_ports(self):
+        # Arrange
+        self.store.ingest("10.0.0.1", records("10.0.0.1"))
+
+        # Apply + Assert
+        self.assertEqual([], self.store.services(port=8080))
+        self.assertEqual([80], [s.port for s in self.store.services(service="http")])
+
+    def test_queries(self):
+        # Arrange
+        self.store.ingest("10.0.0.1", records("10.0.0.1"))
+
+        # Apply + Assert
+        self.assertEqual([FtpResult("10.0.0.1", 21, True, "220 (vsFTPd 2.3.4)", None, None)], self.store.anonymous_ftp())
+        self.assertEqual([Credential("10.0.0.1", 21, "ftp", "admin", "s3cret")], self.store.credentials("ftp"))
+        self.assertEqual([], self.store.credentials("ssh"))
+        self.assertEqual([Share("10.0.0.1", "tmp", "Disk", "oh noes!", True)], self.store.shares(listing=True))
+        self.assertEqual([], self.store.shares(listing=False))
+        self.assertEqual(1, len(self.store.web_paths(contains="admin", status=200)))
+        self.assertEqual(3268, self.store.nikto(contains="indexing")[0].osvdb)
+
+    def test_database_file_persists(self):
+        # Arrange
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "findings.db")
+        try:
+            store = FindingsStore(path)
+            store.ingest("10.0.0.1", records("10.0.0.1"))
+            store.close()
+
+            # Apply
+            reopened = FindingsStore(path)
+            hosts = reopened.hosts()
+            reopened.close()
+        finally:
+            shutil.rmtree(directory)
+
+        # Assert
+        self.assertEqual(["10.0.0.1"], hosts)
+
+    def test_findings_without_engagement_move_to_default(self):
+        # Arrange
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "findings.db")
+        connection = sqlite3.connect(path)
+        connection.executescript("""
+            CREATE TABLE ports (host TEXT NOT NULL, protocol TEXT NOT NULL, port INTEGER NOT NULL, state TEXT,
+                service TEXT, product TEXT, version TEXT, UNIQUE (host, protocol, port));
+            CREATE INDEX ports_port ON ports (port, state);
+            INSERT INTO ports VALUES ('10.0.0.1', 'tcp', 80, 'open', 'http', 'Apache httpd', '2.2.8');
+            """)
+        connection.commit()
+        connection.close()
+
+        try:
+            # Apply
+            store = FindingsStore(path)
+            store.ingest("10.0.0.1", records("10.0.0.1")[:1], engagement="acme")
+            services = store.services(engagement="default")
+            engagements = store.engagements()
+            store.close()
+        finally:
+            shutil.rmtree(directory)
+
+        # Assert
+        self.assertEqual([Service("10.0.0.1", "tcp", 80, "http", "Apache httpd", "2.2.8")], services)
+        self.assertEqual(["acme", "default"], engagements)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""This module provides the testing class for
+ReportReader
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase, main
+
+from lib.findings.ReportReader import ReportReader, WebPath, Share
+from lib.ftp.AnonymousFtpChecker import FtpResult
+from lib.hydra.ShardedHydra import Credential
+from lib.nikto.NiktoCsvReader import NiktoFinding
+from lib.nmap.NmapXmlReader import PortRecord
+
+from tests.lib.nmap.NmapXmlSamples import nmap_xml
+
+
+NIKTO_TEXT = """- Nikto v2.1.6
++ Target IP:          10.0.0.1
++ Server: Apache/2.2.8 (Ubuntu)
++ OSVDB-3268: /icons/: Directory indexing found.
++ GET /: The anti-clickjacking X-Frame-Options header is not present.
+"""
+DIRB_REPORT = """---- Scanning URL: http://10.0.0.1/ ----
++ http://10.0.0.1/admin (CODE:200|SIZE:11)
+==> DIRECTORY: http://10.0.0.1/images/
+"""
+ENUM_INFO = """\tSharename       Type      Comment
+\t---------       ----      -------
+\tprint$          Disk      Printer Drivers
+\ttmp             Disk      oh noes!
+\tIPC$            IPC       IPC Service (metasploitable server)
+//10.0.0.1/print$\tMapping: DENIED, Listing: N/A
+//10.0.0.1/tmp\tMapping: OK, Listing: OK
+"""
+FTP_ANONYMOUS = """Anonymous FTP login allowed on 10.0.0.1:21
+Banner:
+220 (vsFTPd 2.3.4)
+Root listing:
+
+"""
+
+
+class ReportReaderTest(TestCase):
+    """Utilized for unit testing the
+    ReportReader class"""
+
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), "10.0.0.1")
+        os.makedirs(self.directory)
+        self.reader = ReportReader(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.directory))
+
+    def _write(self, name, content):
+        with open(os.path.join(self.directory, name), "w") as f:
+            f.write(content)
+
+    def test_host_defaults_to_directory_name(self):
+        # Assert
+        self.assertEqual("10.0.0.1", self.reader.host)
+        self.assertEqual("target", ReportReader(self.directory, host="target").host)
+
+    def test_ports_prefers_service_scan(self):
+        # Arrange
+        self._write("nmap_full_ports.xml", nmap_xml({"10.0.0.1": [(22, "open")]}))
+        self._write("nmap_full.xml", nmap_xml({"10.0.0.1": [(80, "open", "http", "Apache httpd", "2.2.8")]}))
+
+        # Apply
+        ports = list(self.reader.ports())
+
+        # Assert
+        self.assertEqual([PortRecord("10.0.0.1", "tcp", 80, "open", "http", "Apache httpd", "2.2.8")], ports)
+
+    def test_nikto_text_and_csv(self):
+        # Arrange
+        self._write("nikto_80.txt", NIKTO_TEXT)
+        self._write("nikto_443.txt", '"10.0.0.1","10.0.0.1","443","OSVDB-0","GET","/","No CGI found."\n')
+
+        # Apply
+        findings = list(self.reader.nikto())
+
+        # Assert
+        self.assertEqual([NiktoFinding("10.0.0.1", "10.0.0.1", 443, None, "GET", "/", "No CGI found."),
+                          NiktoFinding("10.0.0.1", "10.0.0.1", 80, 3268, "GET", "/icons/", "Directory indexing found."),
+                          NiktoFinding("10.0.0.1", "10.0.0.1", 80, None, "GET", "/",
+                                       "The anti-clickjacking X-Frame-Options header is not present.")], findings)
+
+    def test_web_paths(self):
+        # Arrange
+        self._write("dirb_80.txt", DIRB_REPORT)
+
+        # Apply
+        paths = list(self.reader.web_paths())
+
+        # Assert
+        self.assertEqual([WebPath("10.0.0.1", 80, "http://10.0.0.1/admin", 200, 11),
+                          WebPath("10.0.0.1", 80, "http://10.0.0.1/images/", None, None)], paths)
+
+    def test_credentials(self):
+        # Arrange
+        self._write("ftp_accounts.txt", "# hydra ftp://10.0.0.1, 2 shard(s)\n"
+                                        "[21][ftp] host: 10.0.0.1   login: admin   password: s3cret\n")
+
+        # Apply
+        credentials = list(self.reader.credentials())
+
+        # Assert
+        self.assertEqual([Credential("10.0.0.1", 21, "ftp", "admin", "s3cret")], credentials)
+
+    def test_shares(self):
+        # Arrange
+        self._write("enum_info.txt", ENUM_INFO)
+
+        # Apply
+        shares = list(self.reader.shares())
+
+        # Assert
+        self.assertEqual([Share("10.0.0.1", "print$", "Disk", "Printer Drivers", False),
+                          Share("10.0.0.1", "tmp", "Disk", "oh noes!", True),
+                          Share("10.0.0.1", "IPC$", "IPC", "IPC Service (metasploitable server)", None)], shares)
+
+    def test_anonymous_ftp(self):
+        # Arrange
+        self._write("ftp_anonymous.txt", FTP_ANONYMOUS)
+
+        # Apply
+        results = list(self.reader.anonymous_ftp())
+
+        # Assert
+        self.assertEqual([FtpResult("10.0.0.1", 21, True, "220 (vsFTPd 2.3.4)", None, None)], results)
+
+    def test_empty_directory(self):
+        # Apply + Assert
+        self.assertEqual([], list(self.reader))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""This module provides the testing class for
+AnonymousFtpChecker
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import socket
+import tempfile
+import time
+from unittest import TestCase, main
+
+from lib.ftp.AnonymousFtpChecker import AnonymousFtpChecker
+
+from tests.lib.ftp.FtpServerMock import FtpServerMock
+
+
+class AnonymousFtpCheckerTest(TestCase):
+    """Utilized for testing the AnonymousFtpChecker
+    class against local stand-in FTP servers"""
+
+    def setUp(self):
+        self.servers = []
+        self.checker = AnonymousFtpChecker(connect_timeout=1.0, read_timeout=0.5)
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+        del self.checker
+
+    def _server(self, **kwargs):
+        server = FtpServerMock(**kwargs)
+        self.servers.append(server)
+        return ("127.0.0.1", server.port)
+
+    def _closed_port(self):
+        s = socket.socket()
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+        s.close()
+        return ("127.0.0.1", port)
+
+    def test_check_records_banner_and_listing(self):
+        # Arrange
+        target = self._server(banner="vsFTPd 3.0.3")
+
+        # Apply
+        result = self.checker.check([target])[0]
+
+        # Assert
+        self.assertTrue(result.anonymous)
+        self.assertIsNone(result.error)
+        self.assertEqual("220-vsFTPd 3.0.3\n220 ready", result.banner)
+        self.assertIn("secret.txt", result.listing)
+
+    def test_check_refused_login(self):
+        # Arrange
+        target = self._server(anonymous=False)
+
+        # Apply
+        result = self.checker.check([target])[0]
+
+        # Assert
+        self.assertFalse(result.anonymous)
+        self.assertIsNone(result.error)
+        self.assertIsNone(result.listing)
+        self.assertIn("FtpServerMock", result.banner)
+
+    def test_check_silent_server_hits_read_deadline(self):
+        # Arrange
+        target = self._server(silent=True)
+
+        # Apply
+        start = time.time()
+        result = self.checker.check([target])[0]
+
+        # Assert
+        self.assertLess(time.time() - start, 3)
+        self.assertFalse(result.anonymous)
+        self.assertIn("TimeoutError", result.error)
+
+    def test_check_closed_port(self):
+        # Apply
+        result = self.checker.check([self._closed_port()])[0]
+
+        # Assert
+        self.assertFalse(result.anonymous)
+        self.assertIn("ConnectionRefusedError", result.error)
+
+    def test_check_many_targets_at_once_in_order(self):
+        # Arrange
+        targets = [self._server(silent=True) for _ in range(5)] + [self._server(), self._closed_port()]
+
+        # Apply
+        start = time.time()
+        results = self.checker.check(targets)
+
+        # Assert
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual(targets, [(r.host, r.port) for r in results])
+        self.assertEqual([False] * 5 + [True, False], [r.anonymous for r in results])
+
+    def test_save_writes_only_positive_results(self):
+        # Arrange
+        directory = tempfile.mkdtemp()
+        allowed, refused = self.checker.check([self._server(), self._server(anonymous=False)])
+
+        # Apply
+        try:
+            path = self.checker.save(allowed, directory)
+            skipped = self.checker.save(refused, directory)
+            with open(path) as f:
+                content = f.read()
+        finally:
+            shutil.rmtree(directory)
+
+        # Assert
+        self.assertIsNone(skipped)
+        self.assertEqual(AnonymousFtpChecker.RESULT_FILE, os.path.basename(path))
+        self.assertIn("Anonymous FTP login allowed on 127.0.0.1:{}".format(allowed.port), content)
+        self.assertIn("secret.txt", content)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""This module defines the FtpServerMock
+class, a local stand-in FTP server used for
+testing the AnonymousFtpChecker
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import socket
+import socketserver
+import threading
+
+
+class FtpHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough FTP for an
+    anonymous login and a root listing"""
+
+    def handle(self):
+        server = self.server
+        if server.silent:
+            server.release.wait(10)
+            return
+        self._send("220-{}\r\n220 ready".format(server.banner))
+        for raw in self.rfile:
+            command, _, argument = raw.decode("latin-1").strip().partition(" ")
+            command = command.upper()
+            if command == "USER":
+                self._send("331 password required")
+            elif command == "PASS":
+                self._send("230 logged in" if server.anonymous else "530 login incorrect")
+            elif command == "PASV":
+                self._pasv()
+            elif command == "LIST":
+                self._list()
+            elif command == "QUIT":
+                self._send("221 bye")
+                return
+            else:
+                self._send("502 not implemented")
+
+    def _pasv(self):
+        self._data = socket.socket()
+        self._data.bind(("127.0.0.1", 0))
+        self._data.listen(1)
+        port = self._data.getsockname()[1]
+        # Advertises an unroutable address, the client must ignore it
+        self._send("227 Entering Passive Mode (10,255,255,1,{},{})".format(port // 256, port % 256))
+
+    def _list(self):
+        connection, _ = self._data.accept()
+        self._send("150 listing")
+        connection.sendall(self.server.listing.encode())
+        connection.close()
+        self._data.close()
+        self._send("226 done")
+
+    def _send(self, reply):
+        self.wfile.write((reply + "\r\n").encode("latin-1"))
+
+
+class FtpServerMock(socketserver.ThreadingTCPServer):
+    """FtpServerMock listens on a free
+    loopback port in a background thread.
+    A silent server accepts connections but
+    never sends its banner"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, anonymous=True, silent=False, banner="FtpServerMock 1.0",
+                 listing="-rw-r--r-- 1 ftp ftp 12 Jan 01 00:00 secret.txt\r\n"):
+        socketserver.ThreadingTCPServer.__init__(self, ("127.0.0.1", 0), FtpHandler)
+        self.anonymous = anonymous
+        self.silent = silent
+        self.banner = banner
+        self.listing = listing
+        self.release = threading.Event()
+        self.port = self.server_address[1]
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+    def close(self):
+        self.release.set()
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,127 @@
+"""This module provides the testing class for
+ShardedHydra
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase, main
+
+from lib.hydra.ShardedHydra import ShardedHydra, Credential
+from lib.journal.CheckpointJournal import CheckpointJournal
+from lib.wordlist.Wordlist import Wordlist
+
+from tests.lib.scheduler.SchedulerMock import SchedulerMock
+
+
+FOUND_LINE = "[21][ftp] host: 10.0.0.1   login: admin   password: {}"
+
+
+class ShardedHydraTest(TestCase):
+    """Utilized for unit testing the
+    ShardedHydra class"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.shard_words = []
+        self.scheduler = SchedulerMock(self._hydra)
+        self.valid = "s3cret"
+        ShardedHydra.MIN_SHARD_SIZE = 10
+
+    def tearDown(self):
+        ShardedHydra.MIN_SHARD_SIZE = 500
+        shutil.rmtree(self.directory)
+        del self.scheduler
+
+    def _hydra(self, job):
+        """Stands in for hydra, finding the
+        valid password if its shard holds it
+        """
+        args = list(job.args)
+        with open(args[args.index("-P") + 1]) as f:
+            words = f.read().split()
+        self.shard_words.append(words)
+        if self.valid in words:
+            line = FOUND_LINE.format(self.valid)
+            with open(args[args.index("-o") + 1], "w") as f:
+                f.write("# Hydra v9.5 run\n" + line + "\n")
+            for parser in job.parsers:
+                parser(line + "\n")
+        return 0
+
+    def _passwords(self, count):
+        return Wordlist(words=["pw{}".format(i) for i in range(count)])
+
+    def test_run_splits_passwords_into_shards(self):
+        # Arrange
+        hydra = ShardedHydra(self.scheduler, shards=4)
+
+        # Apply
+        credentials = hydra.run("10.0.0.1", "ftp", Wordlist(words=["admin"]), self._passwords(25), self.directory)
+
+        # Assert
+        self.assertEqual([], credentials)
+        self.assertEqual(3, len(self.scheduler.jobs))
+        self.assertEqual(25, sum(len(words) for words in self.shard_words))
+        self.assertEqual("ftp://10.0.0.1", self.scheduler.jobs[0].args[-1])
+        self.assertIn("-f", self.scheduler.jobs[0].args)
+
+    def test_run_stops_other_shards_at_first_credential(self):
+        # Arrange
+        hydra = ShardedHydra(self.scheduler, shards=4)
+        self.valid = "pw0"
+
+        # Apply
+        credentials = hydra.run("10.0.0.1", "ftp", Wordlist(words=["admin"]), self._passwords(40), self.directory)
+
+        # Assert
+        self.assertEqual([Credential("10.0.0.1", 21, "ftp", "admin", "pw0")], credentials)
+        self.assertEqual(3, len(self.scheduler.stopped))
+
+    def test_run_merges_into_accounts_file_and_cleans_up(self):
+        # Arrange
+        hydra = ShardedHydra(self.scheduler, shards=2)
+        self.valid = "pw7"
+
+        # Apply
+        hydra.run("10.0.0.1", "ftp", Wordlist(words=["admin", "admin"]), self._passwords(20), self.directory)
+
+        # Assert
+        self.assertEqual(["ftp_accounts.txt"], os.listdir(self.directory))
+        with open(os.path.join(self.directory, "ftp_accounts.txt")) as f:
+            self.assertEqual(["# hydra ftp://10.0.0.1, 2 shard(s)", FOUND_LINE.format("pw7")], f.read().splitlines())
+
+    def test_run_failure_raises_when_nothing_found(self):
+        # Arrange
+        self.scheduler.handler = lambda job: 255
+        hydra = ShardedHydra(self.scheduler)
+
+        # Apply + Assert
+        self.assertRaises(OSError, hydra.run, "10.0.0.1", "ftp", Wordlist(words=["a"]), self._passwords(3), self.directory)
+
+    def test_run_skips_attack_complete_in_journal(self):
+        # Arrange
+        journal = CheckpointJournal(self.directory)
+        self.valid = "pw1"
+        ShardedHydra(self.scheduler, journal=journal).run("10.0.0.1", "ftp", Wordlist(words=["admin"]),
+                                                          self._passwords(3), self.directory)
+        self.scheduler.jobs = []
+
+        # Apply
+        credentials = ShardedHydra(self.scheduler, journal=journal).run("10.0.0.1", "ftp", Wordlist(words=["admin"]),
+                                                                        self._passwords(3), self.directory)
+
+        # Assert
+        self.assertEqual([], self.scheduler.jobs)
+        self.assertEqual("pw1", credentials[0].password)
+
+    def test_invalid_shards(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, ShardedHydra, self.scheduler, shards=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""This module provides the testing class
+for CheckpointJournal
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import Future
+
+from lib.journal.CheckpointJournal import CheckpointJournal
+
+
+class CheckpointJournalTest(unittest.TestCase):
+    """Utilized for unit testing the
+    CheckpointJournal class"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.output = os.path.join(self.directory, "nikto_80.txt")
+        self._write(self.output, "finding\n")
+        self.journal = CheckpointJournal(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, path, content):
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_unknown_stage_is_not_complete(self):
+        # Apply + Assert
+        self.assertFalse(self.journal.is_complete("nikto_80"))
+        self.assertFalse(CheckpointJournal.exists(self.directory))
+
+    def test_started_stage_is_not_complete(self):
+        # Apply
+        self.journal.start("nikto_80")
+
+        # Assert
+        self.assertFalse(CheckpointJournal(self.directory).is_complete("nikto_80"))
+        self.assertTrue(CheckpointJournal.exists(self.directory))
+
+    def test_completed_stage_survives_reload(self):
+        # Arrange
+        self.journal.start("nikto_80")
+        self.journal.complete("nikto_80", [self.output])
+
+        # Apply + Assert
+        self.assertTrue(CheckpointJournal(self.directory).is_complete("nikto_80"))
+
+    def test_changed_output_is_not_complete(self):
+        # Arrange
+        self.journal.complete("nikto_80", [self.output])
+
+        # Apply
+        self._write(self.output, "something else\n")
+
+        # Assert
+        self.assertFalse(CheckpointJournal(self.directory).is_complete("nikto_80"))
+
+    def test_removed_output_is_not_complete(self):
+        # Arrange
+        self.journal.complete("nikto_80", [self.output])
+
+        # Apply
+        os.remove(self.output)
+
+        # Assert
+        self.assertFalse(CheckpointJournal(self.directory).is_complete("nikto_80"))
+
+    def test_failure_after_completion_is_not_complete(self):
+        # Arrange
+        self.journal.complete("nikto_80", [self.output])
+
+        # Apply
+        self.journal.fail("nikto_80", "exit code 1")
+
+        # Assert
+        self.assertFalse(CheckpointJournal(self.directory).is_complete("nikto_80"))
+
+    def test_partial_last_line_is_ignored(self):
+        # Arrange
+        self.journal.complete("dirb_80", [])
+        with open(self.journal.path, "a") as f:
+            f.write('{"stage": "nikto_80", "sta')
+
+        # Apply
+        journal = CheckpointJournal(self.directory)
+        journal.complete("nikto_80", [self.output])
+
+        # Assert
+        reloaded = CheckpointJournal(self.directory)
+        self.assertTrue(reloaded.is_complete("dirb_80"))
+        self.assertTrue(reloaded.is_complete("nikto_80"))
+
+    def test_track_records_exit_code(self):
+        # Arrange
+        succeeded, failed = Future(), Future()
+        self.journal.track("nikto_80", succeeded, [self.output])
+        self.journal.track("dirb_80", failed)
+
+        # Apply
+        succeeded.set_result(0)
+        failed.set_result(255)
+
+        # Assert
+        self.assertTrue(self.journal.is_complete("nikto_80"))
+        self.assertFalse(self.journal.is_complete("dirb_80"))
+
+
+if __name__ == "__main__":
+    unittest.main()
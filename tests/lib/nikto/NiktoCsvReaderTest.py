@@ -0,0 +1,92 @@
+"""This module provides the testing class
+for NiktoCsvReader
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from lib.nikto.NiktoCsvReader import NiktoCsvReader, NiktoFinding
+
+
+REPORT_HEADER = '"Nikto - v2.1.6/2.1.5"\n'
+DIRECTORY_INDEXING = '"10.0.0.1","10.0.0.1","80","OSVDB-3268","GET","/icons/","/icons/: Directory indexing found."\n'
+NO_OSVDB = '"10.0.0.1","10.0.0.1","80","0","GET","/","The X-XSS-Protection header is not defined."\n'
+
+
+class NiktoCsvReaderTest(unittest.TestCase):
+    """Utilized for unit testing the
+    NiktoCsvReader class"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "nikto_80.csv")
+        self.poll_interval = NiktoCsvReader.POLL_INTERVAL
+        NiktoCsvReader.POLL_INTERVAL = 0.01
+
+    def tearDown(self):
+        NiktoCsvReader.POLL_INTERVAL = self.poll_interval
+        shutil.rmtree(self.directory)
+
+    def _write(self, content, mode="w"):
+        with open(self.path, mode) as f:
+            f.write(content)
+
+    def test_findings_parsed(self):
+        # Arrange
+        self._write(REPORT_HEADER + DIRECTORY_INDEXING + NO_OSVDB)
+
+        # Apply
+        findings = list(NiktoCsvReader(self.path))
+
+        # Assert
+        self.assertEqual([NiktoFinding("10.0.0.1", "10.0.0.1", 80, 3268, "GET", "/icons/",
+                                       "/icons/: Directory indexing found."),
+                          NiktoFinding("10.0.0.1", "10.0.0.1", 80, None, "GET", "/",
+                                       "The X-XSS-Protection header is not defined.")], findings)
+
+    def test_missing_report_has_no_findings(self):
+        # Apply + Assert
+        self.assertEqual([], list(NiktoCsvReader(self.path)))
+
+    def test_follow_waits_for_complete_lines(self):
+        # Arrange
+        self._write(REPORT_HEADER + DIRECTORY_INDEXING + NO_OSVDB[:20])
+        writing = threading.Event()
+        writing.set()
+
+        # Apply
+        findings = []
+        for finding in NiktoCsvReader(self.path, follow=writing.is_set):
+            findings.append(finding)
+            if len(findings) == 1:
+                self._write(NO_OSVDB[20:], "a")
+                writing.clear()
+
+        # Assert
+        self.assertEqual(2, len(findings))
+        self.assertEqual("/", findings[1].uri)
+
+
+    def test_follow_keeps_last_line_left_unended(self):
+        # Arrange
+        self._write(REPORT_HEADER + NO_OSVDB.rstrip("\n"))
+        calls = []
+
+        def writing():
+            calls.append(None)
+            return len(calls) <= 2 # Stops once the unended line has been read
+
+        # Apply
+        findings = list(NiktoCsvReader(self.path, follow=writing))
+
+        # Assert
+        self.assertEqual(["/"], [finding.uri for finding in findings])
+
+if __name__ == "__main__":
+    unittest.main()
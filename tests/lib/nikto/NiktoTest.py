@@ -6,6 +6,9 @@ the Nikto class
 @contact: cjmcgraw(- at -)u.washington.edu
 @version: 1.x
 """
+import os
+import tempfile
+import threading
 import unittest
 
 from lib.nikto.Nikto import Nikto, REQUIRED_NIKTO_VERSION
@@ -13,6 +16,7 @@ from lib.nikto.Nikto import Nikto, REQUIRED_NIKTO_VERSION
 from tests.lib.adapter.OSPathAdapterMock import OSPathAdapterMock
 from tests.lib.adapter.ProcessAdapterMock import ProcessAdapterMock
 from tests.lib.adapter.PopenMock import PopenMock
+from tests.lib.tools.CapabilityCacheMock import CapabilityCacheMock
 
 
 class NiktoTest(unittest.TestCase):
@@ -76,9 +80,29 @@ class NiktoTest(unittest.TestCase):
         # Apply + Assert
         self.assertRaises(OSError, Nikto, process_adapter=self.process_adapter)
 
+    def test_nikto_verified_through_capability_cache_only_probes_once(self):
+        # Arrange
+        cache = CapabilityCacheMock()
+
+        # Apply
+        Nikto(process_adapter=self.process_adapter, capability_cache=cache)
+        nikto = Nikto(process_adapter=self.process_adapter, capability_cache=cache)
+
+        # Assert
+        self.assertEqual(1, cache.probes)
+        self.assertEqual((99, 99, 99), nikto.version_data["nikto main"])
+
+    def test_nikto_verified_through_capability_cache_lower_version(self):
+        # Arrange
+        cache = CapabilityCacheMock()
+        cache.entries[Nikto.NIKTO_COMMAND] = {"nikto main": [1, 1, 1]}
+
+        # Apply + Assert
+        self.assertRaises(OSError, Nikto, process_adapter=self.process_adapter, capability_cache=cache)
+
     def _set_version_value(self, *args):
         # Arrange
-        version = [""] * 5 + ["nikto main   {}.{}.{}".format(*args)]
+        version = [b""] * 5 + ["nikto main   {}.{}.{}".format(*args).encode()]
         self.process_adapter.POPEN_VERSION.stdout = version
 
     def test_scan_command_is_correctly_passed_to_process_adapter__command_matches(self):
@@ -135,6 +159,59 @@ class NiktoTest(unittest.TestCase):
         # Assert
         self.assertEquals(hash(popen), hash(process))
 
+    def test_scan_findings_asks_for_csv_report(self):
+        # Arrange
+        output = tempfile.mktemp()
+        with open(output, "w") as f:
+            f.write('"10.0.0.1","10.0.0.1","443","OSVDB-3092","GET","/admin/","/admin/: This might be interesting."\n')
+        self.nikto.set_output(output)
+
+        # Apply
+        try:
+            findings = list(self.nikto.scan_findings("10.0.0.1"))
+        finally:
+            os.remove(output)
+
+        # Assert
+        self.assertEqual({"host": "10.0.0.1", "output": output, "Format": "csv"}, self.process_adapter.flags)
+        self.assertEqual([(443, 3092, "/admin/")], [(f.port, f.osvdb, f.uri) for f in findings])
+
+    def test_scan_findings_without_output_leaves_no_report(self):
+        # Apply
+        findings = list(self.nikto.scan_findings("10.0.0.1"))
+
+        # Assert
+        self.assertEqual([], findings)
+        self.assertFalse(os.path.exists(self.process_adapter.flags["output"]))
+
+    def test_scan_findings_closed_early_stops_nikto(self):
+        # Arrange
+        stopped = threading.Event()
+
+        class RunningPopen(PopenMock):
+            def terminate(self):
+                PopenMock.terminate(self)
+                stopped.set()
+
+        self.process_adapter.return_data = RunningPopen()
+        self.process_adapter.return_data.stdout = (line for line in [b""] if not stopped.wait(5))
+        output = tempfile.mktemp()
+        with open(output, "w") as f:
+            f.write('"10.0.0.1","10.0.0.1","80","OSVDB-3092","GET","/admin/","/admin/: This might be interesting."\n')
+        self.nikto.set_output(output)
+
+        # Apply
+        try:
+            findings = self.nikto.scan_findings("10.0.0.1")
+            first = next(findings)
+            findings.close()
+        finally:
+            os.remove(output)
+
+        # Assert
+        self.assertEqual("/admin/", first.uri)
+        self.assertTrue(self.process_adapter.return_data.terminated)
+
     def test_set_output_valid_output(self):
         # Apply
         self.nikto.set_output("some output file")
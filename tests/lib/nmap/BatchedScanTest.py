@@ -0,0 +1,222 @@
+"""This module provides the testing class
+for BatchedScan
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import ThreadPoolExecutor
+
+from lib.journal.CheckpointJournal import CheckpointJournal
+from lib.nmap.BatchedScan import BatchedScan
+from lib.nmap.ShardedScan import ShardedScan
+
+from tests.lib.nmap.NmapXmlSamples import nmap_xml
+from tests.lib.scheduler.SchedulerMock import SchedulerMock
+
+
+class BatchedScanTest(unittest.TestCase):
+    """Utilized for unit testing the
+    BatchedScan class"""
+    OPEN_PORTS = {"10.0.0.1": [22, 80], "10.0.0.2": [445], "10.0.0.3": []}
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.scheduler = SchedulerMock(self._fake_nmap)
+        self.returncode = 0
+        BatchedScan.LINGER = 0.05
+
+    def tearDown(self):
+        BatchedScan.LINGER = 1.0
+        shutil.rmtree(self.directory)
+
+    def _fake_nmap(self, job):
+        """Writes every host's open ports that
+        fall in the requested range to the -oX
+        file, and reports them on stdout"""
+        args = list(job.args)
+        ports = args[args.index("-p") + 1]
+        hosts = args[args.index("-oX") + 2:] if "-A" not in args else [args[-1]]
+        if "-A" in args:
+            wanted = [int(p) for p in ports.split(",")]
+        else:
+            first, last = map(int, ports.split("-"))
+            wanted = range(first, last + 1)
+        found = dict((host, [(p, "open") for p in self.OPEN_PORTS[host] if p in wanted]) for host in hosts)
+        with open(args[args.index("-oX") + 1], "w") as f:
+            f.write(nmap_xml(found))
+        for host, ports in found.items():
+            for port, _ in ports:
+                for parser in job.parsers:
+                    parser("Discovered open port {}/tcp on {}".format(port, host))
+        return self.returncode
+
+    def _host_directory(self, host):
+        path = os.path.join(self.directory, host)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _scan_all(self, scan, hosts, parsers=None):
+        with ThreadPoolExecutor(max_workers=len(hosts)) as pool:
+            futures = dict((host, pool.submit(scan.scan, host, self._host_directory(host),
+                                              (parsers or {}).get(host))) for host in hosts)
+        return dict((host, future.result()) for host, future in futures.items())
+
+    def _scan_journaled(self, scan, journals):
+        with ThreadPoolExecutor(max_workers=len(journals)) as pool:
+            futures = dict((host, pool.submit(scan.scan, host, self._host_directory(host), journal=journal))
+                           for host, journal in journals.items())
+        return dict((host, future.result()) for host, future in futures.items())
+
+    def _discovery_jobs(self):
+        return [job for job in self.scheduler.jobs if "-A" not in job.args]
+
+    def test_scan_batches_hosts_into_one_nmap_per_shard(self):
+        # Arrange
+        scan = BatchedScan(self.scheduler, shards=2, batch_size=3, work_directory=self.directory)
+
+        # Apply
+        ports = self._scan_all(scan, ["10.0.0.1", "10.0.0.2", "10.0.0.3"])
+
+        # Assert
+        self.assertEqual({"10.0.0.1": [22, 80], "10.0.0.2": [445], "10.0.0.3": []}, ports)
+        self.assertEqual(2, len(self._discovery_jobs()))
+        self.assertEqual(["10.0.0.1", "10.0.0.2", "10.0.0.3"], sorted(self._discovery_jobs()[0].args[-3:]))
+        self.assertEqual(2, len([job for job in self.scheduler.jobs if "-A" in job.args]))
+
+    def test_scan_splits_results_per_host(self):
+        # Arrange
+        scan = BatchedScan(self.scheduler, shards=1, batch_size=2, work_directory=self.directory)
+
+        # Apply
+        self._scan_all(scan, ["10.0.0.1", "10.0.0.2"])
+
+        # Assert
+        for host in ("10.0.0.1", "10.0.0.2"):
+            ports_file = os.path.join(self.directory, host, ShardedScan.PORTS_FILE)
+            self.assertEqual(self.OPEN_PORTS[host], ShardedScan.open_ports(ports_file))
+            self.assertEqual(1, len(ElementTree.parse(ports_file).getroot().findall("host")))
+        self.assertEqual(["10.0.0.1", "10.0.0.2"], sorted(os.listdir(self.directory)))
+
+    def test_scan_routes_discovered_ports_to_their_host(self):
+        # Arrange
+        scan = BatchedScan(self.scheduler, shards=1, batch_size=2, work_directory=self.directory)
+        seen = {"10.0.0.1": [], "10.0.0.2": []}
+
+        # Apply
+        self._scan_all(scan, ["10.0.0.1", "10.0.0.2"],
+                       parsers=dict((host, [lines.append]) for host, lines in seen.items()))
+
+        # Assert
+        self.assertEqual(["Discovered open port 22/tcp on 10.0.0.1", "Discovered open port 80/tcp on 10.0.0.1"],
+                         seen["10.0.0.1"])
+        self.assertEqual(["Discovered open port 445/tcp on 10.0.0.2"], seen["10.0.0.2"])
+
+    def test_partial_batch_starts_after_linger(self):
+        # Arrange
+        scan = BatchedScan(self.scheduler, shards=1, batch_size=16, work_directory=self.directory)
+
+        # Apply
+        ports = self._scan_all(scan, ["10.0.0.1", "10.0.0.2"])
+
+        # Assert
+        self.assertEqual([445], ports["10.0.0.2"])
+        self.assertLessEqual(len(self._discovery_jobs()), 2)
+
+    def test_failed_batch_raises_for_every_host(self):
+        # Arrange
+        self.returncode = 1
+        scan = BatchedScan(self.scheduler, shards=1, batch_size=2, work_directory=self.directory)
+
+        # Apply + Assert
+        self.assertRaises(OSError, self._scan_all, scan, ["10.0.0.1", "10.0.0.2"])
+
+    def test_scan_skips_batch_for_journaled_ports(self):
+        # Arrange
+        directory = self._host_directory("10.0.0.1")
+        BatchedScan(self.scheduler, shards=1, batch_size=1).scan("10.0.0.1", directory,
+                                                                   journal=CheckpointJournal(directory))
+        self.scheduler.jobs = []
+
+        # Apply
+        ports = BatchedScan(self.scheduler, shards=1, batch_size=1).scan("10.0.0.1", directory,
+                                                                          journal=CheckpointJournal(directory))
+
+        # Assert
+        self.assertEqual([22, 80], ports)
+        self.assertEqual([], self.scheduler.jobs)
+
+    def test_batch_jobs_are_against_every_host(self):
+        # Arrange
+        scan = BatchedScan(self.scheduler, shards=1, batch_size=2, work_directory=self.directory)
+
+        # Apply
+        self._scan_all(scan, ["10.0.0.1", "10.0.0.2"])
+
+        # Assert
+        self.assertEqual(("10.0.0.1", "10.0.0.2"), tuple(sorted(self._discovery_jobs()[0].hosts)))
+
+    def test_scan_resumes_with_the_ranges_left(self):
+        # Arrange
+        directories = dict((host, self._host_directory(host)) for host in ("10.0.0.1", "10.0.0.2"))
+        handler = self.scheduler.handler
+        self.scheduler.handler = lambda job: 1 if "1-32768" not in job.args else handler(job)
+        journals = dict((host, CheckpointJournal(directory)) for host, directory in directories.items())
+        scan = BatchedScan(self.scheduler, shards=2, batch_size=2, work_directory=self.directory)
+        self.assertRaises(OSError, self._scan_journaled, scan, journals)
+        self.scheduler.handler = handler
+        self.scheduler.jobs = []
+
+        # Apply
+        journals = dict((host, CheckpointJournal(directory)) for host, directory in directories.items())
+        ports = self._scan_journaled(scan, journals)
+
+        # Assert
+        self.assertEqual({"10.0.0.1": [22, 80], "10.0.0.2": [445]}, ports)
+        self.assertEqual(["32769-65535"], [job.args[1] for job in self._discovery_jobs()])
+        self.assertEqual(["10.0.0.1", "10.0.0.2"], sorted(os.listdir(self.directory)))
+
+    def test_failed_batch_keeps_ranges_scanned(self):
+        # Arrange
+        handler = self.scheduler.handler
+        self.scheduler.handler = lambda job: handler(job) if "1-32768" in job.args else 143
+        scan = BatchedScan(self.scheduler, shards=2, batch_size=2, work_directory=self.directory)
+
+        # Apply
+        self.assertRaises(OSError, self._scan_all, scan, ["10.0.0.1", "10.0.0.2"])
+
+        # Assert
+        for host, ports in (("10.0.0.1", [22, 80]), ("10.0.0.2", [445])):
+            self.assertEqual(ports, ShardedScan.open_ports(os.path.join(self.directory, host, ShardedScan.PORTS_FILE)))
+
+    def test_split_writes_each_host_to_its_files(self):
+        # Arrange
+        batch_file = os.path.join(self.directory, "batch.xml")
+        with open(batch_file, "w") as f:
+            f.write(nmap_xml({"10.0.0.1": [(21, "open")], "10.0.0.2": [(80, "open")]}))
+        shard_files = {"10.0.0.1": [os.path.join(self.directory, "a.xml"), os.path.join(self.directory, "b.xml")],
+                       "10.0.0.2": [os.path.join(self.directory, "c.xml")],
+                       "10.0.0.3": [os.path.join(self.directory, "d.xml")]}
+
+        # Apply
+        BatchedScan.split(batch_file, shard_files)
+
+        # Assert
+        self.assertEqual([[21], [21], [80], []], [ShardedScan.open_ports(paths[i]) for paths, i in
+                                                  ((shard_files["10.0.0.1"], 0), (shard_files["10.0.0.1"], 1),
+                                                   (shard_files["10.0.0.2"], 0), (shard_files["10.0.0.3"], 0))])
+        self.assertEqual("nmap", ElementTree.parse(shard_files["10.0.0.3"][0]).getroot().get("scanner"))
+
+    def test_invalid_batch_size(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, BatchedScan, self.scheduler, batch_size=0)
+        self.assertRaises(ValueError, BatchedScan, self.scheduler, shards=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+"""This module provides the testing class
+for NmapXmlReader
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from lib.nmap.NmapXmlReader import NmapXmlReader, HostRecord, PortRecord
+
+from tests.lib.nmap.NmapXmlSamples import nmap_xml
+
+
+class NmapXmlReaderTest(unittest.TestCase):
+    """Utilized for unit testing the
+    NmapXmlReader class"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "scan.xml")
+        self.poll_interval = NmapXmlReader.POLL_INTERVAL
+        NmapXmlReader.POLL_INTERVAL = 0.01
+
+    def tearDown(self):
+        NmapXmlReader.POLL_INTERVAL = self.poll_interval
+        shutil.rmtree(self.directory)
+
+    def _write(self, content, mode="w"):
+        with open(self.path, mode) as f:
+            f.write(content)
+
+    def test_records_in_document_order(self):
+        # Arrange
+        self._write(nmap_xml({"10.0.0.1": [(21, "open", "ftp", "vsftpd", "2.3.4"), (80, "closed")],
+                              "10.0.0.2": [(445, "open", "microsoft-ds")]}))
+
+        # Apply
+        records = list(NmapXmlReader(self.path))
+
+        # Assert
+        self.assertEqual([PortRecord("10.0.0.1", "tcp", 21, "open", "ftp", "vsftpd", "2.3.4"),
+                          PortRecord("10.0.0.1", "tcp", 80, "closed", "", "", ""),
+                          HostRecord("10.0.0.1", "", "up"),
+                          PortRecord("10.0.0.2", "tcp", 445, "open", "microsoft-ds", "", ""),
+                          HostRecord("10.0.0.2", "", "up")], records)
+
+    def test_many_hosts(self):
+        # Arrange
+        self._write(nmap_xml(dict(("10.0.%d.%d" % (i // 250, i % 250), [(80, "open")]) for i in range(2000))))
+        reader = NmapXmlReader(self.path)
+
+        # Apply
+        hosts = sum(1 for record in reader if isinstance(record, HostRecord))
+
+        # Assert
+        self.assertEqual(2000, hosts)
+
+    def test_finished_children_of_root_are_dropped(self):
+        # Arrange
+        hosts = dict(("10.0.0.%d" % i, [(80, "open")]) for i in range(1, 201))
+        progress = '<hosthint><status state="up"/></hosthint><taskprogress task="Connect Scan" percent="50"/><host>'
+        self._write(nmap_xml(hosts).replace("<host>", progress))
+        roots = []
+
+        class Reader(NmapXmlReader):
+            def _records(self, parser, state):
+                roots.append(state)
+                return NmapXmlReader._records(self, parser, state)
+
+        # Apply
+        hosts = sum(1 for record in Reader(self.path) if isinstance(record, HostRecord))
+
+        # Assert
+        self.assertEqual(200, hosts)
+        self.assertEqual(0, len(roots[-1]["root"]))
+
+    def test_elements_yields_children_of_root_whole(self):
+        # Arrange
+        self._write(nmap_xml({"10.0.0.1": [(21, "open"), (80, "open")], "10.0.0.2": [(445, "open")]}))
+        reader = NmapXmlReader(self.path)
+
+        # Apply
+        elements = [(element.tag, len(element.findall("ports/port"))) for element in reader.elements()]
+
+        # Assert
+        self.assertEqual([("host", 2), ("host", 1), ("runstats", 0)], elements)
+        self.assertEqual({"scanner": "nmap", "args": "nmap"}, reader.root.attrib)
+        self.assertEqual(0, len(reader.root))
+
+    def test_elements_of_cut_off_file(self):
+        # Arrange
+        document = nmap_xml({"10.0.0.1": [(21, "open")], "10.0.0.2": [(80, "open")]})
+        self._write(document[:document.index("<host>", document.index("<host>") + 1) + 20])
+
+        # Apply
+        elements = [element.tag for element in NmapXmlReader(self.path).elements()]
+
+        # Assert
+        self.assertEqual(["host"], elements)
+
+    def test_follow_reads_while_file_grows(self):
+        # Arrange
+        document = nmap_xml({"10.0.0.1": [(21, "open")], "10.0.0.2": [(80, "open")]})
+        split = document.index("<host>", document.index("<host>") + 1)
+        self._write(document[:split])
+        writing = threading.Event()
+        writing.set()
+
+        # Apply
+        records = []
+        for record in NmapXmlReader(self.path, follow=writing.is_set):
+            records.append(record)
+            if record == HostRecord("10.0.0.1", "", "up"):
+                self.assertTrue(writing.is_set())
+                self._write(document[split:], "a")
+                writing.clear()
+
+        # Assert
+        self.assertEqual(4, len(records))
+        self.assertEqual(HostRecord("10.0.0.2", "", "up"), records[-1])
+
+    def test_follow_waits_for_file(self):
+        # Arrange
+        writing = threading.Event()
+        writing.set()
+
+        def writer():
+            self._write(nmap_xml({"10.0.0.1": [(445, "open")]}))
+            writing.clear()
+        threading.Timer(0.05, writer).start()
+
+        # Apply
+        records = list(NmapXmlReader(self.path, follow=writing.is_set))
+
+        # Assert
+        self.assertEqual(2, len(records))
+
+    def test_missing_file(self):
+        # Apply + Assert
+        self.assertRaises(IOError, list, NmapXmlReader(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
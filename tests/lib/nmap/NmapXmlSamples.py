@@ -0,0 +1,32 @@
+"""This package provides canned nmap
+XML output used for testing
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+
+PORT_XML = '<port protocol="tcp" portid="{port}"><state state="{state}" reason="syn-ack"/>' \
+           '<service name="{service}" product="{product}" version="{version}"/></port>'
+
+
+def nmap_xml(hosts):
+    """Builds an nmap XML document
+
+    @param hosts: dict of str address to a list
+    of (port, state) or (port, state, service,
+    product, version) tuples
+
+    @return str
+    """
+    body = []
+    for address, ports in hosts.items():
+        port_xml = []
+        for port in ports:
+            port, state, service, product, version = (tuple(port) + ("", "", ""))[:5]
+            port_xml.append(PORT_XML.format(port=port, state=state, service=service,
+                                            product=product, version=version))
+        body.append('<host><status state="up"/><address addr="{}" addrtype="ipv4"/>'
+                    '<hostnames/><ports>{}</ports></host>'.format(address, "".join(port_xml)))
+    return '<?xml version="1.0"?>\n<nmaprun scanner="nmap" args="nmap">' \
+           '{}<runstats><finished/></runstats></nmaprun>\n'.format("".join(body))
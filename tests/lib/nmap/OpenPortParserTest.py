@@ -0,0 +1,46 @@
+"""This module provides the testing class
+for OpenPortParser
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import unittest
+
+from lib.nmap.OpenPortParser import OpenPortParser
+
+
+class OpenPortParserTest(unittest.TestCase):
+    """Utilized for unit testing the
+    OpenPortParser class"""
+
+    def setUp(self):
+        self.found = []
+        self.parser = OpenPortParser(lambda *args: self.found.append(args))
+
+    def test_discovered_line(self):
+        # Apply
+        self.parser("Discovered open port 445/tcp on 10.0.0.7\n")
+
+        # Assert
+        self.assertEqual([("10.0.0.7", 445, "tcp")], self.found)
+
+    def test_discovered_line_with_hostname(self):
+        # Apply
+        self.parser("Discovered open port 80/tcp on scanme.example (10.0.0.9)\n")
+
+        # Assert
+        self.assertEqual([("10.0.0.9", 80, "tcp")], self.found)
+
+    def test_other_lines_ignored(self):
+        # Apply
+        for line in ("Starting Nmap 7.94\n", "Initiating SYN Stealth Scan at 12:00\n",
+                     "80/tcp open  http\n", "Completed SYN Stealth Scan at 12:01\n"):
+            self.parser(line)
+
+        # Assert
+        self.assertEqual([], self.found)
+
+
+if __name__ == "__main__":
+    unittest.main()
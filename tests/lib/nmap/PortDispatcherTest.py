@@ -0,0 +1,107 @@
+"""This module provides the testing class
+for PortDispatcher
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import threading
+import unittest
+from concurrent.futures import Future
+
+from lib.nmap.PortDispatcher import PortDispatcher
+
+
+class PortDispatcherTest(unittest.TestCase):
+    """Utilized for unit testing the
+    PortDispatcher class"""
+
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _handler(self, name):
+        def handler(host):
+            with self.lock:
+                self.calls.append((name, host))
+        return handler
+
+    def test_open_port_runs_every_handler(self):
+        # Arrange
+        dispatcher = PortDispatcher({80: [self._handler("dirb"), self._handler("nikto")]})
+
+        # Apply
+        dispatcher.open_port("10.0.0.1", 80)
+        dispatcher.wait()
+
+        # Assert
+        self.assertEqual([("dirb", "10.0.0.1"), ("nikto", "10.0.0.1")], sorted(self.calls))
+
+    def test_open_port_dispatched_once(self):
+        # Arrange
+        dispatcher = PortDispatcher({21: [self._handler("ftp")]})
+
+        # Apply
+        first = dispatcher.open_port("10.0.0.1", 21)
+        second = dispatcher.open_port("10.0.0.1", 21)
+        dispatcher.wait()
+
+        # Assert
+        self.assertEqual((True, False), (first, second))
+        self.assertEqual([("ftp", "10.0.0.1")], self.calls)
+
+    def test_open_port_without_handlers_is_recorded(self):
+        # Arrange
+        dispatcher = PortDispatcher({})
+
+        # Apply
+        dispatcher.open_port("10.0.0.1", 8080)
+        dispatcher.wait()
+
+        # Assert
+        self.assertEqual({("10.0.0.1", 8080, "tcp")}, dispatcher.dispatched())
+
+    def test_open_port_other_protocol_ignored(self):
+        # Arrange
+        dispatcher = PortDispatcher({21: [self._handler("ftp")]})
+
+        # Apply
+        dispatcher.open_port("10.0.0.1", 21, "udp")
+        dispatcher.wait()
+
+        # Assert
+        self.assertEqual([], self.calls)
+
+    def test_wait_waits_on_returned_futures(self):
+        # Arrange
+        job = Future()
+        dispatcher = PortDispatcher({139: [lambda host: job]})
+        dispatcher.open_port("10.0.0.1", 139)
+        threading.Timer(0.05, job.set_result, (0,)).start()
+
+        # Apply
+        errors = dispatcher.wait()
+
+        # Assert
+        self.assertTrue(job.done())
+        self.assertEqual([], errors)
+
+    def test_wait_collects_errors(self):
+        # Arrange
+        def failing(host):
+            raise IOError(host)
+        failed_job = Future()
+        failed_job.set_exception(OSError("exit 1"))
+        dispatcher = PortDispatcher({21: [failing], 80: [lambda host: [failed_job]]})
+
+        # Apply
+        dispatcher.open_port("10.0.0.1", 21)
+        dispatcher.open_port("10.0.0.1", 80)
+        errors = dispatcher.wait()
+
+        # Assert
+        self.assertEqual(2, len(errors))
+
+
+if __name__ == "__main__":
+    unittest.main()
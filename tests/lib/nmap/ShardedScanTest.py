@@ -0,0 +1,181 @@
+"""This module provides the testing class
+for ShardedScan
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+from lib.journal.CheckpointJournal import CheckpointJournal
+from lib.nmap.ShardedScan import ShardedScan
+from lib.scheduler.Job import Job
+
+from tests.lib.nmap.NmapXmlSamples import nmap_xml
+from tests.lib.scheduler.SchedulerMock import SchedulerMock
+
+
+class ShardedScanTest(unittest.TestCase):
+    """Utilized for unit testing the
+    ShardedScan class"""
+    OPEN_PORTS = [21, 80, 8080, 40000, 65535]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.scheduler = SchedulerMock(self._fake_nmap)
+        self.returncode = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _fake_nmap(self, job):
+        """Writes the open ports that fall in
+        the requested range to the -oX file"""
+        args = list(job.args)
+        ports = args[args.index("-p") + 1]
+        if "-A" in args:
+            wanted = [int(p) for p in ports.split(",")]
+        else:
+            first, last = map(int, ports.split("-"))
+            wanted = range(first, last + 1)
+        found = [(p, "open") for p in self.OPEN_PORTS if p in wanted]
+        with open(args[args.index("-oX") + 1], "w") as f:
+            f.write(nmap_xml({"10.0.0.1": found}))
+        return self.returncode
+
+    def test_port_ranges_cover_every_port_once(self):
+        for shards in (1, 3, 4, 7, 1000):
+            # Apply
+            ranges = ShardedScan(self.scheduler, shards=shards).port_ranges()
+
+            # Assert
+            self.assertEqual(shards, len(ranges))
+            self.assertEqual(1, ranges[0][0])
+            self.assertEqual(65535, ranges[-1][1])
+            for (_, last), (first, _) in zip(ranges, ranges[1:]):
+                self.assertEqual(last + 1, first)
+
+    def test_invalid_shards(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, ShardedScan, self.scheduler, shards=0)
+
+    def test_scan_finds_open_ports_across_shards(self):
+        # Apply
+        ports = ShardedScan(self.scheduler, shards=4).scan("10.0.0.1", self.directory)
+
+        # Assert
+        self.assertEqual(self.OPEN_PORTS, ports)
+        self.assertEqual(5, len(self.scheduler.jobs))
+
+    def test_scan_service_scan_only_open_ports(self):
+        # Apply
+        ShardedScan(self.scheduler, shards=4).scan("10.0.0.1", self.directory)
+
+        # Assert
+        service_args = list(self.scheduler.jobs[-1].args)
+        self.assertIn("-A", service_args)
+        self.assertEqual("21,80,8080,40000,65535", service_args[service_args.index("-p") + 1])
+
+    def test_scan_writes_merged_result_and_removes_shards(self):
+        # Apply
+        ShardedScan(self.scheduler, shards=4).scan("10.0.0.1", self.directory)
+
+        # Assert
+        self.assertEqual(sorted([ShardedScan.PORTS_FILE, ShardedScan.SERVICE_XML_FILE]),
+                         sorted(os.listdir(self.directory)))
+        ports_file = os.path.join(self.directory, ShardedScan.PORTS_FILE)
+        self.assertEqual(1, len(ElementTree.parse(ports_file).getroot().findall("host")))
+        self.assertEqual(self.OPEN_PORTS, ShardedScan.open_ports(ports_file))
+
+    def test_scan_without_open_ports_skips_service_scan(self):
+        # Arrange
+        self.OPEN_PORTS = []
+
+        # Apply
+        ports = ShardedScan(self.scheduler, shards=2).scan("10.0.0.1", self.directory)
+
+        # Assert
+        self.assertEqual([], ports)
+        self.assertEqual(2, len(self.scheduler.jobs))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, ShardedScan.SERVICE_TEXT_FILE)))
+
+    def test_scan_resumes_from_journal(self):
+        # Arrange
+        journal = CheckpointJournal(self.directory)
+        scan = ShardedScan(self.scheduler, shards=4, journal=journal)
+        first, last = scan.port_ranges()[0]
+        shard_file = os.path.join(self.directory, ".nmap_shard_{}-{}.xml".format(first, last))
+        self._fake_nmap(Job("nmap", args=("-p", "{}-{}".format(first, last), "-oX", shard_file)))
+        journal.complete(ShardedScan.SHARD_STAGE.format(first, last), [shard_file])
+
+        # Apply
+        ports = ShardedScan(self.scheduler, shards=4, journal=CheckpointJournal(self.directory)).scan("10.0.0.1", self.directory)
+
+        # Assert
+        self.assertEqual(self.OPEN_PORTS, ports)
+        self.assertEqual(4, len(self.scheduler.jobs))
+
+    def test_scan_completed_scan_is_not_run_again(self):
+        # Arrange
+        ShardedScan(self.scheduler, shards=4, journal=CheckpointJournal(self.directory)).scan("10.0.0.1", self.directory)
+        del self.scheduler.jobs[:]
+
+        # Apply
+        ports = ShardedScan(self.scheduler, shards=4, journal=CheckpointJournal(self.directory)).scan("10.0.0.1", self.directory)
+
+        # Assert
+        self.assertEqual(self.OPEN_PORTS, ports)
+        self.assertEqual([], self.scheduler.jobs)
+
+    def test_scan_failed_shard(self):
+        # Arrange
+        self.returncode = 1
+
+        # Apply + Assert
+        self.assertRaises(OSError, ShardedScan(self.scheduler, shards=2).scan, "10.0.0.1", self.directory)
+
+
+    def test_scan_stopped_keeps_ranges_scanned(self):
+        # Arrange
+        handler = self.scheduler.handler
+        self.scheduler.handler = lambda job: handler(job) if "1-32768" in job.args else 143
+        journal = CheckpointJournal(self.directory)
+
+        # Apply
+        self.assertRaises(OSError, ShardedScan(self.scheduler, shards=2, journal=journal).scan,
+                          "10.0.0.1", self.directory)
+
+        # Assert
+        self.assertEqual([21, 80, 8080], ShardedScan.open_ports(os.path.join(self.directory, ShardedScan.PORTS_FILE)))
+        self.assertFalse(CheckpointJournal(self.directory).is_complete(ShardedScan.PORTS_STAGE))
+
+    def test_merge_streams_hosts_and_adds_ports_of_cut_off_shards(self):
+        # Arrange
+        shard_files = [os.path.join(self.directory, name) for name in ("a.xml", "b.xml", "c.xml")]
+        with open(shard_files[0], "w") as f:
+            f.write(nmap_xml({"10.0.0.1": [(21, "open")], "10.0.0.2": [(22, "open")]}))
+        with open(shard_files[1], "w") as f:
+            f.write(nmap_xml({"10.0.0.1": [(80, "open")], "10.0.0.3": [(443, "open")]}))
+        document = nmap_xml({"10.0.0.2": [(8080, "open")], "10.0.0.1": [(9090, "open")]})
+        with open(shard_files[2], "w") as f:
+            f.write(document[:document.index("10.0.0.1")])
+        path = os.path.join(self.directory, ShardedScan.PORTS_FILE)
+
+        # Apply
+        ShardedScan.merge(shard_files, path)
+
+        # Assert
+        root = ElementTree.parse(path).getroot()
+        self.assertEqual(["host", "host", "host", "runstats"], [element.tag for element in root])
+        self.assertEqual([("10.0.0.1", ["21", "80"]), ("10.0.0.2", ["22", "8080"]), ("10.0.0.3", ["443"])],
+                         [(host.find("address").get("addr"), [port.get("portid") for port in host.iter("port")])
+                          for host in root.findall("host")])
+        self.assertEqual([21, 22, 80, 443, 8080], ShardedScan.open_ports(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
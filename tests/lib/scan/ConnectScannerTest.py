@@ -0,0 +1,101 @@
+"""This module provides the testing class for
+ConnectScanner
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import socket
+import time
+from unittest import TestCase, main
+
+from lib.scan.ConnectScanner import ConnectScanner
+
+
+class ConnectScannerTest(TestCase):
+    """Utilized for testing the ConnectScanner
+    class against loopback sockets"""
+
+    def setUp(self):
+        self.listeners = []
+
+    def tearDown(self):
+        for listener in self.listeners:
+            listener.close()
+
+    def _listening_port(self, backlog=16):
+        s = socket.socket()
+        s.bind(("127.0.0.1", 0))
+        s.listen(backlog)
+        self.listeners.append(s)
+        return s.getsockname()[1]
+
+    def _closed_port(self):
+        s = socket.socket()
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+        s.close()
+        return port
+
+    def test_scan_finds_open_ports(self):
+        # Arrange
+        open_ports = [self._listening_port(), self._listening_port()]
+        closed = self._closed_port()
+
+        # Apply
+        results = ConnectScanner().scan(["127.0.0.1"], open_ports + [closed])
+
+        # Assert
+        self.assertEqual({"127.0.0.1": set(open_ports)}, results)
+        self.assertIn(open_ports[0], results["127.0.0.1"])
+        self.assertNotIn(closed, results["127.0.0.1"])
+
+    def test_scan_reports_each_open_port_as_found(self):
+        # Arrange
+        found = []
+        port = self._listening_port()
+
+        # Apply
+        ConnectScanner(on_open=lambda *args: found.append(args)).scan(["127.0.0.1", "localhost"], [port])
+
+        # Assert
+        self.assertEqual(sorted([("127.0.0.1", port, "tcp"), ("localhost", port, "tcp")]), sorted(found))
+
+    def test_scan_times_out_unanswered_connections(self):
+        # Arrange
+        port = self._listening_port(backlog=0)
+        for _ in range(3): # Fills the accept queue so further SYNs go unanswered
+            s = socket.socket()
+            s.setblocking(False)
+            s.connect_ex(("127.0.0.1", port))
+            self.listeners.append(s)
+        time.sleep(0.05)
+
+        # Apply
+        start = time.time()
+        results = ConnectScanner(timeout=0.2).scan(["127.0.0.1"], [port])
+
+        # Assert
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual(set(), results["127.0.0.1"])
+
+    def test_scan_many_hosts_with_bounded_concurrency(self):
+        # Arrange
+        ports = [self._listening_port(backlog=64) for _ in range(3)]
+        hosts = ["127.0.0.{}".format(i) for i in range(1, 11)]
+
+        # Apply
+        results = ConnectScanner(concurrency=4).scan(hosts, ports)
+
+        # Assert
+        self.assertEqual(hosts, sorted(results, key=hosts.index))
+        self.assertEqual(set(ports), results["127.0.0.1"])
+
+    def test_invalid_arguments(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, ConnectScanner, concurrency=0)
+        self.assertRaises(ValueError, ConnectScanner, timeout=0)
+
+
+if __name__ == "__main__":
+    main()
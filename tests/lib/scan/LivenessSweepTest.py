@@ -0,0 +1,129 @@
+"""This module provides the testing class for
+LivenessSweep
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import socket
+import time
+from unittest import TestCase, main
+
+from lib.scan.LivenessSweep import LivenessSweep, Liveness
+
+
+class LivenessSweepTest(TestCase):
+    """Utilized for testing the LivenessSweep
+    class against listeners on loopback aliases,
+    every 127.0.0.0/8 address being local"""
+
+    def setUp(self):
+        self.sockets = []
+
+    def tearDown(self):
+        for s in self.sockets:
+            s.close()
+
+    def _listen(self, address, port=0, backlog=16):
+        s = socket.socket()
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        s.bind((address, port))
+        s.listen(backlog)
+        self.sockets.append(s)
+        return s.getsockname()[1]
+
+    def _unanswered(self, address):
+        """@return int: port whose accept queue
+        is full, so further SYNs go unanswered
+        """
+        port = self._listen(address, backlog=0)
+        for _ in range(3):
+            s = socket.socket()
+            s.setblocking(False)
+            s.connect_ex((address, port))
+            self.sockets.append(s)
+        time.sleep(0.05)
+        return port
+
+    def test_sweep_finds_listening_aliases(self):
+        # Arrange
+        port = self._listen("127.0.0.2")
+        self._listen("127.0.0.4", port)
+        sweep = LivenessSweep(ports=[port], timeout=0.5, icmp=False, refused_is_alive=False)
+
+        # Apply
+        results = sweep.sweep(["127.0.0.2", "127.0.0.3", "127.0.0.4"])
+
+        # Assert
+        self.assertEqual([Liveness("127.0.0.2", True, "tcp/{} open".format(port)),
+                          Liveness("127.0.0.3", False, None),
+                          Liveness("127.0.0.4", True, "tcp/{} open".format(port))], results)
+
+    def test_refused_connection_means_alive(self):
+        # Arrange
+        port = self._listen("127.0.0.2")
+        self.sockets.pop().close()
+
+        # Apply
+        results = LivenessSweep(ports=[port], timeout=0.5, icmp=False).sweep(["127.0.0.2"])
+
+        # Assert
+        self.assertEqual([Liveness("127.0.0.2", True, "tcp/{} refused".format(port))], results)
+
+    def test_silent_host_is_down_after_timeout(self):
+        # Arrange
+        port = self._unanswered("127.0.0.5")
+        sweep = LivenessSweep(ports=[port], timeout=0.2, icmp=False)
+
+        # Apply
+        start = time.time()
+        results = sweep.sweep(["127.0.0.5"])
+
+        # Assert
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual([Liveness("127.0.0.5", False, None)], results)
+
+    def test_first_answer_stops_further_probes(self):
+        # Arrange
+        open_port = self._listen("127.0.0.6")
+        silent = self._unanswered("127.0.0.6")
+        sweep = LivenessSweep(ports=[open_port, silent], concurrency=1, timeout=1.0, icmp=False)
+
+        # Apply
+        start = time.time()
+        results = sweep.sweep(["127.0.0.6"])
+
+        # Assert
+        self.assertLess(time.time() - start, 0.9)
+        self.assertTrue(results[0].alive)
+
+    def test_duplicate_hosts_are_probed_once(self):
+        # Arrange
+        port = self._listen("127.0.0.2")
+
+        # Apply
+        results = LivenessSweep(ports=[port], icmp=False).sweep(["127.0.0.2", "127.0.0.2"])
+
+        # Assert
+        self.assertEqual(1, len(results))
+
+    def test_icmp_echo_is_answered(self):
+        # Arrange
+        if not LivenessSweep.can_ping():
+            self.skipTest("ICMP sockets need privileges here")
+        sweep = LivenessSweep(ports=[], timeout=1.0, icmp=True)
+
+        # Apply
+        results = sweep.sweep(["127.0.0.7", "localhost"])
+
+        # Assert
+        self.assertEqual([Liveness("127.0.0.7", True, "icmp echo"), Liveness("localhost", False, None)], results)
+
+    def test_nothing_to_probe_with(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, LivenessSweep, ports=[], icmp=False)
+        self.assertRaises(ValueError, LivenessSweep, concurrency=0, icmp=False)
+
+
+if __name__ == "__main__":
+    main()
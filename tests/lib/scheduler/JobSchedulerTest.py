@@ -0,0 +1,333 @@
+"""This module provides the testing class
+for JobScheduler
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import io
+import os
+import tempfile
+import time
+import unittest
+
+from lib.scheduler.Job import Job
+from lib.scheduler.JobScheduler import JobScheduler, CPU_HEAVY, NETWORK_HEAVY
+from lib.scheduler.RateBudget import RateBudget
+from lib.scheduler.RuntimeHistory import RuntimeHistory
+from lib.scheduler.TimeBudget import TimeBudget
+from lib.accounting.ResourceLedger import ResourceLedger
+from lib.status.StatusView import StatusView, JobRecord
+
+from tests.lib.adapter.BlockingProcessAdapterMock import BlockingProcessAdapterMock
+
+
+class JobSchedulerTest(unittest.TestCase):
+    """Utilized for unit testing the
+    JobScheduler class"""
+
+    def setUp(self):
+        self.adapter = BlockingProcessAdapterMock(stdout="out", returncode=0)
+
+    def tearDown(self):
+        self.adapter.release_all()
+        del self.adapter
+
+    def _scheduler(self, **kwargs):
+        return JobScheduler(process_adapter=self.adapter, **kwargs)
+
+    def _settle(self):
+        time.sleep(0.05)
+
+    def test_submit_returns_exit_code(self):
+        # Arrange
+        scheduler = self._scheduler()
+        self.adapter.returncode = 7
+
+        # Apply
+        future = scheduler.submit(Job("nikto", flags={"host": "10.0.0.1"}))
+        self.adapter.wait_for_started(1)
+        self.adapter.release_all()
+
+        # Assert
+        self.assertEqual(7, future.result(timeout=5))
+        self.assertEqual(("nikto",), self.adapter.started[0].command)
+        self.assertEqual({"host": "10.0.0.1"}, self.adapter.started[0].flags)
+
+    def test_tool_limit_is_respected(self):
+        # Arrange
+        scheduler = self._scheduler(tool_limits={"nikto": (NETWORK_HEAVY, 2)})
+
+        # Apply
+        futures = [scheduler.submit(Job("nikto")) for _ in range(5)]
+        self.adapter.wait_for_started(2)
+        self._settle()
+
+        # Assert
+        self.assertEqual(2, len(self.adapter.started))
+        self.assertEqual(3, scheduler.pending())
+
+        self.adapter.release_all()
+        scheduler.wait()
+        self.assertEqual(2, self.adapter.peak_by_command["nikto"])
+        self.assertTrue(all(f.done() for f in futures))
+
+    def test_saturated_tool_does_not_block_other_tools(self):
+        # Arrange
+        scheduler = self._scheduler(tool_limits={"nmap": (CPU_HEAVY, 1)})
+
+        # Apply
+        scheduler.submit(Job("nmap"))
+        scheduler.submit(Job("nmap"))
+        scheduler.submit(Job("dirb"))
+
+        # Assert
+        self.assertTrue(self.adapter.wait_for_started(2))
+        self.assertEqual(["nmap", "dirb"], [p.command[0] for p in self.adapter.started])
+
+    def test_resource_class_limit_is_respected(self):
+        # Arrange
+        scheduler = self._scheduler(class_limits={NETWORK_HEAVY: 3})
+
+        # Apply
+        for tool in ("nikto", "dirb", "hydra", "enum4linux", "nmap"):
+            scheduler.submit(Job(tool))
+        self.adapter.wait_for_started(4)
+        self._settle()
+
+        # Assert
+        self.assertEqual(["dirb", "hydra", "nikto", "nmap"], sorted(p.command[0] for p in self.adapter.started))
+
+    def test_global_limit_is_respected(self):
+        # Arrange
+        scheduler = self._scheduler(max_children=3)
+
+        # Apply
+        for tool in ("nikto", "dirb", "hydra", "enum4linux", "nmap") * 2:
+            scheduler.submit(Job(tool))
+        self.adapter.wait_for_started(3)
+        self._settle()
+
+        # Assert
+        self.assertEqual(3, len(self.adapter.started))
+        self.adapter.release_all()
+        scheduler.wait()
+        self.assertEqual(3, self.adapter.peak)
+
+    def test_output_file_receives_stdout(self):
+        # Arrange
+        scheduler = self._scheduler()
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+
+        # Apply
+        future = scheduler.submit(Job("enum4linux", args=("10.0.0.1",), output_file=path))
+        self.adapter.wait_for_started(1)
+        self.adapter.release_all()
+        future.result(timeout=5)
+
+        # Assert
+        try:
+            with open(path) as f:
+                self.assertEqual("out", f.read())
+        finally:
+            os.remove(path)
+
+    def test_ledger_records_usage_by_tool_and_host(self):
+        # Arrange
+        ledger = ResourceLedger()
+        scheduler = self._scheduler(ledger=ledger)
+        self.adapter.returncode = 2
+
+        # Apply
+        future = scheduler.submit(Job("enum4linux", args=("10.0.0.1",), host="10.0.0.1"))
+        self.adapter.wait_for_started(1)
+        self.adapter.release_all()
+        future.result(timeout=5)
+        scheduler.wait()
+
+        # Assert
+        totals = ledger.by_tool("10.0.0.1")["enum4linux"]
+        self.assertEqual(1, totals["processes"])
+        self.assertEqual(1, totals["failures"])
+        self.assertEqual(len("out"), totals["stdout_bytes"])
+
+    def test_rate_budget_throttles_and_observes_jobs(self):
+        # Arrange
+        budget = RateBudget(10, cooldown=0)
+        scheduler = self._scheduler(rate_budget=budget)
+        self.adapter.stdout = "ERROR: Connection reset by peer"
+
+        # Apply
+        future = scheduler.submit(Job("dirb", args=("http://10.0.0.1",), host="10.0.0.1"))
+        self.adapter.wait_for_started(1)
+        self.adapter.release_all()
+        future.result(timeout=5)
+
+        # Assert
+        self.assertEqual(("dirb", "http://10.0.0.1", "-z", "400"), self.adapter.started[0].command)
+        self.assertEqual(5, budget.rate("10.0.0.1"))
+
+    def test_rate_budget_holds_jobs_back_until_a_slot_is_free(self):
+        # Arrange
+        budget = RateBudget(10, slots=1)
+        scheduler = self._scheduler(rate_budget=budget)
+
+        # Apply
+        futures = [scheduler.submit(Job("dirb", host="10.0.0.1")) for _ in range(2)]
+        other = scheduler.submit(Job("nikto", host="10.0.0.2"))
+        self.adapter.wait_for_started(2)
+        self._settle()
+        started = [p.command for p in self.adapter.started]
+        self.adapter.release_all()
+        self.adapter.wait_for_started(3)
+        self.adapter.release_all()
+        scheduler.wait()
+
+        # Assert
+        self.assertEqual([("dirb", "-z", "100"), ("nikto", "-Pause", "0.100")], started)
+        self.assertEqual(("dirb", "-z", "100"), self.adapter.started[2].command)
+        self.assertTrue(all(f.result(timeout=5) == 0 for f in futures + [other]))
+
+    def test_monitor_sees_output_and_exit_code(self):
+        # Arrange
+        view = StatusView(io.StringIO(), live=False, clock=lambda: 0)
+        scheduler = self._scheduler(monitor=view)
+        self.adapter.returncode = 3
+
+        # Apply
+        future = scheduler.submit(Job("nikto", host="10.0.0.1"))
+        self.adapter.wait_for_started(1)
+        running = view.summary()["running"]
+        self.adapter.release_all()
+        future.result(timeout=5)
+
+        # Assert
+        self.assertEqual(1, running)
+        self.assertEqual([JobRecord("nikto", "10.0.0.1", 3, None, 0, 1)], view.failed())
+
+    def test_stop_terminates_running_and_cancels_pending_jobs(self):
+        # Arrange
+        scheduler = self._scheduler(tool_limits={"hydra": (NETWORK_HEAVY, 1)})
+        running = scheduler.submit(Job("hydra"))
+        pending = scheduler.submit(Job("hydra"))
+        self.adapter.wait_for_started(1)
+
+        # Apply
+        stopped = [scheduler.stop(running), scheduler.stop(pending)]
+        scheduler.wait()
+
+        # Assert
+        self.assertEqual([True, True], stopped)
+        self.assertEqual(-15, running.result(timeout=5))
+        self.assertTrue(pending.cancelled())
+        self.assertEqual(1, len(self.adapter.started))
+        self.assertFalse(scheduler.stop(running))
+
+    def test_time_budget_starts_earlier_stages_first(self):
+        # Arrange
+        budget = TimeBudget(600, tool_stages={"nikto": "quick"})
+        scheduler = self._scheduler(max_children=1, time_budget=budget)
+        scheduler.submit(Job("hydra"))
+        self.adapter.wait_for_started(1)
+
+        # Apply
+        scheduler.submit(Job("nmap"))
+        scheduler.submit(Job("dirb"))
+        scheduler.submit(Job("nikto"))
+        scheduler.submit(Job("enum4linux"))
+        self.adapter.release_all()
+        scheduler.wait()
+
+        # Assert
+        self.assertEqual(["hydra", "nikto", "dirb", "enum4linux", "nmap"],
+                         [process.command[0] for process in self.adapter.started])
+
+    def test_time_budget_stops_jobs_at_their_timeout(self):
+        # Arrange
+        budget = TimeBudget(1.5)
+        scheduler = self._scheduler(time_budget=budget)
+
+        # Apply
+        start = time.time()
+        future = scheduler.submit(Job("nikto"))
+
+        # Assert
+        self.assertEqual(-15, future.result(timeout=5))
+        self.assertLess(time.time() - start, 1.4)
+
+    def test_time_budget_spent_fails_pending_jobs(self):
+        # Arrange
+        now = [0.0]
+        budget = TimeBudget(60, clock=lambda: now[0])
+        scheduler = self._scheduler(tool_limits={"hydra": (NETWORK_HEAVY, 1)}, time_budget=budget)
+        running = scheduler.submit(Job("hydra"))
+        pending = scheduler.submit(Job("hydra"))
+        self.adapter.wait_for_started(1)
+
+        # Apply
+        now[0] = 61.0
+        scheduler.stop(running)
+        scheduler.wait()
+
+        # Assert
+        self.assertRaises(TimeoutError, pending.result, timeout=5)
+        self.assertEqual(1, len(self.adapter.started))
+
+    def test_history_starts_shortest_expected_job_first(self):
+        # Arrange
+        history = RuntimeHistory(history_file=None, defaults={"nikto": 600.0, "dirb": 5.0, "enum4linux": 60.0})
+        scheduler = self._scheduler(max_children=1, history=history, aging=0.0)
+        scheduler.submit(Job("hydra"))
+        self.adapter.wait_for_started(1)
+
+        # Apply
+        for tool in ("nikto", "enum4linux", "dirb"):
+            scheduler.submit(Job(tool))
+        self.adapter.release_all()
+        scheduler.wait()
+
+        # Assert
+        self.assertEqual(["hydra", "dirb", "enum4linux", "nikto"],
+                         [process.command[0] for process in self.adapter.started])
+
+    def test_aging_starts_long_waiting_jobs(self):
+        # Arrange
+        history = RuntimeHistory(history_file=None, defaults={"nikto": 600.0, "dirb": 5.0})
+        scheduler = self._scheduler(max_children=1, history=history, aging=100000.0)
+        scheduler.submit(Job("hydra"))
+        self.adapter.wait_for_started(1)
+
+        # Apply
+        scheduler.submit(Job("nikto"))
+        self._settle()
+        scheduler.submit(Job("dirb"))
+        self.adapter.release_all()
+        scheduler.wait()
+
+        # Assert
+        self.assertEqual(["hydra", "nikto", "dirb"], [process.command[0] for process in self.adapter.started])
+
+    def test_history_records_successful_runs(self):
+        # Arrange
+        history = RuntimeHistory(history_file=None, defaults={"nikto": 600.0, "dirb": 600.0})
+        scheduler = self._scheduler(history=history)
+        self.adapter.release_all()
+
+        # Apply
+        scheduler.submit(Job("nikto", port=80)).result(timeout=5)
+        self.adapter.returncode = 1
+        scheduler.submit(Job("dirb", port=80)).result(timeout=5)
+
+        # Assert
+        self.assertLess(history.expected(Job("nikto", port=80)), 5)
+        self.assertEqual(600.0, history.expected(Job("dirb", port=80)))
+
+    def test_invalid_global_limit(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, JobScheduler, process_adapter=self.adapter, max_children=0)
+        self.assertRaises(ValueError, JobScheduler, process_adapter=self.adapter, aging=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
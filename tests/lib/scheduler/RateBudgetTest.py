@@ -0,0 +1,165 @@
+"""This module provides the testing class for
+RateBudget
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import threading
+import unittest
+
+from lib.scheduler.Job import Job
+from lib.scheduler.RateBudget import RateBudget
+
+
+class RateBudgetTest(unittest.TestCase):
+    """Utilized for unit testing the
+    RateBudget class"""
+
+    def setUp(self):
+        self.budget = RateBudget(40, floor=2, backoff=0.5, recovery=0.25, cooldown=0)
+
+    def tearDown(self):
+        del self.budget
+
+    def test_throttle_translates_rate_to_tool_options(self):
+        # Arrange
+        jobs = [Job("nmap", args=("10.0.0.1",), host="10.0.0.1"),
+                Job("nikto", args=("-host", "10.0.0.2"), host="10.0.0.2"),
+                Job("dirb", command="xterm", args=("-e", "dirb", "http://10.0.0.3"), host="10.0.0.3"),
+                Job("hydra", args=("ftp://10.0.0.4",), host="10.0.0.4")]
+
+        # Apply
+        throttled = [self.budget.throttle(job).args[-2:] for job in jobs]
+
+        # Assert
+        self.assertEqual([("--max-rate", "10"), ("-Pause", "0.100"), ("-z", "100"), ("-t", "10")], throttled)
+
+    def test_running_jobs_never_exceed_the_budget(self):
+        # Arrange
+        jobs = [self.budget.throttle(Job("dirb", host="10.0.0.1")) for _ in range(4)]
+
+        # Apply
+        full = self.budget.throttle(Job("dirb", host="10.0.0.1"))
+        self.budget.release(jobs.pop(0))
+        jobs.append(self.budget.throttle(Job("nikto", host="10.0.0.1")))
+
+        # Assert
+        self.assertIsNone(full)
+        self.assertEqual(40, sum(1000.0 / float(job.args[-1]) for job in jobs[:3]) + 1 / float(jobs[3].args[-1]))
+        self.assertEqual(40, self.budget.claimed("10.0.0.1"))
+
+    def test_throttle_after_backoff_shares_what_is_left(self):
+        # Arrange
+        first = self.budget.throttle(Job("nikto", host="10.0.0.1"))
+        self.budget.observer(first)("connection reset\n")
+
+        # Apply
+        later = [self.budget.throttle(Job("dirb", host="10.0.0.1")) for _ in range(3)]
+
+        # Assert
+        self.assertEqual(20, self.budget.rate("10.0.0.1"))
+        self.assertEqual([("-z", "300")] * 3, [job.args for job in later])
+        self.assertEqual(20, self.budget.claimed("10.0.0.1"))
+
+    def test_throttle_leaves_other_tools_and_hosts_alone(self):
+        # Arrange
+        job = Job("enum4linux", args=("10.0.0.1",), host="10.0.0.1")
+
+        # Apply + Assert
+        self.assertIs(job, self.budget.throttle(job))
+
+    def test_acquire_shares_budget_with_throttled_jobs(self):
+        # Arrange
+        throttled = self.budget.throttle(Job("nikto", host="10.0.0.1"))
+        job = Job("discovery", host="10.0.0.1")
+
+        # Apply
+        share = self.budget.acquire(job)
+        claimed = self.budget.claimed("10.0.0.1")
+        for released in (job, throttled):
+            self.budget.release(released)
+
+        # Assert
+        self.assertEqual(10, share)
+        self.assertEqual(20, claimed)
+        self.assertIsNone(self.budget.acquire(Job("discovery")))
+        self.assertEqual(0, self.budget.claimed("10.0.0.1"))
+
+    def test_acquire_waits_for_a_slot(self):
+        # Arrange
+        jobs = [self.budget.throttle(Job("dirb", host="10.0.0.1")) for _ in range(4)]
+        released = []
+        self.budget.add_listener(lambda: released.append(self.budget.claimed("10.0.0.1")))
+        waiter = threading.Thread(target=self.budget.acquire, args=(Job("discovery", host="10.0.0.1"),))
+        waiter.start()
+
+        # Apply
+        waiter.join(0.1)
+        waiting = waiter.is_alive()
+        self.budget.release(jobs[0])
+        waiter.join(5)
+
+        # Assert
+        self.assertTrue(waiting)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual([30], released)
+        self.assertEqual(40, self.budget.claimed("10.0.0.1"))
+
+    def test_throttle_gives_batch_a_share_of_each_host(self):
+        # Arrange
+        busy = [self.budget.throttle(Job("nmap", host="10.0.0.2")) for _ in range(3)]
+        batch = Job("nmap", host="10.0.0.1+2", hosts=["10.0.0.1", "10.0.0.2", "10.0.0.3"])
+
+        # Apply
+        throttled = self.budget.throttle(batch)
+        full = self.budget.throttle(Job("nmap", host="10.0.0.1+1", hosts=["10.0.0.1", "10.0.0.2"]))
+
+        # Assert
+        self.assertEqual(("--max-rate", "30"), throttled.args)
+        self.assertIsNone(full)
+        self.assertEqual([10, 40, 10], [self.budget.claimed(host) for host in ("10.0.0.1", "10.0.0.2", "10.0.0.3")])
+
+    def test_distress_backs_off_to_floor(self):
+        # Arrange
+        job = self.budget.throttle(Job("nikto", host="10.0.0.1"))
+        observe = self.budget.observer(job)
+
+        # Apply
+        observe("+ ERROR: Connection reset by peer\n")
+        rate = self.budget.rate("10.0.0.1")
+        for _ in range(10):
+            observe("ERROR: Read timed out\n")
+        observe("+ Server: Apache\n")
+
+        # Assert
+        self.assertEqual(20, rate)
+        self.assertEqual(2, self.budget.rate("10.0.0.1"))
+        self.assertEqual(40, self.budget.rate("10.0.0.2"))
+
+    def test_clean_jobs_recover_the_budget(self):
+        # Arrange
+        job = self.budget.throttle(Job("nikto", host="10.0.0.1"))
+        self.budget.observer(job)("connection reset\n")
+        self.budget.release(job)
+
+        # Apply
+        rates = []
+        for _ in range(3):
+            self.budget.release(self.budget.throttle(Job("nikto", host="10.0.0.1")))
+            rates.append(self.budget.rate("10.0.0.1"))
+
+        # Assert
+        self.assertEqual([30, 40, 40], rates)
+
+    def test_invalid_rates(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, RateBudget, 0)
+        self.assertRaises(ValueError, RateBudget, 10, floor=20)
+        self.assertRaises(ValueError, RateBudget, 10, backoff=1)
+        self.assertRaises(ValueError, RateBudget, 10, slots=0)
+        self.assertRaises(ValueError, RateBudget, float("nan"))
+
+
+if __name__ == "__main__":
+    unittest.main()
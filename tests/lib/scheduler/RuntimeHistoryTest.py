@@ -0,0 +1,88 @@
+"""This module provides the testing class
+for RuntimeHistory
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from lib.scheduler.Job import Job
+from lib.scheduler.RuntimeHistory import RuntimeHistory, UNKNOWN_EXPECTED
+
+
+class RuntimeHistoryTest(unittest.TestCase):
+    """Utilized for unit testing the
+    RuntimeHistory class"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "cache", "runtimes.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_unseen_tools_get_their_default(self):
+        # Arrange
+        history = RuntimeHistory(history_file=None, defaults={"nikto": 42.0})
+
+        # Apply + Assert
+        self.assertEqual(42.0, history.expected(Job("nikto", port=80)))
+        self.assertEqual(UNKNOWN_EXPECTED, history.expected(Job("whatweb")))
+
+    def test_most_specific_key_wins(self):
+        # Arrange
+        history = RuntimeHistory(history_file=None)
+
+        # Apply
+        history.record(Job("nikto", port=80, service="http"), 300.0)
+        history.record(Job("nikto", port=443, service="https"), 20.0)
+
+        # Assert
+        self.assertEqual(300.0, history.expected(Job("nikto", port=80, service="http")))
+        self.assertEqual(300.0, history.expected(Job("nikto", port=8080, service="http")))
+        self.assertEqual(20.0, history.expected(Job("nikto", port=443, service="https")))
+        self.assertEqual(300.0 + 0.3 * (20.0 - 300.0), history.expected(Job("nikto", port=8443)))
+        self.assertEqual(["nikto|http|80", "nikto|http|", "nikto||"],
+                         RuntimeHistory.keys(Job("nikto", port=80, service="http")))
+
+    def test_record_keeps_a_moving_average(self):
+        # Arrange
+        history = RuntimeHistory(history_file=None)
+
+        # Apply
+        for seconds in (10.0, 20.0, 20.0):
+            history.record(Job("dirb", port=80), seconds)
+
+        # Assert
+        self.assertAlmostEqual(10.0 + 0.3 * 10.0 + 0.3 * (20.0 - 13.0), history.expected(Job("dirb", port=80)))
+
+    def test_history_is_kept_between_runs(self):
+        # Arrange
+        RuntimeHistory(history_file=self.path).record(Job("enum4linux", port=445, service="smb"), 12.5)
+
+        # Apply
+        history = RuntimeHistory(history_file=self.path)
+
+        # Assert
+        self.assertEqual(12.5, history.expected(Job("enum4linux", port=445, service="smb")))
+        self.assertEqual(["runtimes.json"], os.listdir(os.path.dirname(self.path)))
+
+    def test_unreadable_history_is_empty(self):
+        # Arrange
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("{not json")
+
+        # Apply
+        history = RuntimeHistory(history_file=self.path, defaults={"hydra": 7.0})
+
+        # Assert
+        self.assertEqual(7.0, history.expected(Job("hydra")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""This package describes the
+SchedulerMock class used for
+testing code built on the JobScheduler
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+from concurrent.futures import Future
+
+
+class SchedulerMock(object):
+    """Runs every submitted job at once
+    through a handler and records it
+    """
+
+    def __init__(self, handler=None):
+        """Initializes the mock object
+
+        @keyword handler: callable taking the
+        Job and returning its exit code
+        """
+        self.jobs = []
+        self.stopped = []
+        self.handler = handler if handler else (lambda job: 0)
+
+    def submit(self, job):
+        """Records and runs the job
+
+        @return concurrent.futures.Future
+        """
+        self.jobs.append(job)
+        future = Future()
+        try:
+            future.set_result(self.handler(job))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def stop(self, future):
+        """Records the stop request
+
+        @return bool: if the job was still
+        running, never the case here
+        """
+        self.stopped.append(future)
+        return not future.done()
+
+    def wait(self):
+        """Every job is already finished"""
+        pass
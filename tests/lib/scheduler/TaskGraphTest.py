@@ -0,0 +1,141 @@
+"""This module provides the testing class for
+TaskGraph
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import threading
+from concurrent.futures import Future
+from unittest import TestCase, main
+
+from lib.scheduler.TaskGraph import TaskGraph, Task, Rule, TaskError
+
+
+class TaskGraphTest(TestCase):
+    """Utilized for unit testing the
+    TaskGraph class"""
+
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _tool(self, name, result=None, error=None, gate=None):
+        def function(host):
+            if gate is not None:
+                gate.wait(5)
+            with self.lock:
+                self.calls.append((name, host))
+            if error is not None:
+                raise error
+            return result
+        return function
+
+    def test_add_deduplicates_shared_service(self):
+        # Arrange
+        graph = TaskGraph({"smb": [Rule("enum4linux", self._tool("enum4linux", "done"), ())]})
+
+        # Apply
+        first = graph.add("10.0.0.1", "smb")
+        second = graph.add("10.0.0.1", "smb")
+        errors = graph.wait()
+
+        # Assert
+        self.assertEqual([], errors)
+        self.assertIs(first[0], second[0])
+        self.assertEqual("done", first[0].result())
+        self.assertEqual([("enum4linux", "10.0.0.1")], self.calls)
+
+    def test_add_runs_each_host_separately(self):
+        # Arrange
+        graph = TaskGraph({"http": [Rule("nikto", self._tool("nikto"), ())]})
+
+        # Apply
+        graph.add("10.0.0.1", "http")
+        graph.add("10.0.0.2", "http")
+        graph.wait()
+
+        # Assert
+        self.assertEqual([("nikto", "10.0.0.1"), ("nikto", "10.0.0.2")], sorted(self.calls))
+        self.assertEqual({Task("nikto", "10.0.0.1", "http"), Task("nikto", "10.0.0.2", "http")}, set(graph.tasks()))
+
+    def test_requirements_run_first(self):
+        # Arrange
+        gate = threading.Event()
+        graph = TaskGraph({"ftp": [Rule("hydra", self._tool("hydra"), ("ftp",)),
+                                   Rule("ftp", self._tool("ftp", gate=gate), ())]})
+
+        # Apply
+        graph.add("10.0.0.1", "ftp")
+        started_early = list(self.calls)
+        gate.set()
+        graph.wait()
+
+        # Assert
+        self.assertEqual([], started_early)
+        self.assertEqual([("ftp", "10.0.0.1"), ("hydra", "10.0.0.1")], self.calls)
+
+    def test_independent_tasks_run_in_parallel(self):
+        # Arrange
+        barrier = threading.Barrier(2, timeout=5)
+        graph = TaskGraph({"http": [Rule("dirb", lambda host: barrier.wait(), ()),
+                                    Rule("nikto", lambda host: barrier.wait(), ())]}, workers=2)
+
+        # Apply
+        graph.add("10.0.0.1", "http")
+        errors = graph.wait()
+
+        # Assert
+        self.assertEqual([], errors)
+
+    def test_task_finishes_with_returned_future(self):
+        # Arrange
+        job = Future()
+        graph = TaskGraph({"smb": [Rule("enum4linux", lambda host: job, ()),
+                                   Rule("report", self._tool("report"), ("enum4linux",))]})
+
+        # Apply
+        futures = graph.add("10.0.0.1", "smb")
+        waiting = list(self.calls)
+        job.set_result(0)
+        graph.wait()
+
+        # Assert
+        self.assertEqual([], waiting)
+        self.assertEqual(0, futures[0].result())
+        self.assertEqual([("report", "10.0.0.1")], self.calls)
+
+    def test_failed_requirement_skips_dependents(self):
+        # Arrange
+        graph = TaskGraph({"ftp": [Rule("ftp", self._tool("ftp", error=OSError("refused")), ()),
+                                   Rule("hydra", self._tool("hydra"), ("ftp",))]})
+
+        # Apply
+        graph.add("10.0.0.1", "ftp")
+        errors = graph.wait()
+
+        # Assert
+        self.assertEqual([OSError, TaskError], [type(error) for error in errors])
+        self.assertEqual([("ftp", "10.0.0.1")], self.calls)
+
+    def test_service_without_rules_is_ignored(self):
+        # Arrange
+        graph = TaskGraph({})
+
+        # Apply
+        futures = graph.add("10.0.0.1", "ssh")
+        graph.wait()
+
+        # Assert
+        self.assertEqual([], futures)
+
+    def test_invalid_rules(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, TaskGraph, {"ftp": [Rule("hydra", None, ("ftp",))]})
+        self.assertRaises(ValueError, TaskGraph, {"ftp": [Rule("a", None, ("b",)), Rule("b", None, ("a",))]})
+        self.assertRaises(ValueError, TaskGraph({}).task, "nikto", "10.0.0.1", "http")
+        self.assertRaises(ValueError, TaskGraph, {}, workers=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""This module provides the testing class
+for TimeBudget
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import unittest
+
+from lib.scheduler.Job import Job
+from lib.scheduler.TimeBudget import TimeBudget, QUICK, FOLLOW_UP, FULL, MIN_TIMEOUT
+
+
+class TimeBudgetTest(unittest.TestCase):
+    """Utilized for unit testing the
+    TimeBudget class"""
+
+    def setUp(self):
+        self.now = 100.0
+
+    def _clock(self):
+        return self.now
+
+    def _budget(self, seconds, **kwargs):
+        return TimeBudget(seconds, clock=self._clock, **kwargs)
+
+    def test_remaining_counts_down_to_zero(self):
+        # Arrange
+        budget = self._budget(60)
+
+        # Apply
+        self.now += 45
+        remaining = budget.remaining()
+        self.now += 30
+
+        # Assert
+        self.assertEqual(15, remaining)
+        self.assertEqual(0, budget.remaining())
+        self.assertTrue(budget.expired())
+
+    def test_stages_are_ordered_by_value(self):
+        # Arrange
+        budget = self._budget(60)
+
+        # Apply
+        priorities = [budget.priority(Job(tool)) for tool in ("nikto", "enum4linux", "nmap", "unknown")]
+
+        # Assert
+        self.assertEqual([1, 1, 2, 1], priorities)
+        self.assertEqual(FULL, budget.stage("nmap"))
+        self.assertEqual(FOLLOW_UP, budget.stage("unknown"))
+
+    def test_follow_up_timeout_is_split_across_waves(self):
+        # Arrange
+        budget = self._budget(1000, hosts=10, hosts_in_flight=4, shares={FOLLOW_UP: 0.6})
+
+        # Apply
+        timeout = budget.timeout(Job("nikto"))
+
+        # Assert
+        self.assertEqual(200, timeout) # 600 seconds over 3 waves of hosts
+
+    def test_full_scans_get_the_time_left(self):
+        # Arrange
+        budget = self._budget(1000, hosts=10, hosts_in_flight=4)
+
+        # Apply
+        self.now += 400
+
+        # Assert
+        self.assertEqual(600, budget.timeout(Job("nmap")))
+
+    def test_timeouts_never_outlast_the_budget(self):
+        # Arrange
+        budget = self._budget(100, hosts=1000)
+
+        # Apply
+        short = budget.stage_timeout(QUICK)
+        self.now += 99.5
+        last = budget.stage_timeout(FOLLOW_UP)
+        self.now += 1
+
+        # Assert
+        self.assertEqual(MIN_TIMEOUT, short)
+        self.assertEqual(0.5, last)
+        self.assertEqual(0, budget.timeout(Job("dirb")))
+
+    def test_clock_runs_from_when_the_run_started(self):
+        # Arrange
+        started = self.now
+        self.now += 20
+
+        # Apply
+        budget = self._budget(60, started=started)
+
+        # Assert
+        self.assertEqual(40, budget.remaining())
+        self.assertEqual(40, budget.stage_timeout(FULL))
+
+    def test_invalid_budget(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, TimeBudget, 0)
+        self.assertRaises(ValueError, TimeBudget, float("nan"))
+        self.assertRaises(ValueError, TimeBudget, float("inf"))
+        self.assertRaises(ValueError, TimeBudget, 60, hosts=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
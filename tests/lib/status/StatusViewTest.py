@@ -0,0 +1,103 @@
+"""This module provides the testing class for
+StatusView
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import io
+from unittest import TestCase, main
+
+from lib.scheduler.Job import Job
+from lib.status.StatusView import StatusView, JobRecord
+
+
+class StatusViewTest(TestCase):
+    """Utilized for unit testing the
+    StatusView class"""
+
+    def setUp(self):
+        self.now = 100.0
+        self.stream = io.StringIO()
+
+    def _view(self, live=False):
+        return StatusView(self.stream, live=live, clock=lambda: self.now)
+
+    def test_render_shows_running_jobs(self):
+        # Arrange
+        view = self._view()
+        job = Job("nikto", host="10.0.0.1")
+        view.started(job)
+        view.output(job, "+ Server: Apache/2.2.8\x1b[0m\r")
+        view.output(job, "   ")
+        self.now += 12
+
+        # Apply
+        lines = view.render()
+
+        # Assert
+        self.assertEqual("[status] 1 running, 0 finished", lines[0])
+        self.assertIn("nikto", lines[1])
+        self.assertIn("10.0.0.1", lines[1])
+        self.assertIn("12s", lines[1])
+        self.assertIn("2 lines", lines[1])
+        self.assertTrue(lines[1].endswith("+ Server: Apache/2.2.8"))
+
+    def test_finished_records_exit_codes(self):
+        # Arrange
+        view = self._view()
+        passed, failed, broken = Job("dirb", host="10.0.0.1"), Job("nikto", host="10.0.0.1"), Job("hydra")
+        for job in (passed, failed, broken):
+            view.started(job)
+        self.now += 2
+
+        # Apply
+        view.finished(passed, 0)
+        view.finished(failed, 1)
+        view.finished(broken, None, OSError("no such file"))
+
+        # Assert
+        self.assertEqual({"running": 0, "finished": 3, "failed": 2}, view.summary())
+        self.assertEqual([JobRecord("nikto", "10.0.0.1", 1, None, 2.0, 0)], view.failed()[:1])
+        self.assertEqual(["[done] dirb 10.0.0.1 exit 0 in 2.0s",
+                          "[done] nikto 10.0.0.1 exit 1 in 2.0s",
+                          "[done] hydra - failed: no such file in 2.0s"], self.stream.getvalue().splitlines())
+
+    def test_print_without_terminal_writes_lines_only(self):
+        # Arrange
+        view = self._view()
+        view.started(Job("nikto", host="10.0.0.1"))
+        view.start()
+
+        # Apply
+        view.print("[10.0.0.1] port: 80/tcp\tstate: open")
+        view.stop()
+
+        # Assert
+        self.assertEqual("[10.0.0.1] port: 80/tcp\tstate: open\n", self.stream.getvalue())
+
+    def test_live_view_redraws_block_below_messages(self):
+        # Arrange
+        StatusView.REFRESH_INTERVAL = 60
+        view = self._view(live=True)
+        view.started(Job("nikto", host="10.0.0.1"))
+        view.start()
+
+        # Apply
+        try:
+            view.print("first")
+            view.print("second")
+        finally:
+            view.stop()
+            StatusView.REFRESH_INTERVAL = 1.0
+
+        # Assert
+        output = self.stream.getvalue()
+        self.assertTrue(output.startswith("first\n[status] 1 running, 0 finished\n  nikto"))
+        self.assertEqual(2, output.count("\x1b[2F\x1b[J"))
+        self.assertTrue(output.endswith("\x1b[2F\x1b[J"))
+        self.assertIn("second\n", output)
+
+
+if __name__ == "__main__":
+    main()
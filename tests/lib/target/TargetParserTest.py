@@ -0,0 +1,86 @@
+"""This module provides the testing class
+for TargetParser
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import tempfile
+import unittest
+
+from lib.target.TargetParser import TargetParser
+
+
+class TargetParserTest(unittest.TestCase):
+    """Utilized for unit testing the
+    TargetParser class"""
+
+    def setUp(self):
+        self.parser = TargetParser()
+
+    def tearDown(self):
+        del self.parser
+
+    def test_parse_single_address(self):
+        # Apply + Assert
+        self.assertEqual(["10.0.0.1"], list(self.parser.parse(["10.0.0.1"])))
+
+    def test_parse_hostname_is_kept(self):
+        # Apply + Assert
+        self.assertEqual(["scanme.example"], list(self.parser.parse(["scanme.example"])))
+
+    def test_parse_cidr_block_excludes_network_and_broadcast(self):
+        # Apply
+        hosts = list(self.parser.parse(["192.168.1.0/30"]))
+
+        # Assert
+        self.assertEqual(["192.168.1.1", "192.168.1.2"], hosts)
+
+    def test_parse_single_host_cidr_block(self):
+        # Apply + Assert
+        self.assertEqual(["192.168.1.7"], list(self.parser.parse(["192.168.1.7/32"])))
+
+    def test_parse_duplicates_removed_order_kept(self):
+        # Apply
+        hosts = list(self.parser.parse(["10.0.0.2", "10.0.0.0/30", "10.0.0.2"]))
+
+        # Assert
+        self.assertEqual(["10.0.0.2", "10.0.0.1"], hosts)
+
+    def test_parse_overlapping_blocks_once(self):
+        # Apply
+        hosts = list(self.parser.parse(["10.0.0.0/30", "10.0.0.2", "10.0.0.0/29", "::1/128", "::1"]))
+
+        # Assert
+        self.assertEqual(["10.0.0.1", "10.0.0.2", "10.0.0.3", "10.0.0.4", "10.0.0.5", "10.0.0.6", "::1"], hosts)
+
+    def test_parse_large_block_lazily(self):
+        # Apply
+        hosts = self.parser.parse(["10.0.0.0/8"])
+
+        # Assert
+        self.assertEqual(["10.0.0.1", "10.0.0.2"], [next(hosts), next(hosts)])
+
+    def test_parse_invalid_cidr_block(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, self.parser.parse, ["10.0.0.0/99"])
+
+    def test_parse_target_file(self):
+        # Arrange
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, "w") as f:
+            f.write("# customer range\n10.0.0.5\n\n10.0.1.0/31\n")
+
+        # Apply
+        try:
+            hosts = list(self.parser.parse(["10.0.0.9"], target_file=path))
+        finally:
+            os.remove(path)
+
+        # Assert
+        self.assertEqual(["10.0.0.9", "10.0.0.5", "10.0.1.0", "10.0.1.1"], hosts)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+"""This package describes the
+CapabilityCacheMock class used
+for testing
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+
+
+class CapabilityCacheMock(object):
+    """In memory stand in for the
+    CapabilityCache that never looks
+    at the file system
+    """
+
+    def __init__(self):
+        """Initializes the mock object"""
+        self.entries = {}
+        self.probes = 0
+
+    def lookup(self, command, probe):
+        """Emits the stored entry, probing
+        only on the first lookup
+
+        @return: the capability data
+        """
+        if command not in self.entries:
+            self.probes += 1
+            self.entries[command] = probe()
+        return self.entries[command]
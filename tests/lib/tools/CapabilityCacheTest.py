@@ -0,0 +1,110 @@
+"""This module provides the testing class
+for CapabilityCache
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from lib.tools.CapabilityCache import CapabilityCache
+
+
+class CapabilityCacheTest(unittest.TestCase):
+    """Utilized for unit testing the
+    CapabilityCache class"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.directory, "cache", "capabilities.json")
+        self.binary = os.path.join(self.directory, "tool")
+        self._write_binary("#!/bin/sh\n")
+        self.probes = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write_binary(self, content):
+        with open(self.binary, "w") as f:
+            f.write(content)
+        os.chmod(self.binary, stat.S_IRWXU)
+
+    def _probe(self):
+        self.probes += 1
+        return {"version": [1, 2, 3]}
+
+    def test_lookup_probes_once(self):
+        # Arrange
+        cache = CapabilityCache(self.cache_file)
+
+        # Apply
+        first = cache.lookup(self.binary, self._probe)
+        second = cache.lookup(self.binary, self._probe)
+
+        # Assert
+        self.assertEqual({"version": [1, 2, 3]}, first)
+        self.assertEqual(first, second)
+        self.assertEqual(1, self.probes)
+
+    def test_lookup_persists_between_instances(self):
+        # Arrange
+        CapabilityCache(self.cache_file).lookup(self.binary, self._probe)
+
+        # Apply
+        data = CapabilityCache(self.cache_file).lookup(self.binary, self._probe)
+
+        # Assert
+        self.assertEqual({"version": [1, 2, 3]}, data)
+        self.assertEqual(1, self.probes)
+
+    def test_lookup_changed_binary_is_probed_again(self):
+        # Arrange
+        CapabilityCache(self.cache_file).lookup(self.binary, self._probe)
+        self._write_binary("#!/bin/sh\nexit 0\n")
+
+        # Apply
+        CapabilityCache(self.cache_file).lookup(self.binary, self._probe)
+
+        # Assert
+        self.assertEqual(2, self.probes)
+
+    def test_lookup_through_symlink_uses_resolved_path(self):
+        # Arrange
+        link = os.path.join(self.directory, "tool-link")
+        os.symlink(self.binary, link)
+        cache = CapabilityCache(self.cache_file)
+
+        # Apply
+        cache.lookup(self.binary, self._probe)
+        cache.lookup(link, self._probe)
+
+        # Assert
+        self.assertEqual(1, self.probes)
+
+    def test_lookup_missing_command(self):
+        # Arrange
+        cache = CapabilityCache(self.cache_file)
+
+        # Apply + Assert
+        self.assertRaises(OSError, cache.lookup, os.path.join(self.directory, "missing"), self._probe)
+        self.assertEqual(0, self.probes)
+
+    def test_corrupt_cache_file_is_ignored(self):
+        # Arrange
+        os.makedirs(os.path.dirname(self.cache_file))
+        with open(self.cache_file, "w") as f:
+            f.write("{not json")
+
+        # Apply
+        CapabilityCache(self.cache_file).lookup(self.binary, self._probe)
+
+        # Assert
+        self.assertEqual(1, self.probes)
+
+
+if __name__ == "__main__":
+    unittest.main()
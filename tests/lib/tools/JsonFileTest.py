@@ -0,0 +1,52 @@
+"""This module provides the testing class
+for JsonFile
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from lib.tools.JsonFile import JsonFile
+
+
+class JsonFileTest(unittest.TestCase):
+    """Utilized for unit testing the
+    JsonFile class"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "cache", "data.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_then_load(self):
+        # Arrange
+        JsonFile(self.path).save({"nikto||": {"seconds": 12.5, "runs": 1}})
+
+        # Apply
+        data = JsonFile(self.path).load()
+
+        # Assert
+        self.assertEqual({"nikto||": {"seconds": 12.5, "runs": 1}}, data)
+        self.assertEqual(["data.json"], os.listdir(os.path.dirname(self.path)))
+
+    def test_missing_or_unreadable_file_is_empty(self):
+        # Arrange
+        missing = JsonFile(self.path).load()
+        os.makedirs(os.path.dirname(self.path))
+        for content in ("{not json", "[1, 2]"):
+            with open(self.path, "w") as f:
+                f.write(content)
+
+            # Apply + Assert
+            self.assertEqual({}, JsonFile(self.path).load())
+        self.assertEqual({}, missing)
+
+
+if __name__ == "__main__":
+    unittest.main()
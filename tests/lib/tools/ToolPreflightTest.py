@@ -0,0 +1,75 @@
+"""This module provides the testing class
+for ToolPreflight
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import unittest
+
+from lib.tools.ToolPreflight import ToolPreflight
+
+from tests.lib.adapter.PopenMock import PopenMock
+from tests.lib.adapter.ProcessAdapterMock import ProcessAdapterMock
+from tests.lib.tools.CapabilityCacheMock import CapabilityCacheMock
+
+
+class ToolPreflightTest(unittest.TestCase):
+    """Utilized for unit testing the
+    ToolPreflight class"""
+
+    def setUp(self):
+        self.process_adapter = ProcessAdapterMock()
+        self.process_adapter.return_data = PopenMock()
+        self.cache = CapabilityCacheMock()
+        self.preflight = ToolPreflight(process_adapter=self.process_adapter, capability_cache=self.cache)
+
+    def tearDown(self):
+        del self.preflight
+
+    def _set_output(self, *lines):
+        self.process_adapter.return_data.stdout = [line.encode() for line in lines]
+
+    def test_check_finds_versions(self):
+        # Arrange
+        self._set_output("\n", "Nmap version 7.94 ( https://nmap.org )\n")
+
+        # Apply
+        found, missing = self.preflight.check(["nmap", "nikto"])
+
+        # Assert
+        self.assertEqual({}, missing)
+        self.assertEqual({"nmap": {"version": "7.94"}, "nikto": {"version": "99.99.99"}}, found)
+
+    def test_check_goes_through_cache(self):
+        # Arrange
+        self._set_output("Hydra v9.5 (c) 2023 by van Hauser/THC\n")
+
+        # Apply
+        self.preflight.check(["hydra"])
+        self.preflight.check(["hydra"])
+
+        # Assert
+        self.assertEqual(1, self.cache.probes)
+
+    def test_check_version_not_found(self):
+        # Arrange
+        self._set_output("command not found\n")
+
+        # Apply
+        found, missing = self.preflight.check(["dirb"])
+
+        # Assert
+        self.assertEqual({}, found)
+        self.assertIsInstance(missing["dirb"], OSError)
+
+    def test_check_unknown_tool(self):
+        # Apply
+        found, missing = self.preflight.check(["xterm"])
+
+        # Assert
+        self.assertIsInstance(missing["xterm"], ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
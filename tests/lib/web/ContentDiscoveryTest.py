@@ -0,0 +1,181 @@
+"""This module provides the testing class for
+ContentDiscovery
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import socket
+import tempfile
+import time
+from unittest import TestCase, main
+
+from lib.web.ContentDiscovery import ContentDiscovery
+
+from tests.lib.web.HttpServerMock import HttpServerMock
+
+
+PAGES = {
+    "/admin": (200, "admin panel"),
+    "/backup": (403, "forbidden"),
+    "/index.html": (200, "hello"),
+}
+WORDS = ["admin", "missing", "backup", "nothing", "index.html"] + ["word{}".format(i) for i in range(40)]
+
+
+class ContentDiscoveryTest(TestCase):
+    """Utilized for testing the ContentDiscovery
+    class against a local stand-in web server"""
+
+    def setUp(self):
+        self.servers = []
+        self.discovery = ContentDiscovery(connections=2, pipeline_depth=4, timeout=2.0)
+
+    def tearDown(self):
+        for server in self.servers:
+            server.stop()
+        del self.discovery
+
+    def _server(self, **kwargs):
+        server = HttpServerMock(PAGES, **kwargs)
+        self.servers.append(server)
+        return server
+
+    def _found(self, hits):
+        return [(hit.url.rsplit("/", 1)[-1], hit.status) for hit in hits]
+
+    def test_discover_finds_pages_in_word_order(self):
+        # Arrange
+        server = self._server()
+
+        # Apply
+        hits = self.discovery.discover(server.url, WORDS)
+
+        # Assert
+        self.assertEqual([("admin", 200), ("backup", 403), ("index.html", 200)], self._found(hits))
+        self.assertEqual(server.url + "admin", hits[0].url)
+        self.assertEqual(len("admin panel"), hits[0].size)
+
+    def test_discover_reuses_connections(self):
+        # Arrange
+        server = self._server()
+
+        # Apply
+        self.discovery.discover(server.url, WORDS)
+
+        # Assert
+        self.assertEqual(len(WORDS) + 2, len(server.requests))
+        self.assertLessEqual(server.connections, 3)
+
+    def test_discover_ignores_soft_404(self):
+        # Arrange
+        server = self._server(soft_404=True)
+
+        # Apply
+        hits = self.discovery.discover(server.url, WORDS)
+
+        # Assert
+        self.assertEqual([("admin", 200), ("backup", 403), ("index.html", 200)], self._found(hits))
+
+    def test_discover_without_keep_alive(self):
+        # Arrange
+        server = self._server(close=True)
+
+        # Apply
+        hits = self.discovery.discover(server.url, WORDS[:10])
+
+        # Assert
+        self.assertEqual(3, len(hits))
+        self.assertEqual(12, server.connections)
+
+    def test_discover_chunked_responses(self):
+        # Arrange
+        server = self._server(chunked=True)
+
+        # Apply
+        hits = self.discovery.discover(server.url, WORDS)
+
+        # Assert
+        self.assertEqual([("admin", 200), ("backup", 403), ("index.html", 200)], self._found(hits))
+
+    def test_discover_unreachable_server(self):
+        # Arrange
+        s = socket.socket()
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+        s.close()
+
+        # Apply + Assert
+        self.assertRaises(OSError, self.discovery.discover, "http://127.0.0.1:{}/".format(port), WORDS)
+        self.assertEqual(1, self.discovery.usage.exit_code)
+
+    def test_discover_keeps_its_usage(self):
+        # Arrange
+        server = self._server()
+
+        # Apply
+        start = time.time()
+        self.discovery.discover(server.url, WORDS)
+        elapsed = time.time() - start
+
+        # Assert
+        self.assertEqual(0, self.discovery.usage.exit_code)
+        self.assertTrue(0 < self.discovery.usage.wall_time <= elapsed)
+        self.assertGreater(self.discovery.usage.user_time + self.discovery.usage.system_time, 0)
+
+    def test_discover_keeps_hits_found_within_time_limit(self):
+        # Arrange
+        server = self._server(delay=0.02)
+        words = ["admin"] + ["missing{}".format(i) for i in range(500)] + ["index.html"]
+
+        # Apply
+        start = time.time()
+        hits = self.discovery.discover(server.url, words, time_limit=0.5)
+
+        # Assert
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual([("admin", 200)], self._found(hits))
+
+    def test_discover_keeps_to_rate(self):
+        # Arrange
+        server = self._server()
+        discovery = ContentDiscovery(connections=2, pipeline_depth=4, timeout=2.0, rate=100)
+
+        # Apply
+        start = time.time()
+        hits = discovery.discover(server.url, WORDS)
+
+        # Assert
+        self.assertGreaterEqual(time.time() - start, (len(WORDS) - 4) / 100.0)
+        self.assertEqual([("admin", 200), ("backup", 403), ("index.html", 200)], self._found(hits))
+
+    def test_write_report(self):
+        # Arrange
+        server = self._server()
+        hits = self.discovery.discover(server.url, WORDS)
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+
+        # Apply
+        try:
+            self.discovery.write_report(server.url, hits, path, words=len(WORDS))
+            with open(path) as f:
+                report = f.read()
+        finally:
+            os.remove(path)
+
+        # Assert
+        self.assertIn("---- Scanning URL: {} ----".format(server.url), report)
+        self.assertIn("+ {}admin (CODE:200|SIZE:11)".format(server.url), report)
+        self.assertIn("GENERATED WORDS: {}".format(len(WORDS)), report)
+
+    def test_invalid_arguments(self):
+        # Apply + Assert
+        self.assertRaises(ValueError, ContentDiscovery, connections=0)
+        self.assertRaises(ValueError, ContentDiscovery, rate=0)
+        self.assertRaises(ValueError, self.discovery.discover, "ftp://127.0.0.1/", WORDS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""This module defines the HttpServerMock
+class, a local stand-in web server used for
+testing the ContentDiscovery class
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class HttpHandler(BaseHTTPRequestHandler):
+    """Answers from the server's pages,
+    with keep-alive unless told otherwise"""
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        server = self.server
+        if server.delay:
+            time.sleep(server.delay)
+        with server.lock:
+            server.requests.append(self.path)
+        if self.path in server.pages:
+            status, body = server.pages[self.path]
+        elif server.soft_404:
+            status, body = 200, "<html>Sorry, {} could not be found</html>".format(self.path)
+        else:
+            status, body = 404, "not found"
+        body = body.encode()
+
+        self.send_response(status)
+        if server.chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+        if server.close:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        if server.chunked:
+            self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body) if body else b"0\r\n\r\n")
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpServerMock(ThreadingHTTPServer):
+    """HttpServerMock listens on a free
+    loopback port in a background thread,
+    serving the given pages"""
+    daemon_threads = True
+
+    def __init__(self, pages=None, soft_404=False, close=False, chunked=False, delay=0.0):
+        ThreadingHTTPServer.__init__(self, ("127.0.0.1", 0), HttpHandler)
+        self.pages = dict(pages or {})
+        self.soft_404 = soft_404
+        self.close = close
+        self.chunked = chunked
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = []
+        self.port = self.server_address[1]
+        self.url = "http://127.0.0.1:{}/".format(self.port)
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+    def handle_error(self, request, client_address):
+        pass # Clients dropping connections midway is expected
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,110 @@
+"""This module provides the testing class for
+Wordlist
+
+@author: Carl McGraw
+@contact: cjmcgraw(- at -)u.washington.edu
+@version: 1.x
+"""
+import os
+import shutil
+import tempfile
+from unittest import TestCase, main
+
+from lib.wordlist.Wordlist import Wordlist, DigestSet
+
+
+class WordlistTest(TestCase):
+    """Utilized for unit testing the
+    Wordlist class"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _file(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_iter_deduplicates_words_and_files_in_order(self):
+        # Arrange
+        first = self._file("first.txt", b"admin\r\nroot\n\nadmin\nguest")
+        second = self._file("second.txt", b"root\nftp\n")
+
+        # Apply
+        words = list(Wordlist(sources=[first, second], words=["toor", "root"]))
+
+        # Assert
+        self.assertEqual([b"toor", b"root", b"admin", b"guest", b"ftp"], words)
+
+    def test_iter_reads_empty_file(self):
+        # Apply + Assert
+        self.assertEqual([], list(Wordlist(sources=[self._file("empty.txt", b"")])))
+
+    def test_iter_keeps_undecodable_bytes(self):
+        # Arrange
+        path = self._file("latin.txt", b"caf\xe9\n")
+
+        # Apply + Assert
+        self.assertEqual([b"caf\xe9"], list(Wordlist(sources=[path])))
+
+    def test_write_shards_deals_words_in_turn(self):
+        # Arrange
+        source = self._file("big.txt", b"".join(b"word%d\n" % i for i in range(10)) + b"word3\n")
+        shards = [os.path.join(self.directory, "shard_{}.txt".format(i)) for i in range(3)]
+
+        # Apply
+        counts = Wordlist(sources=[source]).write_shards(shards)
+
+        # Assert
+        self.assertEqual([4, 3, 3], counts)
+        self.assertEqual(b"word0\nword3\nword6\nword9\n", self._read(shards[0]))
+        self.assertEqual(b"word2\nword5\nword8\n", self._read(shards[2]))
+
+    def test_write_shards_short_list_uses_fewer_shards(self):
+        # Arrange
+        shards = [os.path.join(self.directory, "shard_{}.txt".format(i)) for i in range(4)]
+
+        # Apply
+        counts = Wordlist(words=["w{}".format(i) for i in range(7)]).write_shards(shards, min_words=3)
+
+        # Assert
+        self.assertEqual([3, 2, 2, 0], counts)
+        self.assertEqual(b"w0\nw3\nw6\n", self._read(shards[0]))
+        self.assertEqual(b"w2\nw5\n", self._read(shards[2]))
+        self.assertEqual(b"", self._read(shards[3]))
+
+    def test_digest_set_keeps_words_across_growth(self):
+        # Arrange
+        digests = DigestSet()
+        words = [b"word%d" % i for i in range(3 * DigestSet.INITIAL_SLOTS)]
+
+        # Apply
+        added = [digests.add(word) for word in words + words[:100]]
+
+        # Assert
+        self.assertEqual(len(words), sum(added))
+        self.assertEqual(len(words), len(digests))
+        self.assertFalse(digests.add(words[-1]))
+
+    def test_write(self):
+        # Arrange
+        path = os.path.join(self.directory, "out.txt")
+
+        # Apply
+        count = Wordlist(words=["a", "b", "a"]).write(path)
+
+        # Assert
+        self.assertEqual(2, count)
+        self.assertEqual(b"a\nb\n", self._read(path))
+
+
+if __name__ == "__main__":
+    main()